@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark batch archetype assignment against the per-profile loop
+
+Times assign_archetype called once per random dimension-average vector
+against one assign_archetypes_batch call over the same vectors, for a few
+batch sizes, and checks that both pick the same archetype for every vector.
+
+Usage: python scripts/benchmark_archetype_assignment.py [repeats]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(script_dir), 'src'))
+
+from archetype_engine import (  # noqa: E402
+    assign_archetype,
+    assign_archetypes_batch,
+    averages_matrix,
+    get_archetype_dimensions,
+)
+
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+
+def benchmark(repeats):
+    rng = random.Random(42)
+    dimensions = get_archetype_dimensions()
+    print(f"{'N':>6}  {'loop (ms)':>10}  {'batch (ms)':>10}  {'speedup':>8}")
+    for size in BATCH_SIZES:
+        averages_list = [
+            {dim: round(rng.uniform(0.1, 1.0), 2) for dim in dimensions} for _ in range(size)
+        ]
+        matrix = averages_matrix(averages_list)
+
+        loop_ids = [assign_archetype(averages)["archetypeId"] for averages in averages_list]
+        batch_ids, _ = assign_archetypes_batch(matrix)
+        if loop_ids != batch_ids:
+            raise ValueError(f"Batch and loop assignments differ for N={size}")
+
+        loop_seconds = min(timeit.repeat(
+            lambda: [assign_archetype(averages) for averages in averages_list], number=1, repeat=repeats,
+        ))
+        batch_seconds = min(timeit.repeat(
+            lambda: assign_archetypes_batch(matrix), number=1, repeat=repeats,
+        ))
+        print(
+            f"{size:>6}  {loop_seconds * 1000:>10.3f}  {batch_seconds * 1000:>10.3f}"
+            f"  {loop_seconds / batch_seconds:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
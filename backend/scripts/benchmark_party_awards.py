@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark Party Room agreement awards against per-pair compatibility calls
+
+Times the closest pair, moral minority and most aligned awards computed the
+old way (compute_compatibility once per pair, in each of the three awards)
+against compute_party_room_awards, which builds one shared agreement matrix,
+for group sizes from 2 to 200, and checks that both pick the same awards.
+
+Usage: python scripts/benchmark_party_awards.py [repeats]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(script_dir), 'src'))
+
+from compatibility_engine import DIMENSIONS, compute_compatibility  # noqa: E402
+from party_awards import compute_party_room_awards  # noqa: E402
+
+GROUP_SIZES = (2, 5, 10, 25, 50, 100, 200)
+
+
+def pairwise_awards(participant_averages):
+    """closestPair, moralMinority and mostAlignedWithGroup with one
+    compute_compatibility call per pair per award."""
+    keys = sorted(participant_averages)
+
+    def score(key_a, key_b):
+        return compute_compatibility(participant_averages[key_a], participant_averages[key_b])["overallAgreementPct"]
+
+    best = None
+    for i, key_a in enumerate(keys):
+        for key_b in keys[i + 1:]:
+            candidate = (score(key_a, key_b), key_a, key_b)
+            if best is None or candidate[0] > best[0]:
+                best = candidate
+    awards = {"closestPair": {"participantKeys": [best[1], best[2]], "agreementPct": best[0]}}
+    if len(keys) < 3:
+        awards["moralMinority"] = awards["mostAlignedWithGroup"] = None
+        return awards
+    # Moral minority and most aligned each scored every pair again.
+    for name, pick in (
+        ("moralMinority", lambda average: min(keys, key=lambda k: (average[k], k))),
+        ("mostAlignedWithGroup", lambda average: max(keys, key=lambda k: (average[k], -k))),
+    ):
+        average = {
+            key: sum(score(key, other) for other in keys if other != key) / (len(keys) - 1) for key in keys
+        }
+        key = pick(average)
+        awards[name] = {"participantKey": key, "averageAgreementPct": round(average[key], 1)}
+    return awards
+
+
+def benchmark(repeats):
+    rng = random.Random(42)
+    print(f"{'N':>6}  {'pairwise (ms)':>13}  {'matrix (ms)':>11}  {'speedup':>8}")
+    for size in GROUP_SIZES:
+        participants = {
+            key: {dim: round(rng.uniform(0.1, 1.0), 2) for dim in DIMENSIONS} for key in range(size)
+        }
+
+        expected = pairwise_awards(participants)
+        actual = compute_party_room_awards(participants, [], {})
+        if any(actual[name] != expected[name] for name in expected):
+            raise ValueError(f"Matrix and pairwise awards differ for N={size}")
+
+        pairwise_seconds = min(timeit.repeat(
+            lambda: pairwise_awards(participants), number=1, repeat=repeats,
+        ))
+        matrix_seconds = min(timeit.repeat(
+            lambda: compute_party_room_awards(participants, [], {}), number=1, repeat=repeats,
+        ))
+        print(
+            f"{size:>6}  {pairwise_seconds * 1000:>13.3f}  {matrix_seconds * 1000:>11.3f}"
+            f"  {pairwise_seconds / matrix_seconds:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Compile the bundled dilemma catalog artifact
+
+Validates dilemmas_en.json and dilemmas_it.json and writes them, reshaped the
+way populate_dynamodb_multilang.py stores them, as one compact JSON file for
+the Lambda deployment package. The API builds its in-memory catalog from this
+file instead of scanning DynamoDB whenever its catalogVersion matches the
+manifest row the populate script wrote.
+
+Usage: python scripts/build_dilemma_catalog.py <output path>
+"""
+
+import json
+import os
+import sys
+
+script_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(script_dir), 'src'))
+
+from dilemma_catalog import DILEMMA_SOURCE_FILES, compile_catalog_artifact  # noqa: E402
+
+
+def build_dilemma_catalog(output_path):
+    data_dir = os.path.join(os.path.dirname(script_dir), 'data')
+    sources = {}
+    for lang, filename in DILEMMA_SOURCE_FILES.items():
+        with open(os.path.join(data_dir, filename), 'rb') as f:
+            sources[lang] = f.read()
+
+    artifact = compile_catalog_artifact(sources)
+
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, separators=(',', ':'))
+
+    counts = ", ".join(f"{lang}={len(items)}" for lang, items in artifact['languages'].items())
+    print(f"✅ Dilemma catalog {artifact['catalogVersion']} ({counts}) written to {output_path}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python scripts/build_dilemma_catalog.py <output path>")
+        sys.exit(1)
+    try:
+        build_dilemma_catalog(sys.argv[1])
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        sys.exit(1)
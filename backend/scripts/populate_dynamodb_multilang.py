@@ -9,8 +9,16 @@ and stores them in DynamoDB with language-specific IDs.
 import boto3
 import json
 import os
+import sys
+import time
 from decimal import Decimal
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+# Shared with the API and scripts/build_dilemma_catalog.py, so the manifest
+# version written here matches the bundled artifact built from the same files.
+from dilemma_catalog import CATALOG_MANIFEST_ID, DILEMMA_SOURCE_FILES, catalog_source_version  # noqa: E402
+
 def clear_dynamodb_table(table_name):
     """
     Clear all items from the specified DynamoDB table.
@@ -63,11 +71,12 @@ def populate_multilang_dynamodb(table_name='moral-torture-machine-dilemmas'):
     data_dir = os.path.join(os.path.dirname(script_dir), 'data')
     
     languages = {
-        'en': os.path.join(data_dir, 'dilemmas_en.json'),
-        'it': os.path.join(data_dir, 'dilemmas_it.json')
+        lang: os.path.join(data_dir, filename)
+        for lang, filename in DILEMMA_SOURCE_FILES.items()
     }
 
     total_loaded = 0
+    sources = {}
 
     for lang, json_file in languages.items():
         print(f"\n{'='*60}")
@@ -75,8 +84,10 @@ def populate_multilang_dynamodb(table_name='moral-torture-machine-dilemmas'):
         print(f"{'='*60}")
 
         # Load dilemmas from JSON file
-        with open(json_file, 'r', encoding='utf-8') as f:
-            dilemmas = json.load(f)
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        sources[lang] = raw
+        dilemmas = json.loads(raw.decode('utf-8'))
 
         print(f"Found {len(dilemmas)} dilemmas for language: {lang}")
 
@@ -108,6 +119,18 @@ def populate_multilang_dynamodb(table_name='moral-torture-machine-dilemmas'):
                 print(f"  ✓ Added: {language_specific_id}")
                 total_loaded += 1
 
+    # Written last: warm Lambda containers compare this version against the
+    # one their in-memory catalog was loaded under and only reload when it
+    # changed, and skip the table entirely when their bundled artifact was
+    # built from these same files.
+    catalog_version = catalog_source_version(sources)
+    table.put_item(Item={
+        '_id': CATALOG_MANIFEST_ID,
+        'catalogVersion': catalog_version,
+        'updatedAt': int(time.time()),
+    })
+    print(f"  ✓ Catalog manifest: {catalog_version}")
+
     print(f"\n{'='*60}")
     print(f"✅ Successfully loaded {total_loaded} dilemmas into DynamoDB!")
     print(f"{'='*60}")
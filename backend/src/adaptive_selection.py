@@ -0,0 +1,212 @@
+"""Adaptive next-dilemma selection for the archetype test.
+
+A fixed-length test asks N random dilemmas whatever the answers so far say.
+assign_archetype is nearest-centroid matching, so an answer only matters
+insofar as it moves the running average toward one archetype rather than
+another - and how far one dilemma can do that for a pair of archetypes a, b
+depends on the dilemma alone: picking its first rather than its second
+answer shifts the a-vs-b comparison by |(first - second) . (c_a - c_b)|
+(times a 1/(n+1) factor every dilemma shares at step n). That number is
+precomputed for every dilemma and archetype pair once per catalog and
+archetypes version; choosing the next question is then a lookup over the
+pairs among the current top candidates, and a bound on where the remaining
+answers can still push the average says when the test can stop early.
+Nothing here touches AWS.
+"""
+
+import heapq
+import random
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from src.archetype_engine import _NEUTRAL_DIMENSION_VALUE
+except ImportError:
+    try:
+        from .archetype_engine import _NEUTRAL_DIMENSION_VALUE
+    except ImportError:
+        from archetype_engine import _NEUTRAL_DIMENSION_VALUE
+
+# How many of the nearest archetypes the next question tries to tell apart.
+ADAPTIVE_CANDIDATE_COUNT = 4
+
+# The next question is drawn at random from this many best-scoring dilemmas,
+# so two people giving the same answers don't walk the exact same test.
+ADAPTIVE_PICK_SPREAD = 3
+
+# compute_dimension_averages rounds each average to two decimals before the
+# match, which can move it by up to this much.
+_AVERAGE_ROUNDING_SLACK = 0.005
+
+
+def _answer_vector(item: Dict[str, Any], prefix: str, dimensions: Sequence[str]) -> Tuple[float, ...]:
+    # A missing weight counts as 0, as it does when the client averages the
+    # chosen values it was sent.
+    vector = []
+    for dimension in dimensions:
+        value = item.get(f"{prefix}{dimension}")
+        numeric = isinstance(value, (int, float)) and not isinstance(value, bool)
+        vector.append(float(value) if numeric else 0.0)
+    return tuple(vector)
+
+
+def build_discrimination_index(
+    snapshot: Dict[str, Any],
+    centroids: Sequence[Tuple[str, Tuple[float, ...]]],
+    dimensions: Sequence[str],
+) -> Dict[str, Any]:
+    """Precompute, for every dilemma in a catalog snapshot, how strongly its
+    answer separates each pair of archetypes, plus both answers' weight
+    vectors.
+
+    `centroids` is archetype_engine.archetype_centroids() and `dimensions`
+    its dimension order. Rows are keyed by baseId; "pairColumns" maps each
+    pair of positions (i, j), i < j, in `centroids` to its column.
+    """
+    vectors = [centroid for _, centroid in centroids]
+    pairs = [(a, b) for a in range(len(vectors)) for b in range(a + 1, len(vectors))]
+    pair_deltas = [
+        tuple(vectors[a][k] - vectors[b][k] for k in range(len(dimensions)))
+        for a, b in pairs
+    ]
+
+    rows: Dict[str, Tuple[float, ...]] = {}
+    answer_vectors: Dict[str, Tuple[Tuple[float, ...], Tuple[float, ...]]] = {}
+    for item_id, base_id in zip(snapshot["ids"], snapshot["baseIds"]):
+        item = snapshot["itemsById"][item_id]
+        first = _answer_vector(item, "firstAnswer", dimensions)
+        second = _answer_vector(item, "secondAnswer", dimensions)
+        difference = [f - s for f, s in zip(first, second)]
+        rows[base_id] = tuple(
+            abs(sum(d * e for d, e in zip(difference, delta))) for delta in pair_deltas
+        )
+        answer_vectors[base_id] = (first, second)
+
+    return {
+        "dimensions": tuple(dimensions),
+        "archetypeIds": tuple(archetype_id for archetype_id, _ in centroids),
+        "centroids": tuple(vectors),
+        "pairColumns": {pair: column for column, pair in enumerate(pairs)},
+        "rows": rows,
+        "answerVectors": answer_vectors,
+    }
+
+
+def _ranked_archetypes(index: Dict[str, Any], averages: Sequence[float]) -> List[int]:
+    # Same order as assign_archetype: squared distance, then archetype id.
+    ids = index["archetypeIds"]
+    centroids = index["centroids"]
+    return sorted(
+        range(len(ids)),
+        key=lambda a: (sum((v - c) ** 2 for v, c in zip(averages, centroids[a])), ids[a]),
+    )
+
+
+def _result_is_settled(
+    index: Dict[str, Any],
+    leader: int,
+    sums: Sequence[float],
+    count: int,
+    unanswered: Sequence[str],
+    remaining: int,
+) -> bool:
+    """True when no choice of up to `remaining` further answers, among the
+    `unanswered` dilemmas, can move the match off `leader`.
+
+    Whether the average v is closer to the leader than to archetype b is the
+    sign of the linear function 2 v.(c_b - c_leader) + |c_leader|^2 - |c_b|^2.
+    After k more answers v = (S + x_1 + ... + x_k) / (n + k), so the most any
+    k answers can push it toward b is the sum of the k largest per-dilemma
+    maxima of x.(c_b - c_leader) - exact over k distinct dilemmas. Every k up
+    to `remaining` is checked, with the two-decimal rounding of the averages
+    as slack. Conservative: True is a guarantee, False only means "maybe".
+    """
+    answer_vectors = index["answerVectors"]
+    centroids = index["centroids"]
+    leader_centroid = centroids[leader]
+    leader_norm = sum(c * c for c in leader_centroid)
+    for other, centroid in enumerate(centroids):
+        if other == leader:
+            continue
+        weight = [2 * (b - a) for a, b in zip(leader_centroid, centroid)]
+        offset = leader_norm - sum(c * c for c in centroid)
+        slack = _AVERAGE_ROUNDING_SLACK * sum(abs(w) for w in weight)
+        pushes = heapq.nlargest(remaining, (
+            max(
+                sum(w * x for w, x in zip(weight, answer_vectors[base_id][0])),
+                sum(w * x for w, x in zip(weight, answer_vectors[base_id][1])),
+            )
+            for base_id in unanswered
+        ))
+        pushed = sum(w * total for w, total in zip(weight, sums))
+        for k in range(len(pushes) + 1):
+            if k:
+                pushed += pushes[k - 1]
+            if pushed / (count + k) + offset + slack >= 0:
+                return False
+    return True
+
+
+def next_adaptive_step(
+    index: Dict[str, Any],
+    answers: Sequence[Tuple[str, Dict[str, float]]],
+    max_questions: int,
+    rng: random.Random = random,
+    candidate_count: int = ADAPTIVE_CANDIDATE_COUNT,
+    pick_spread: int = ADAPTIVE_PICK_SPREAD,
+) -> Dict[str, Any]:
+    """Where an adaptive test stands after `answers` ((baseId, chosen
+    values) pairs, in the order given) and which dilemma to ask next.
+
+    Returns {"leader", "candidates", "settled", "nextBaseId"}: the archetype
+    the answers currently match, the nearest few, whether no remaining
+    answer (within `max_questions` in total) can change that match, and the
+    baseId to ask next - None once the result is settled, the budget is
+    used up, or every dilemma has been answered.
+    """
+    dimensions = index["dimensions"]
+    count = len(answers)
+    sums = [sum(values.get(dimension, 0.0) for _, values in answers) for dimension in dimensions]
+    answered_dimensions = {dimension for _, values in answers for dimension in values}
+    # Rounded like compute_dimension_averages, so the leader is the archetype
+    # /analyze-results would assign for these same answers.
+    averages = [
+        round(total / count, 2) if count and dimension in answered_dimensions else _NEUTRAL_DIMENSION_VALUE
+        for total, dimension in zip(sums, dimensions)
+    ]
+
+    ranked = _ranked_archetypes(index, averages)
+    leader = ranked[0]
+    candidates = sorted(ranked[:candidate_count])
+    remaining = max(0, max_questions - count)
+    answered_ids = {base_id for base_id, _ in answers}
+    unanswered = [base_id for base_id in index["rows"] if base_id not in answered_ids]
+    remaining = min(remaining, len(unanswered))
+
+    settled = (
+        count > 0
+        and answered_dimensions.issuperset(dimensions)
+        and _result_is_settled(index, leader, sums, count, unanswered, remaining)
+    )
+
+    next_base_id: Optional[str] = None
+    if not settled and remaining > 0:
+        columns = [
+            index["pairColumns"][(a, b)]
+            for position, a in enumerate(candidates)
+            for b in candidates[position + 1:]
+        ]
+        rows = index["rows"]
+        best = heapq.nsmallest(
+            max(1, pick_spread),
+            unanswered,
+            key=lambda base_id: (-sum(rows[base_id][column] for column in columns), base_id),
+        )
+        next_base_id = rng.choice(best)
+
+    archetype_ids = index["archetypeIds"]
+    return {
+        "leader": archetype_ids[leader],
+        "candidates": [archetype_ids[a] for a in ranked[:candidate_count]],
+        "settled": settled,
+        "nextBaseId": next_base_id,
+    }
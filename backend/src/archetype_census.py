@@ -0,0 +1,175 @@
+"""Population census over stored profiles: archetype shares and per-dimension
+percentiles.
+
+A profile keeps the archetypeId it was assigned when it was created, so the
+stored ids mix every archetypesVersion ever deployed. "N% of players share
+your archetype" needs them all counted under the current version, and "more
+empathetic than X% of players" needs every profile's averages - both far too
+much work for a read path. A scheduled job
+(backend_fastapi.archetype_census_handler) scans the profiles once per run:
+profiles assigned under the current version are counted by their stored id,
+only those from older versions are re-matched, in batches, with
+assign_archetypes_batch, and every dimension average is tallied into a
+cumulative histogram. The result is one compact census row; API containers
+read it with a single GetItem and answer share lookups in O(1) and
+percentile lookups in O(log n) (a bisect over the histogram) from memory.
+Nothing here touches AWS.
+"""
+
+import json
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:
+    from src.archetype_engine import assign_archetypes_batch, averages_matrix
+    from src.dilemma_catalog import STATS_ROW_ID_PREFIX
+except ImportError:
+    try:
+        from .archetype_engine import assign_archetypes_batch, averages_matrix
+        from .dilemma_catalog import STATS_ROW_ID_PREFIX
+    except ImportError:
+        from archetype_engine import assign_archetypes_batch, averages_matrix
+        from dilemma_catalog import STATS_ROW_ID_PREFIX
+
+# One stats row, next to the vote split indexes.
+ARCHETYPE_CENSUS_ID = f"{STATS_ROW_ID_PREFIX}archetypes"
+
+# Profiles re-matched per assign_archetypes_batch call: large enough to
+# amortize the call, small enough that a page never builds a huge matrix.
+ARCHETYPE_CENSUS_BATCH_SIZE = 1000
+
+# Below this many profiles a percentage says more about the sample than the
+# player base, so no share is reported.
+ARCHETYPE_CENSUS_MIN_PROFILES = 20
+
+
+def empty_archetype_census() -> Dict[str, Any]:
+    return {
+        "archetypesVersion": None,
+        "builtAt": None,
+        "total": 0,
+        "counts": {},
+        "storedVersions": {},
+        "dimensions": {},
+    }
+
+
+def tally_profiles(
+    profiles: Iterable[Dict[str, Any]],
+    archetypes_version: Any,
+    now_seconds: int,
+    batch_size: int = ARCHETYPE_CENSUS_BATCH_SIZE,
+) -> Tuple[Counter, Counter, Dict[str, Counter]]:
+    """(archetype counts under `archetypes_version`, profiles per stored
+    archetypesVersion, per-dimension counts of each average value) for one
+    batch of scanned profile rows.
+
+    Rows already past their expirationTime, or whose dimensionAverages is
+    unreadable, are skipped, as the read path would 404 or fail on them.
+    Rows from older versions are re-matched `batch_size` at a time.
+    """
+    counts: Counter = Counter()
+    stored_versions: Counter = Counter()
+    dimension_values: Dict[str, Counter] = defaultdict(Counter)
+    stale_averages: List[Dict[str, float]] = []
+    for profile in profiles:
+        expiration_time = profile.get("expirationTime")
+        if expiration_time is not None and int(expiration_time) <= now_seconds:
+            continue
+        try:
+            averages = json.loads(profile["dimensionAverages"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not isinstance(averages, dict):
+            continue
+        # DynamoDB hands numeric versions back as Decimal, so compare as text.
+        stored_version = str(profile.get("archetypesVersion") or "")
+        stored_versions[stored_version] += 1
+        if stored_version == str(archetypes_version) and profile.get("archetypeId"):
+            counts[profile["archetypeId"]] += 1
+        else:
+            stale_averages.append(averages)
+        for dimension, value in averages.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                dimension_values[dimension][float(value)] += 1
+    for start in range(0, len(stale_averages), batch_size):
+        archetype_ids, _ = assign_archetypes_batch(averages_matrix(stale_averages[start:start + batch_size]))
+        counts.update(archetype_ids)
+    return counts, stored_versions, dict(dimension_values)
+
+
+def cumulative_histogram(value_counts: Dict[float, int]) -> Dict[str, List]:
+    """Distinct values in ascending order, and for each the number of
+    values at or below it."""
+    values = sorted(value_counts)
+    cumulative = []
+    running = 0
+    for value in values:
+        running += value_counts[value]
+        cumulative.append(running)
+    return {"values": values, "cumulative": cumulative}
+
+
+def build_archetype_census(
+    counts: Dict[str, int],
+    stored_versions: Dict[str, int],
+    archetypes_version: Any,
+    built_at: int,
+    dimension_values: Optional[Dict[str, Dict[float, int]]] = None,
+) -> Dict[str, Any]:
+    """The stored census: per-archetype `counts` under `archetypes_version`,
+    how many profiles were originally assigned under each version, and a
+    cumulative histogram of each dimension's averages."""
+    dimension_values = dimension_values or {}
+    return {
+        "archetypesVersion": archetypes_version,
+        "builtAt": built_at,
+        "total": sum(counts.values()),
+        "counts": {archetype_id: counts[archetype_id] for archetype_id in sorted(counts)},
+        "storedVersions": {version: stored_versions[version] for version in sorted(stored_versions)},
+        "dimensions": {
+            dimension: cumulative_histogram(dimension_values[dimension]) for dimension in sorted(dimension_values)
+        },
+    }
+
+
+def archetype_share_pct(
+    census: Dict[str, Any],
+    archetype_id: str,
+    archetypes_version: Any,
+    min_profiles: int = ARCHETYPE_CENSUS_MIN_PROFILES,
+) -> Optional[int]:
+    """Rounded percentage of counted profiles matching `archetype_id`, or
+    None when the census can't say: it was built for another archetypes
+    version, covers fewer than `min_profiles` profiles, or has never seen
+    this archetype. A rare but present archetype reports 1, never 0."""
+    total = census.get("total") or 0
+    count = (census.get("counts") or {}).get(archetype_id, 0)
+    if str(census.get("archetypesVersion")) != str(archetypes_version) or total < min_profiles or not count:
+        return None
+    return max(1, round(count / total * 100))
+
+
+def dimension_percentiles(
+    census: Dict[str, Any],
+    averages: Dict[str, float],
+    min_profiles: int = ARCHETYPE_CENSUS_MIN_PROFILES,
+) -> Dict[str, Optional[int]]:
+    """For each dimension in `averages`, the rounded percentage of counted
+    profiles with a strictly lower average ("more empathetic than X%"), or
+    None when fewer than `min_profiles` profiles have that dimension.
+    Averages don't depend on the archetypes version, so neither does this.
+    O(log n) per dimension over the census's cumulative histograms."""
+    histograms = census.get("dimensions") or {}
+    percentiles: Dict[str, Optional[int]] = {}
+    for dimension, value in averages.items():
+        histogram = histograms.get(dimension)
+        total = histogram["cumulative"][-1] if histogram and histogram["cumulative"] else 0
+        if total < min_profiles:
+            percentiles[dimension] = None
+            continue
+        position = bisect_left(histogram["values"], value)
+        below = histogram["cumulative"][position - 1] if position else 0
+        percentiles[dimension] = round(below / total * 100)
+    return percentiles
@@ -5,13 +5,20 @@ Assignment is pure nearest-centroid matching over the six moral dimensions
 already scored per dilemma answer (Empathy, Integrity, Responsibility,
 Justice, Altruism, Honesty) — no AI involved, so the same averages and the
 same archetypesVersion always produce the same archetype.
+
+The bundled archetypes.json is what a container starts with; a newer
+version can be swapped in while it runs with install_archetype_catalog
+(backend_fastapi fetches it from ARCHETYPES_SOURCE).
 """
 
 import json
 import math
 import os
 from functools import lru_cache
-from typing import Any, Dict
+from threading import Lock
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
 
 # The Lambda deployment package copies this module and archetypes.json as
 # flat siblings (see .github/workflows/deploy.yml), while the repository keeps
@@ -27,9 +34,13 @@ _ARCHETYPES_PATH_CANDIDATES = [
 # missing dimension neutral instead of skewing the match toward "low".
 _NEUTRAL_DIMENSION_VALUE = 0.55
 
+# Default bound on memoized assignments (see assign_archetype_cached). Each
+# entry is one grid point and language pointing at a shared payload, so a
+# few thousand entries cost well under a megabyte.
+ARCHETYPE_MEMO_MAX_ENTRIES = 4096
 
-@lru_cache(maxsize=1)
-def _load_archetype_data() -> Dict[str, Any]:
+
+def _read_bundled_archetype_data() -> Dict[str, Any]:
     for path in _ARCHETYPES_PATH_CANDIDATES:
         if os.path.isfile(path):
             with open(path, "r", encoding="utf-8") as f:
@@ -39,10 +50,151 @@ def _load_archetype_data() -> Dict[str, Any]:
     )
 
 
+def validate_archetype_data(data: Any) -> None:
+    """Raise ValueError unless `data` has the archetypes.json shape every
+    function here relies on: an integer version, unique dimension names, and
+    archetypes with unique ids, a finite centroid value per dimension, a
+    visual and en/it copy."""
+    if not isinstance(data, dict):
+        raise ValueError("Archetype catalog must be a JSON object")
+    version = data.get("version")
+    if not isinstance(version, int) or isinstance(version, bool):
+        raise ValueError("Archetype catalog version must be an integer")
+    dimensions = data.get("dimensions")
+    if (
+        not isinstance(dimensions, list) or not dimensions
+        or not all(isinstance(dim, str) and dim for dim in dimensions)
+        or len(set(dimensions)) != len(dimensions)
+    ):
+        raise ValueError("Archetype catalog dimensions must be unique non-empty names")
+    archetypes = data.get("archetypes")
+    if not isinstance(archetypes, list) or not archetypes:
+        raise ValueError("Archetype catalog must list at least one archetype")
+    seen_ids = set()
+    for archetype in archetypes:
+        archetype_id = archetype.get("id") if isinstance(archetype, dict) else None
+        if not isinstance(archetype_id, str) or not archetype_id or archetype_id in seen_ids:
+            raise ValueError(f"Archetype ids must be unique non-empty strings, got {archetype_id!r}")
+        seen_ids.add(archetype_id)
+        centroid = archetype.get("centroid")
+        if not isinstance(centroid, dict) or not all(
+            isinstance(centroid.get(dim), (int, float)) and not isinstance(centroid.get(dim), bool)
+            and math.isfinite(centroid[dim])
+            for dim in dimensions
+        ):
+            raise ValueError(f"Archetype {archetype_id} needs a finite centroid value for every dimension")
+        if not isinstance(archetype.get("visual"), dict):
+            raise ValueError(f"Archetype {archetype_id} has no visual")
+        for lang_key in ("en", "it"):
+            if not isinstance(archetype.get(lang_key), dict):
+                raise ValueError(f"Archetype {archetype_id} has no {lang_key} copy")
+
+
+def _compile_archetype_catalog(data: Dict[str, Any], memo_max_entries: int) -> Dict[str, Any]:
+    """Everything assignment needs from one archetypes.json, precomputed:
+    the archetypes by id, the centroid matrix assign_archetypes_batch uses
+    (rows sorted by id, so argmin, which returns the first of equal minima,
+    reproduces assign_archetype's (distance, id) tie-break), and an
+    assignment memo of its own, so no memoized payload outlives the catalog
+    it was computed from."""
+    dimensions = tuple(data["dimensions"])
+    archetypes = sorted(data["archetypes"], key=lambda a: a["id"])
+    matrix = np.array(
+        [[float(a["centroid"][dim]) for dim in dimensions] for a in archetypes],
+        dtype=np.float64,
+    )
+    matrix.flags.writeable = False
+    catalog = {
+        "data": data,
+        "version": data["version"],
+        "dimensions": dimensions,
+        "byId": {archetype["id"]: archetype for archetype in data["archetypes"]},
+        "centroidIds": tuple(a["id"] for a in archetypes),
+        "centroidMatrix": matrix,
+    }
+    catalog["memo"] = lru_cache(maxsize=memo_max_entries)(
+        lambda vector, lang_key: _build_archetype_payload(catalog, vector, lang_key)
+    )
+    return catalog
+
+
+# The compiled catalog every function here reads. It is only ever replaced
+# as a whole (a single reference assignment), and each function reads it
+# once per call, so a call never mixes two catalog versions.
+_catalog: Optional[Dict[str, Any]] = None
+_catalog_lock = Lock()
+_memo_max_entries = ARCHETYPE_MEMO_MAX_ENTRIES
+
+
+def _current_catalog() -> Dict[str, Any]:
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                data = _read_bundled_archetype_data()
+                validate_archetype_data(data)
+                _catalog = _compile_archetype_catalog(data, _memo_max_entries)
+            catalog = _catalog
+    return catalog
+
+
+def _load_archetype_data() -> Dict[str, Any]:
+    return _current_catalog()["data"]
+
+
+def install_archetype_catalog(data: Any) -> bool:
+    """Validate and compile a new archetypes.json document, then swap it in.
+
+    Only a strictly newer version replaces the current catalog (profiles and
+    cached responses are keyed by archetypesVersion, so one version must
+    always mean one content); returns whether the swap happened. Raises
+    ValueError for an invalid document, leaving the current catalog in place.
+    Compilation happens before the swap, so readers never wait on it.
+    """
+    global _catalog
+    validate_archetype_data(data)
+    current = _current_catalog()
+    if data["version"] <= current["version"]:
+        return False
+    compiled = _compile_archetype_catalog(data, _memo_max_entries)
+    with _catalog_lock:
+        if data["version"] <= _catalog["version"]:
+            return False
+        _catalog = compiled
+    return True
+
+
 def get_archetypes_version() -> int:
     return _load_archetype_data()["version"]
 
 
+def archetype_catalog_copy(language: str = "en") -> list:
+    """Every archetype's localized copy and visual identity, in catalog order,
+    shaped like assign_archetype's result minus the per-match distance."""
+    data = _load_archetype_data()
+    lang_key = "it" if language == "it" else "en"
+    return [
+        {"archetypeId": archetype["id"], "visual": archetype["visual"], **archetype[lang_key]}
+        for archetype in data["archetypes"]
+    ]
+
+
+def archetype_centroids() -> list:
+    """(archetypeId, centroid tuple in get_archetype_dimensions() order) for
+    every archetype, in catalog order."""
+    data = _load_archetype_data()
+    dimensions = data["dimensions"]
+    return [
+        (archetype["id"], tuple(float(archetype["centroid"][dim]) for dim in dimensions))
+        for archetype in data["archetypes"]
+    ]
+
+
+def get_archetype_dimensions() -> list:
+    return list(_load_archetype_data()["dimensions"])
+
+
 def compute_dimension_averages(answers: list) -> Dict[str, float]:
     """Average each dimension across a list of {dimension: value} answer dicts."""
     aggregated: Dict[str, float] = {}
@@ -55,32 +207,150 @@ def compute_dimension_averages(answers: list) -> Dict[str, float]:
     return {key: round(value / count, 2) for key, value in aggregated.items()}
 
 
-def assign_archetype(averages: Dict[str, float], language: str = "en") -> Dict[str, Any]:
-    """Deterministically assign the nearest archetype to a set of dimension averages.
+def _averages_matrix(catalog: Dict[str, Any], averages_list: Sequence[Dict[str, float]]) -> np.ndarray:
+    dimensions = catalog["dimensions"]
+    return np.array(
+        [[averages.get(dim, _NEUTRAL_DIMENSION_VALUE) for dim in dimensions] for averages in averages_list],
+        dtype=np.float64,
+    ).reshape(len(averages_list), len(dimensions))
 
-    Returns the archetype id, the algorithm/content version it was matched
-    against, the localized copy for `language`, and the shared visual identity.
+
+def averages_matrix(averages_list: Sequence[Dict[str, float]]) -> np.ndarray:
+    """Stack dimension-average dicts into the N x 6 matrix
+    assign_archetypes_batch takes, filling missing dimensions the way
+    assign_archetype does."""
+    return _averages_matrix(_current_catalog(), averages_list)
+
+
+def _assign_archetypes_batch(catalog: Dict[str, Any], vectors: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    ids = catalog["centroidIds"]
+    centroids = catalog["centroidMatrix"]
+    vectors = np.asarray(vectors, dtype=np.float64).reshape(-1, centroids.shape[1])
+    differences = vectors[:, np.newaxis, :] - centroids[np.newaxis, :, :]
+    squared = differences[:, :, 0] ** 2
+    for k in range(1, centroids.shape[1]):
+        squared = squared + differences[:, :, k] ** 2
+    best = np.argmin(squared, axis=1)
+    distances = np.sqrt(squared[np.arange(len(vectors)), best])
+    return [ids[index] for index in best], distances
+
+
+def assign_archetypes_batch(vectors: np.ndarray) -> Tuple[List[str], np.ndarray]:
+    """Nearest archetype for every row of an N x 6 matrix (columns in the
+    archetypes.json dimension order) in one vectorized pass.
+
+    Returns the archetype ids and the Euclidean distances, unrounded.
+    Squared distances are accumulated one dimension at a time, in dimension
+    order, which is the same sequence of float operations as
+    assign_archetype's sum(), so equal-distance ties and the chosen ids
+    match the scalar version exactly.
     """
-    data = _load_archetype_data()
-    dimensions = data["dimensions"]
-    archetypes = data["archetypes"]
+    return _assign_archetypes_batch(_current_catalog(), vectors)
+
+
+def _archetype_payloads(
+    catalog: Dict[str, Any], ids: Sequence[str], distances: Sequence[float], language: str,
+) -> List[Dict[str, Any]]:
     lang_key = "it" if language == "it" else "en"
+    by_id = catalog["byId"]
+    return [
+        {
+            "archetypeId": archetype_id,
+            "archetypesVersion": catalog["version"],
+            "distance": round(float(distance), 4),
+            "visual": dict(by_id[archetype_id]["visual"]),
+            **by_id[archetype_id][lang_key],
+        }
+        for archetype_id, distance in zip(ids, distances)
+    ]
+
+
+def assign_archetypes(averages_list: Sequence[Dict[str, float]], language: str = "en") -> List[Dict[str, Any]]:
+    """assign_archetype for many dimension-average dicts at once: the same
+    payload per entry, computed with one assign_archetypes_batch call."""
+    if not averages_list:
+        return []
+    catalog = _current_catalog()
+    ids, distances = _assign_archetypes_batch(catalog, _averages_matrix(catalog, averages_list))
+    return _archetype_payloads(catalog, ids, distances, language)
+
+
+def archetype_payloads(ids: Sequence[str], distances: Sequence[float], language: str = "en") -> List[Dict[str, Any]]:
+    """assign_archetype-shaped results for already matched archetype ids and
+    their unrounded distances."""
+    return _archetype_payloads(_current_catalog(), ids, distances, language)
+
+
+class _FrozenDict(dict):
+    """A dict that refuses modification. Still a dict, so json.dumps and
+    FastAPI serialize memoized payloads like any other result."""
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("memoized archetype payloads are read-only; use assign_archetype for a copy")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
 
-    vector = {dim: averages.get(dim, _NEUTRAL_DIMENSION_VALUE) for dim in dimensions}
+def _build_archetype_payload(catalog: Dict[str, Any], vector: Tuple[float, ...], lang_key: str) -> Mapping[str, Any]:
+    dimensions = catalog["dimensions"]
+    archetypes = catalog["data"]["archetypes"]
 
     def squared_distance(archetype: Dict[str, Any]) -> float:
         centroid = archetype["centroid"]
-        return sum((vector[dim] - centroid[dim]) ** 2 for dim in dimensions)
+        return sum((value - centroid[dim]) ** 2 for value, dim in zip(vector, dimensions))
 
     # Sorting by (distance, id) before picking argmin makes a tie between
     # equidistant archetypes resolve to the same one every time.
     best = min(archetypes, key=lambda a: (squared_distance(a), a["id"]))
     copy = best[lang_key]
 
-    return {
+    return _FrozenDict({
         "archetypeId": best["id"],
-        "archetypesVersion": data["version"],
+        "archetypesVersion": catalog["version"],
         "distance": round(math.sqrt(squared_distance(best)), 4),
-        "visual": best["visual"],
+        "visual": _FrozenDict(best["visual"]),
         **copy,
-    }
+    })
+
+
+def set_archetype_memo_size(max_entries: int) -> None:
+    """Re-bound the assignment memo (dropping what it holds)."""
+    global _catalog, _memo_max_entries
+    _current_catalog()
+    with _catalog_lock:
+        _memo_max_entries = max_entries
+        _catalog = _compile_archetype_catalog(_catalog["data"], max_entries)
+
+
+def archetype_memo_stats() -> Dict[str, int]:
+    info = _current_catalog()["memo"].cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "maxEntries": info.maxsize}
+
+
+def assign_archetype_cached(averages: Dict[str, float], language: str = "en") -> Mapping[str, Any]:
+    """assign_archetype's result as a shared, read-only dict.
+
+    compute_dimension_averages rounds to two decimals, so stored profile
+    averages sit on a finite grid; results for grid points are memoized per
+    (6-tuple, language) in an LRU bounded by set_archetype_memo_size. Off-grid
+    inputs are computed without being cached, so memoization never changes
+    an assignment. Callers that need to modify the result should use
+    assign_archetype, which returns a plain copy.
+    """
+    catalog = _current_catalog()
+    lang_key = "it" if language == "it" else "en"
+    vector = tuple(averages.get(dim, _NEUTRAL_DIMENSION_VALUE) for dim in catalog["dimensions"])
+    if all(round(value, 2) == value for value in vector):
+        return catalog["memo"](vector, lang_key)
+    return _build_archetype_payload(catalog, vector, lang_key)
+
+
+def assign_archetype(averages: Dict[str, float], language: str = "en") -> Dict[str, Any]:
+    """Deterministically assign the nearest archetype to a set of dimension averages.
+
+    Returns the archetype id, the algorithm/content version it was matched
+    against, the localized copy for `language`, and the shared visual identity.
+    """
+    payload = assign_archetype_cached(averages, language)
+    return {**payload, "visual": dict(payload["visual"])}
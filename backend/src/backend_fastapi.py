@@ -1,8 +1,9 @@
 from fastapi import FastAPI, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
 from mangum import Mangum
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, Field, ValidationError, field_validator
 import boto3
 from botocore.exceptions import ClientError
 import jwt
@@ -15,36 +16,260 @@ import hmac
 import hashlib
 import re
 import secrets
-import random
 import html
+import atexit
+import signal
 from collections import Counter, defaultdict, deque
 from datetime import datetime, timedelta, timezone
 from math import ceil
 from threading import Lock
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any
 from decimal import Decimal
 import json
 from urllib.parse import urlparse
 from pathlib import Path
-from boto3.dynamodb.types import TypeSerializer
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+from concurrent.futures import ThreadPoolExecutor
 
 # archetype_engine.py is deployed as a flat sibling of this file (see
 # .github/workflows/deploy.yml), so the same import must resolve whether this
 # module is loaded as a bare top-level module (Lambda), as `src.backend_fastapi`
 # (local uvicorn), or as `backend.src.backend_fastapi` (unit tests).
 try:
-    from src.archetype_engine import assign_archetype, compute_dimension_averages
-    from src.compatibility_engine import compute_compatibility
+    from src.archetype_engine import (
+        archetype_catalog_copy,
+        archetype_centroids,
+        archetype_memo_stats,
+        archetype_payloads,
+        assign_archetype,
+        assign_archetype_cached,
+        assign_archetypes,
+        compute_dimension_averages,
+        get_archetype_dimensions,
+        get_archetypes_version,
+        install_archetype_catalog,
+        set_archetype_memo_size,
+    )
+    from src.choice_signatures import (
+        CHOICE_SIGNATURE_MAX_CHOICES,
+        build_choice_signature_table,
+        choice_signature,
+        lookup_choice_signature,
+        signature_rounds,
+    )
+    from src.compatibility_engine import compatibility_vectors, compute_compatibility, compute_compatibility_many
+    from src.adaptive_selection import build_discrimination_index, next_adaptive_step
+    from src.archetype_census import (
+        ARCHETYPE_CENSUS_ID,
+        archetype_share_pct,
+        build_archetype_census,
+        dimension_percentiles,
+        empty_archetype_census,
+        tally_profiles,
+    )
+    from src.duel_agreement import (
+        DUEL_AGREEMENT_DISTRIBUTION_ID,
+        agreement_bucket_attribute,
+        agreement_distribution,
+        agreement_top_pct,
+    )
     from src.party_awards import compute_party_room_awards
+    from src.moral_twins import (
+        TWIN_REMOVAL_RETENTION_SECONDS,
+        apply_twin_index_changes,
+        build_twin_index,
+        encode_twin_member,
+        find_twins,
+        twin_cell,
+        twin_cell_members,
+        twin_change_days,
+        twin_index_changes,
+        twin_index_item,
+    )
+    from src.vote_splits import (
+        build_vote_split_index,
+        empty_vote_split_index,
+        most_divisive,
+        splits_for_base_ids,
+        vote_split_index_id,
+    )
+    from src.dilemma_catalog import (
+        CATALOG_ARTIFACT_FILENAME,
+        CATALOG_MANIFEST_ID,
+        DILEMMA_SOURCE_FILES,
+        VOTE_COUNTER_FIELDS,
+        VOTE_COUNTER_SHARD_OWNER_FIELD,
+        build_catalog_snapshot,
+        changed_item_ids,
+        decode_deck_cursor,
+        deck_dilemma,
+        dilemmas_by_base_ids,
+        encode_deck_cursor,
+        load_catalog_artifact,
+        merge_vote_counters,
+        pick_random_dilemma,
+        sample_base_ids,
+        sample_dilemmas,
+        themed_base_ids,
+        vote_counter_shard_id,
+    )
 except ImportError:
     try:
-        from .archetype_engine import assign_archetype, compute_dimension_averages
-        from .compatibility_engine import compute_compatibility
+        from .archetype_engine import (
+            archetype_catalog_copy,
+            archetype_centroids,
+            archetype_memo_stats,
+            archetype_payloads,
+            assign_archetype,
+            assign_archetype_cached,
+            assign_archetypes,
+            compute_dimension_averages,
+            get_archetype_dimensions,
+            get_archetypes_version,
+            install_archetype_catalog,
+            set_archetype_memo_size,
+        )
+        from .choice_signatures import (
+            CHOICE_SIGNATURE_MAX_CHOICES,
+            build_choice_signature_table,
+            choice_signature,
+            lookup_choice_signature,
+            signature_rounds,
+        )
+        from .compatibility_engine import compatibility_vectors, compute_compatibility, compute_compatibility_many
+        from .adaptive_selection import build_discrimination_index, next_adaptive_step
+        from .archetype_census import (
+            ARCHETYPE_CENSUS_ID,
+            archetype_share_pct,
+            build_archetype_census,
+            dimension_percentiles,
+            empty_archetype_census,
+            tally_profiles,
+        )
+        from .duel_agreement import (
+            DUEL_AGREEMENT_DISTRIBUTION_ID,
+            agreement_bucket_attribute,
+            agreement_distribution,
+            agreement_top_pct,
+        )
         from .party_awards import compute_party_room_awards
+        from .moral_twins import (
+            TWIN_REMOVAL_RETENTION_SECONDS,
+            apply_twin_index_changes,
+            build_twin_index,
+            encode_twin_member,
+            find_twins,
+            twin_cell,
+            twin_cell_members,
+            twin_change_days,
+            twin_index_changes,
+            twin_index_item,
+        )
+        from .vote_splits import (
+            build_vote_split_index,
+            empty_vote_split_index,
+            most_divisive,
+            splits_for_base_ids,
+            vote_split_index_id,
+        )
+        from .dilemma_catalog import (
+            CATALOG_ARTIFACT_FILENAME,
+            CATALOG_MANIFEST_ID,
+            DILEMMA_SOURCE_FILES,
+            VOTE_COUNTER_FIELDS,
+            VOTE_COUNTER_SHARD_OWNER_FIELD,
+            build_catalog_snapshot,
+            changed_item_ids,
+            decode_deck_cursor,
+            deck_dilemma,
+            dilemmas_by_base_ids,
+            encode_deck_cursor,
+            load_catalog_artifact,
+            merge_vote_counters,
+            pick_random_dilemma,
+            sample_base_ids,
+            sample_dilemmas,
+            themed_base_ids,
+            vote_counter_shard_id,
+        )
     except ImportError:
-        from archetype_engine import assign_archetype, compute_dimension_averages
-        from compatibility_engine import compute_compatibility
+        from archetype_engine import (
+            archetype_catalog_copy,
+            archetype_centroids,
+            archetype_memo_stats,
+            archetype_payloads,
+            assign_archetype,
+            assign_archetype_cached,
+            assign_archetypes,
+            compute_dimension_averages,
+            get_archetype_dimensions,
+            get_archetypes_version,
+            install_archetype_catalog,
+            set_archetype_memo_size,
+        )
+        from choice_signatures import (
+            CHOICE_SIGNATURE_MAX_CHOICES,
+            build_choice_signature_table,
+            choice_signature,
+            lookup_choice_signature,
+            signature_rounds,
+        )
+        from compatibility_engine import compatibility_vectors, compute_compatibility, compute_compatibility_many
+        from adaptive_selection import build_discrimination_index, next_adaptive_step
+        from archetype_census import (
+            ARCHETYPE_CENSUS_ID,
+            archetype_share_pct,
+            build_archetype_census,
+            dimension_percentiles,
+            empty_archetype_census,
+            tally_profiles,
+        )
+        from duel_agreement import (
+            DUEL_AGREEMENT_DISTRIBUTION_ID,
+            agreement_bucket_attribute,
+            agreement_distribution,
+            agreement_top_pct,
+        )
         from party_awards import compute_party_room_awards
+        from moral_twins import (
+            TWIN_REMOVAL_RETENTION_SECONDS,
+            apply_twin_index_changes,
+            build_twin_index,
+            encode_twin_member,
+            find_twins,
+            twin_cell,
+            twin_cell_members,
+            twin_change_days,
+            twin_index_changes,
+            twin_index_item,
+        )
+        from vote_splits import (
+            build_vote_split_index,
+            empty_vote_split_index,
+            most_divisive,
+            splits_for_base_ids,
+            vote_split_index_id,
+        )
+        from dilemma_catalog import (
+            CATALOG_ARTIFACT_FILENAME,
+            CATALOG_MANIFEST_ID,
+            DILEMMA_SOURCE_FILES,
+            VOTE_COUNTER_FIELDS,
+            VOTE_COUNTER_SHARD_OWNER_FIELD,
+            build_catalog_snapshot,
+            changed_item_ids,
+            decode_deck_cursor,
+            deck_dilemma,
+            dilemmas_by_base_ids,
+            encode_deck_cursor,
+            load_catalog_artifact,
+            merge_vote_counters,
+            pick_random_dilemma,
+            sample_base_ids,
+            sample_dilemmas,
+            themed_base_ids,
+            vote_counter_shard_id,
+        )
 
 # Configure logging
 logger = logging.getLogger()
@@ -96,6 +321,7 @@ CHALLENGES_TABLE = os.getenv("CHALLENGES_TABLE", "moral-torture-machine-challeng
 CHALLENGE_PARTICIPANTS_TABLE = os.getenv("CHALLENGE_PARTICIPANTS_TABLE", "moral-torture-machine-challenge-participants")
 PARTY_ROOMS_TABLE = os.getenv("PARTY_ROOMS_TABLE", "moral-torture-machine-party-rooms")
 PARTY_PARTICIPANTS_TABLE = os.getenv("PARTY_PARTICIPANTS_TABLE", "moral-torture-machine-party-participants")
+MORAL_TWIN_INDEX_TABLE = os.getenv("MORAL_TWIN_INDEX_TABLE", "moral-torture-machine-moral-twin-index")
 DAILY_MORAL_CRIME_VOTES_TABLE = os.getenv(
     "DAILY_MORAL_CRIME_VOTES_TABLE",
     "moral-torture-machine-daily-moral-crime-votes",
@@ -160,6 +386,88 @@ ABUSE_PARTY_ROOM_POLL_REQUESTS_PER_MINUTE = _env_positive_int(
     90,
 )
 
+# Dilemma copy only changes when the populate script reloads the table, so
+# each warm container keeps an in-memory catalog per language (see
+# get_dilemma_catalog). After this many seconds the next read does one cheap
+# GetItem on the catalog manifest and only rescans if its version moved.
+DILEMMA_CATALOG_TTL_SECONDS = _env_positive_int("DILEMMA_CATALOG_TTL_SECONDS", 300)
+# Parallel Segment/TotalSegments workers used when (re)loading a catalog.
+# One is right for today's few dozen dilemmas per language; raise it once a
+# language's catalog spans many 1 MB scan pages.
+DILEMMA_CATALOG_SCAN_SEGMENTS = min(_env_positive_int("DILEMMA_CATALOG_SCAN_SEGMENTS", 1), 16)
+# BatchGetItem calls the catalog-miss fallback makes before giving up on keys
+# DynamoDB keeps returning as UnprocessedKeys (throttling).
+DILEMMA_BATCH_GET_ATTEMPTS = 3
+# Upper bound for /dilemmas/next: well above any solo test length, and well
+# within the 100-key limit of the per-batch vote-counter BatchGetItem.
+DILEMMA_PREFETCH_MAX_COUNT = 30
+# Cache-Control lifetime for catalog reads that carry a versioned ETag
+# (/dilemmas/by-ids, /archetypes). Matches the catalog TTL's default, so a
+# shared cache never holds copy much longer than a warm container would.
+CATALOG_READ_MAX_AGE_SECONDS = 300
+# Write-sharded vote counters: with more than one shard, /vote spreads a
+# dilemma's increments over this many shard rows (capped at 32) so a hot
+# dilemma is no longer a single hot key; reads merge the dilemma row and its
+# shards, and vote_counter_compaction_handler periodically folds the shards
+# back into the dilemma row. One keeps the original single-row counters.
+VOTE_COUNTER_SHARDS = min(_env_positive_int("VOTE_COUNTER_SHARDS", 1), 32)
+# With sharding on, each container reuses a dilemma's merged counters for
+# this many seconds instead of reading 1 + VOTE_COUNTER_SHARDS rows per view.
+VOTE_COUNTER_ROLLUP_TTL_SECONDS = _env_positive_int("VOTE_COUNTER_ROLLUP_TTL_SECONDS", 5)
+# Seconds a container serves its in-memory vote split index (see
+# vote_splits.py) before re-reading the row the scheduled job rewrites.
+VOTE_SPLIT_INDEX_TTL_SECONDS = 60
+# Parallel Segment/TotalSegments workers archetype_census_handler scans the
+# profiles table with (capped at 16), and the seconds a container serves its
+# in-memory census (see archetype_census.py) before re-reading the row.
+ARCHETYPE_CENSUS_SCAN_SEGMENTS = min(_env_positive_int("ARCHETYPE_CENSUS_SCAN_SEGMENTS", 4), 16)
+ARCHETYPE_CENSUS_TTL_SECONDS = 300
+# Seconds a container serves its in-memory moral twin index (see
+# moral_twins.py) before a background read of the index entries written
+# since, how far each such read reaches back before the previous one (clock
+# skew between writers, GSI propagation), the parallel segments the first
+# full load scans with, and the most twins one request may ask for.
+TWIN_INDEX_TTL_SECONDS = 300
+TWIN_INDEX_CHANGE_OVERLAP_SECONDS = 60
+TWIN_INDEX_SCAN_SEGMENTS = 4
+TWIN_SEARCH_MAX_LIMIT = 20
+# Seconds a container serves its cached duel agreement distribution (see
+# duel_agreement.py) before re-reading the row.
+DUEL_AGREEMENT_TTL_SECONDS = 300
+# Optional write-behind buffer for /vote (off by default). When enabled a
+# container acknowledges votes immediately and sums them per dilemma in
+# memory, then writes one ADD per dilemma once VOTE_WRITE_BEHIND_MAX_VOTES
+# are pending or the oldest is VOTE_WRITE_BEHIND_MAX_AGE_SECONDS old (checked
+# after every request this container serves), and at shutdown. Loss window:
+# Lambda can reclaim a frozen container without running shutdown hooks, so
+# up to MAX_VOTES votes, or MAX_AGE_SECONDS worth of them, are lost if that
+# happens before the next request reaches the container. Failed flushes are
+# put back and retried.
+VOTE_WRITE_BEHIND_ENABLED = os.getenv("VOTE_WRITE_BEHIND_ENABLED", "false").lower() == "true"
+VOTE_WRITE_BEHIND_MAX_VOTES = _env_positive_int("VOTE_WRITE_BEHIND_MAX_VOTES", 50)
+VOTE_WRITE_BEHIND_MAX_AGE_SECONDS = _env_positive_int("VOTE_WRITE_BEHIND_MAX_AGE_SECONDS", 2)
+# Longest `have` list /dilemmas/catalog/delta accepts: room for a few hundred
+# 10-character item hashes while staying well under API Gateway's URL limits.
+DILEMMA_CATALOG_DELTA_MAX_HAVE_LENGTH = 4000
+# Bound on this container's memo of archetype assignments (one entry per
+# rounded averages grid point and language); hit/miss counts are on /health.
+ARCHETYPE_MEMO_MAX_ENTRIES = _env_positive_int("ARCHETYPE_MEMO_MAX_ENTRIES", 4096)
+set_archetype_memo_size(ARCHETYPE_MEMO_MAX_ENTRIES)
+# Optional hot-reload source for archetypes.json: a local path or an
+# s3://bucket/key URI. Empty (the default) keeps the bundled file for the
+# container's lifetime. Otherwise, at most once per
+# ARCHETYPES_RELOAD_TTL_SECONDS a container checks the source's ETag (or file
+# mtime and size) and installs a strictly newer version (see
+# refresh_archetype_catalog).
+ARCHETYPES_SOURCE = os.getenv("ARCHETYPES_SOURCE", "").strip()
+ARCHETYPES_RELOAD_TTL_SECONDS = _env_positive_int("ARCHETYPES_RELOAD_TTL_SECONDS", 300)
+# Party Room choice-signature tables kept per container (see
+# choice_signatures.py); a 12-dilemma deck's table is a few hundred KB.
+CHOICE_SIGNATURE_TABLE_CACHE_SIZE = 32
+# submit_party_vote retries its conditional write this many times when
+# another update to the same participant lands between its read and write.
+PARTY_VOTE_WRITE_ATTEMPTS = 3
+
 # TASK-104: email every 4xx/5xx via the existing ops_alerts SNS topic
 # (ADR-031). Coalesced per (status_code, path) rather than per request, so a
 # burst of the same ordinary client error (e.g. a repeated 409/404 during
@@ -259,6 +567,7 @@ challenges_table = dynamodb.Table(CHALLENGES_TABLE)
 challenge_participants_table = dynamodb.Table(CHALLENGE_PARTICIPANTS_TABLE)
 party_rooms_table = dynamodb.Table(PARTY_ROOMS_TABLE)
 party_participants_table = dynamodb.Table(PARTY_PARTICIPANTS_TABLE)
+moral_twin_index_table = dynamodb.Table(MORAL_TWIN_INDEX_TABLE)
 daily_moral_crime_votes_table = dynamodb.Table(DAILY_MORAL_CRIME_VOTES_TABLE)
 ops_error_alerts_table = dynamodb.Table(OPS_ERROR_ALERTS_TABLE)
 ssm_client = boto3.client('ssm', region_name=AWS_REGION)
@@ -276,7 +585,37 @@ _burst_request_count = 0
 _ops_notification_last_sent: Dict[str, float] = {}
 _ops_notification_lock = Lock()
 _daily_moral_crime_catalog_cache: Optional[Dict[str, Any]] = None
+_dilemma_catalog_cache: Dict[str, Dict[str, Any]] = {}
+_dilemma_catalog_lock = Lock()
+_adaptive_index_cache: Dict[str, Dict[str, Any]] = {}
+_adaptive_index_lock = Lock()
+_choice_signature_tables: Dict[tuple, Dict[str, Any]] = {}
+_choice_signature_lock = Lock()
+_choice_signature_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="choice-signatures")
+_bundled_dilemma_catalog: Optional[Dict[str, Any]] = None
+_bundled_dilemma_catalog_loaded = False
+_dilemma_deck_cursor_key: Optional[bytes] = None
+_vote_counter_rollup_cache: Dict[str, tuple[float, Dict[str, int]]] = {}
+_vote_counter_rollup_lock = Lock()
+_vote_split_index_cache: Dict[str, Dict[str, Any]] = {}
+_vote_split_index_lock = Lock()
+_archetype_census_cache: Dict[str, Any] = {}
+_archetype_census_lock = Lock()
+_archetype_reload_state: Dict[str, Any] = {"checkedAt": 0.0, "fingerprint": None}
+_archetype_reload_lock = Lock()
+_archetype_reload_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="archetype-reload")
+_twin_index_cache: Dict[str, Any] = {}
+_twin_index_lock = Lock()
+_twin_index_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="twin-index")
+_duel_agreement_cache: Dict[str, Any] = {}
+_duel_agreement_lock = Lock()
+_vote_buffer: Dict[str, Dict[str, int]] = {}
+_vote_buffer_pending = 0
+_vote_buffer_oldest_at: Optional[float] = None
+_vote_buffer_lock = Lock()
+_vote_buffer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vote-flush")
 _dynamodb_type_serializer = TypeSerializer()
+_dynamodb_type_deserializer = TypeDeserializer()
 
 def get_groq_api_key() -> str:
     """Retrieve Groq API key from AWS SSM Parameter Store with caching"""
@@ -628,6 +967,37 @@ def _write_profile_og_html(public_id: str, archetype: Dict[str, Any], language:
         logger.exception("Unable to write bot-preview OG HTML for profile %s", public_id)
 
 
+def _add_twin_index_member(public_id: str, averages: Dict[str, float], created_at_seconds: int) -> None:
+    """File a new profile in the moral twin index (see moral_twins.py): one
+    small item of its own, so the write costs the same however full its cell
+    is. Best-effort like the OG HTML: a failure only keeps the profile out
+    of twin searches until the next census run reconciles the index."""
+    try:
+        moral_twin_index_table.put_item(Item=twin_index_item(
+            twin_cell(averages), public_id, int(time.time()), encode_twin_member(averages, created_at_seconds),
+        ))
+    except Exception:
+        logger.exception("Unable to add profile %s to the moral twin index", public_id)
+
+
+def _remove_twin_index_members(profiles: list[Dict[str, Any]]) -> None:
+    """Replace deleted profiles' moral twin index entries with removal
+    markers, which is how other containers learn about the delete. Profiles
+    without readable dimensionAverages (or never indexed) are skipped; the
+    census run reconciles anything missed here."""
+    for profile in profiles:
+        try:
+            averages = json.loads(profile["dimensionAverages"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not isinstance(averages, dict):
+            continue
+        try:
+            moral_twin_index_table.put_item(Item=twin_index_item(twin_cell(averages), profile["publicId"], int(time.time())))
+        except Exception:
+            logger.exception("Unable to remove profile from the moral twin index")
+
+
 def create_moral_profile(anonymous_user_id: str, answers: list, language: str) -> Dict[str, Any]:
     """Persist a shareable moral profile (TASK-28) from a completed test.
 
@@ -654,12 +1024,15 @@ def create_moral_profile(anonymous_user_id: str, answers: list, language: str) -
         "lastAccessedAt": now,
         "expirationTime": expiration_time,
     })
+    _add_twin_index_member(public_id, averages, now // 1000)
     _write_profile_og_html(public_id, archetype, language)
     return {
         "publicId": public_id,
         "averages": averages,
         "dilemmaBaseIds": dilemma_base_ids,
         "language": language,
+        "archetypeSharePct": _archetype_share_pct(archetype),
+        "dimensionPercentiles": _dimension_percentiles(averages),
         **archetype,
     }
 
@@ -678,6 +1051,7 @@ def get_profile_or_404(public_id: str) -> Dict[str, Any]:
             moral_profiles_table.delete_item(Key={"publicId": public_id})
         except Exception:
             logger.exception("Unable to immediately remove expired moral profile")
+        _remove_twin_index_members([item])
         raise HTTPException(status_code=404, detail="Profile not found")
     if not _touch_profile_activity(public_id):
         # A concurrent TTL/sweep/delete can remove a profile after GetItem.
@@ -736,6 +1110,7 @@ def get_latest_profile_for_anonymous_user(anonymous_user_id: str) -> Optional[Di
             moral_profiles_table.delete_item(Key={"publicId": item["publicId"]})
         except Exception:
             logger.exception("Unable to immediately remove expired moral profile")
+        _remove_twin_index_members([item])
     return None
 
 
@@ -751,7 +1126,7 @@ def _has_prior_profile(anonymous_user_id: str, exclude_public_id: Optional[str]
         IndexName="OwnerIndex",
         KeyConditionExpression="ownerAnonymousUserId = :owner",
         ExpressionAttributeValues={":owner": anonymous_user_id},
-        ProjectionExpression="publicId, expirationTime",
+        ProjectionExpression="publicId, expirationTime, dimensionAverages",
         Limit=5,
     )
     now_seconds = int(time.time())
@@ -767,6 +1142,7 @@ def _has_prior_profile(anonymous_user_id: str, exclude_public_id: Optional[str]
                 moral_profiles_table.delete_item(Key={"publicId": item["publicId"]})
             except Exception:
                 logger.exception("Unable to immediately remove expired moral profile")
+            _remove_twin_index_members([item])
             continue
         return True
     return False
@@ -995,6 +1371,17 @@ class DilemmaResponse(BaseModel):
         "by_alias": True
     }
 
+
+class SessionDilemmaResponse(DilemmaResponse):
+    # Session-deck mode only (see /get-dilemma `deck`): pass it back to get
+    # the next dilemma of the same repeat-free deck.
+    deckCursor: Optional[str] = None
+
+
+class DilemmaBatchResponse(BaseModel):
+    dilemmas: list[DilemmaResponse]
+    deckCursor: str
+
 class DilemmaWithChoice(BaseModel):
     dilemma: str = Field(..., description="The dilemma text")
     firstAnswer: str = Field(..., description="First answer option")
@@ -1013,6 +1400,10 @@ class DilemmaAnswer(BaseModel):
     dilemmaBaseId: str = Field(..., min_length=1, max_length=100)
     chosenValues: Dict[str, float] = Field(..., max_length=12)
 
+class AdaptiveNextDilemmaRequest(BaseModel):
+    answers: list[DilemmaAnswer] = Field(default=[], max_length=DILEMMA_PREFETCH_MAX_COUNT)
+    maxQuestions: int = Field(default=10, ge=1, le=DILEMMA_PREFETCH_MAX_COUNT)
+
 class CreateProfileRequest(BaseModel):
     answers: list[DilemmaAnswer] = Field(..., min_length=1, max_length=20)
     language: str = Field(default="en", min_length=2, max_length=10, pattern=r'^[a-zA-Z]+$')
@@ -1031,6 +1422,12 @@ class CreatePartyRoomRequest(BaseModel):
         ge=PARTY_ROOM_MIN_DILEMMAS,
         le=PARTY_ROOM_MAX_DILEMMAS,
     )
+    # Optional theme: a moral dimension the deck should probe hardest, or
+    # "balanced" to cover all six evenly. Omitted means a uniform sample.
+    deckFocus: Optional[str] = Field(
+        default=None,
+        pattern=r'^(balanced|Empathy|Integrity|Responsibility|Justice|Altruism|Honesty)$',
+    )
 
 class JoinPartyRoomRequest(BaseModel):
     displayName: str = Field(..., min_length=1, max_length=40)
@@ -1264,6 +1661,91 @@ async def add_security_headers(request: Request, call_next):
     response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
     return response
 
+def _read_archetype_source(known_fingerprint: Optional[str]) -> tuple[str, Optional[bytes]]:
+    """(fingerprint, body) of ARCHETYPES_SOURCE, with body None when the
+    fingerprint still matches `known_fingerprint`. S3 is checked with a
+    HeadObject and only fetched (pinned to that ETag) when it changed."""
+    if ARCHETYPES_SOURCE.startswith("s3://"):
+        bucket, _, key = ARCHETYPES_SOURCE[len("s3://"):].partition("/")
+        fingerprint = s3_client.head_object(Bucket=bucket, Key=key)["ETag"]
+        if fingerprint == known_fingerprint:
+            return fingerprint, None
+        return fingerprint, s3_client.get_object(Bucket=bucket, Key=key, IfMatch=fingerprint)["Body"].read()
+    stat = os.stat(ARCHETYPES_SOURCE)
+    fingerprint = f"{stat.st_mtime_ns}:{stat.st_size}"
+    if fingerprint == known_fingerprint:
+        return fingerprint, None
+    return fingerprint, Path(ARCHETYPES_SOURCE).read_bytes()
+
+
+def refresh_archetype_catalog(now: Optional[float] = None) -> bool:
+    """Install a newer archetypes.json from ARCHETYPES_SOURCE if one has
+    been published since this container last looked; returns whether the
+    catalog changed.
+
+    Checks at most once per ARCHETYPES_RELOAD_TTL_SECONDS. The new document
+    is validated and compiled before the engine swaps it in, so requests
+    keep being served from the previous version until then and never see
+    a mix. A document that fails validation is remembered by fingerprint
+    and not fetched again until the source changes; fetch errors are
+    retried on the next check. Caches derived from archetypes (adaptive
+    indexes, choice-signature tables, the census) are keyed by
+    archetypesVersion, so they rebuild on their own.
+    """
+    if not ARCHETYPES_SOURCE:
+        return False
+    now = time.time() if now is None else now
+    with _archetype_reload_lock:
+        if now - _archetype_reload_state["checkedAt"] < ARCHETYPES_RELOAD_TTL_SECONDS:
+            return False
+        _archetype_reload_state["checkedAt"] = now
+        known_fingerprint = _archetype_reload_state["fingerprint"]
+
+    try:
+        fingerprint, body = _read_archetype_source(known_fingerprint)
+    except Exception:
+        logger.exception("Unable to read the archetype catalog from %s", ARCHETYPES_SOURCE)
+        return False
+    if body is None:
+        return False
+    try:
+        installed = install_archetype_catalog(json.loads(body))
+    except ValueError:
+        # Also covers json.JSONDecodeError.
+        logger.exception("Rejected the archetype catalog from %s", ARCHETYPES_SOURCE)
+        installed = False
+    with _archetype_reload_lock:
+        _archetype_reload_state["fingerprint"] = fingerprint
+    if installed:
+        logger.info("Archetype catalog reloaded, now at version %s", get_archetypes_version())
+    return installed
+
+
+# Archetype hot reload: the request that notices the check is due only
+# hands it to a background worker, so no request waits on the source read
+# or the compile (the response isn't delivered until middleware returns).
+# Requests keep being answered from the installed version until the worker
+# swaps the new one in.
+@app.middleware("http")
+async def refresh_archetypes_if_due(request: Request, call_next):
+    if ARCHETYPES_SOURCE and time.time() - _archetype_reload_state["checkedAt"] >= ARCHETYPES_RELOAD_TTL_SECONDS:
+        _archetype_reload_executor.submit(refresh_archetype_catalog)
+    return await call_next(request)
+
+# Write-behind /vote buffer: flush once a threshold is reached. Checked after
+# every request, not just votes, so a quiet container still honours the age
+# limit as long as it keeps serving traffic. The flush itself runs on a
+# background worker, so neither the request that crosses the threshold nor
+# anything queued behind it on the event loop waits on the DynamoDB writes.
+# The flush swaps the buffer out first, so a check that fires again while one
+# is queued only adds a no-op flush.
+@app.middleware("http")
+async def flush_due_vote_increments(request: Request, call_next):
+    response = await call_next(request)
+    if VOTE_WRITE_BEHIND_ENABLED and _vote_buffer_due():
+        _vote_buffer_executor.submit(flush_vote_buffer)
+    return response
+
 # Middleware for request logging with PII filtering
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -1327,7 +1809,16 @@ def _rate_limit_rules_for_request(method: str, path: str) -> list[tuple[str, int
     elif method.upper() == "POST" and (path == "/profiles" or path.startswith("/challenges")):
         rules.append(("duel_write", ABUSE_DUEL_WRITE_REQUESTS_PER_MINUTE))
     elif method.upper() == "GET" and (
-        path.startswith(("/profiles/", "/challenges/")) or path == "/dilemmas/by-ids"
+        path.startswith(("/profiles/", "/challenges/"))
+        or path in {
+            "/dilemmas/by-ids",
+            "/dilemmas/splits",
+            "/dilemmas/most-divisive",
+            "/dilemmas/catalog",
+            "/dilemmas/catalog/delta",
+            "/archetypes",
+            "/daily-moral-crime/dilemma",
+        }
     ):
         rules.append(("public_read", ABUSE_PUBLIC_READ_REQUESTS_PER_MINUTE))
     elif path == "/daily-moral-crime" or path == "/daily-moral-crime/vote":
@@ -1602,6 +2093,108 @@ def _scan_all(dynamodb_table, **scan_kwargs) -> list[Dict[str, Any]]:
         scan_kwargs["ExclusiveStartKey"] = last_key
 
 
+def _projection_kwargs(attributes: list[str]) -> Dict[str, Any]:
+    """ProjectionExpression for `attributes`, aliased so reserved words such
+    as `language` can be projected too."""
+    names = {f"#p{index}": attribute for index, attribute in enumerate(attributes)}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+def _segmented_scan(
+    dynamodb_table,
+    total_segments: int = 1,
+    projection: Optional[list[str]] = None,
+    page_handler: Optional[Callable[[list[Dict[str, Any]]], None]] = None,
+    **scan_kwargs,
+) -> tuple[list[Dict[str, Any]], Dict[str, Any]]:
+    """Scan every page of a table, optionally as parallel segments.
+
+    Returns the items plus load stats (pages read and consumed read capacity)
+    so loaders can report what a full read actually cost. `projection`
+    limits the returned attributes for callers that only need keys; note
+    DynamoDB still bills the full item size, it only shrinks the payload.
+    With a `page_handler`, each page's items are handed to it as they arrive
+    (from the segment's worker thread) instead of being collected, so a
+    whole-table pass never holds more than one page per segment in memory;
+    the returned item list is then empty.
+
+    A single segment pages through the table resource like _scan_all. With
+    several, each Segment/TotalSegments part runs in its own thread against
+    the low-level client (clients are thread-safe, resources are not), so
+    values are (de)serialized here the same way the transaction helpers do.
+    """
+    scan_kwargs = dict(scan_kwargs)
+    if projection:
+        projected = _projection_kwargs(projection)
+        scan_kwargs["ProjectionExpression"] = projected["ProjectionExpression"]
+        scan_kwargs["ExpressionAttributeNames"] = {
+            **scan_kwargs.get("ExpressionAttributeNames", {}),
+            **projected["ExpressionAttributeNames"],
+        }
+    scan_kwargs["ReturnConsumedCapacity"] = "TOTAL"
+
+    def consumed(response: Dict[str, Any]) -> float:
+        return float((response.get("ConsumedCapacity") or {}).get("CapacityUnits", 0) or 0)
+
+    if total_segments <= 1:
+        items: list[Dict[str, Any]] = []
+        pages = 0
+        capacity = 0.0
+        while True:
+            response = dynamodb_table.scan(**scan_kwargs)
+            pages += 1
+            capacity += consumed(response)
+            if page_handler:
+                page_handler(response.get("Items", []))
+            else:
+                items.extend(response.get("Items", []))
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                break
+            scan_kwargs["ExclusiveStartKey"] = last_key
+        return items, {"segments": 1, "pages": pages, "consumedCapacityUnits": capacity}
+
+    client = dynamodb_table.meta.client
+    client_kwargs = dict(scan_kwargs, TableName=dynamodb_table.name, TotalSegments=total_segments)
+    if "ExpressionAttributeValues" in client_kwargs:
+        client_kwargs["ExpressionAttributeValues"] = _dynamodb_item(
+            client_kwargs["ExpressionAttributeValues"]
+        )
+
+    def scan_segment(segment: int) -> tuple[list[Dict[str, Any]], int, float]:
+        segment_kwargs = dict(client_kwargs, Segment=segment)
+        segment_items: list[Dict[str, Any]] = []
+        segment_pages = 0
+        segment_capacity = 0.0
+        while True:
+            response = client.scan(**segment_kwargs)
+            segment_pages += 1
+            segment_capacity += consumed(response)
+            page_items = [
+                {key: _dynamodb_type_deserializer.deserialize(value) for key, value in item.items()}
+                for item in response.get("Items", [])
+            ]
+            if page_handler:
+                page_handler(page_items)
+            else:
+                segment_items.extend(page_items)
+            last_key = response.get("LastEvaluatedKey")
+            if not last_key:
+                return segment_items, segment_pages, segment_capacity
+            segment_kwargs["ExclusiveStartKey"] = last_key
+
+    with ThreadPoolExecutor(max_workers=total_segments) as executor:
+        results = list(executor.map(scan_segment, range(total_segments)))
+    return (
+        [item for segment_items, _, _ in results for item in segment_items],
+        {
+            "segments": total_segments,
+            "pages": sum(pages for _, pages, _ in results),
+            "consumedCapacityUnits": sum(capacity for _, _, capacity in results),
+        },
+    )
+
+
 def _claimed_anonymous_ids(account_sub: str) -> tuple[list[str], list[Dict[str, Any]]]:
     """Use claim-lock rows as the authoritative account-to-device mapping.
 
@@ -1826,7 +2419,7 @@ async def get_my_latest_archetype(request: Request, language: str = "en"):
     latest_profile = max(valid_profiles, key=lambda profile: int(profile.get("createdAt", 0)))
     averages = json.loads(latest_profile["dimensionAverages"])
     return {
-        "archetype": assign_archetype(averages, language=language),
+        "archetype": assign_archetype_cached(averages, language=language),
         # TASK-193: the frontend passes this straight through to
         # POST /challenges so challenge creation targets the exact profile
         # shown here - create_challenge's own profilePublicId-less fallback
@@ -1870,6 +2463,7 @@ def _compute_duel_stats_for_anonymous_ids(anonymous_ids: list[str], language: st
     distinct_archetype_ids: set[str] = set()
     recent: list[Dict[str, Any]] = []
     own_averages_by_profile_id: Dict[str, Dict[str, float]] = {}
+    completed: list[tuple] = []
 
     for participation in _duel_participations_for_anonymous_ids(anonymous_ids):
         token = participation["challengeToken"]
@@ -1901,21 +2495,38 @@ def _compute_duel_stats_for_anonymous_ids(anonymous_ids: list[str], language: st
         own_averages = own_averages_by_profile_id[own_profile_id]
         opponent_averages = json.loads(opponent_profile["dimensionAverages"])
 
-        compatibility = compute_compatibility(own_averages, opponent_averages)
-        opponent_archetype = assign_archetype(opponent_averages, language=language)
         completed_at = (
             opponent_participant["submittedAt"] if opponent_role == "invitee"
             else participation["submittedAt"]
         )
-
+        completed.append((token, own_profile_id, opponent_averages, completed_at))
+
+    # One batch compatibility pass per own profile (usually just one) over
+    # all of its opponents, scores only.
+    agreement_pcts: list[float] = [0.0] * len(completed)
+    for own_profile_id, own_averages in own_averages_by_profile_id.items():
+        positions = [index for index, entry in enumerate(completed) if entry[1] == own_profile_id]
+        if not positions:
+            continue
+        scores = compute_compatibility_many(
+            own_averages, compatibility_vectors([completed[index][2] for index in positions]),
+        )["overallAgreementPct"].tolist()
+        for index, score in zip(positions, scores):
+            agreement_pcts[index] = score
+
+    # Every opponent's archetype in one vectorized assignment.
+    opponent_archetypes = assign_archetypes([averages for _, _, averages, _ in completed], language=language)
+    for (token, _, _, completed_at), agreement_pct, opponent_archetype in zip(
+        completed, agreement_pcts, opponent_archetypes,
+    ):
         completed_count += 1
-        agreement_sum += compatibility["overallAgreementPct"]
+        agreement_sum += agreement_pct
         distinct_archetype_ids.add(opponent_archetype["archetypeId"])
         if len(recent) < _DUEL_STATS_RECENT_LIMIT:
             recent.append({
                 "challengeToken": token,
                 "opponentArchetype": opponent_archetype,
-                "overallAgreementPct": compatibility["overallAgreementPct"],
+                "overallAgreementPct": agreement_pct,
                 "completedAt": completed_at,
             })
 
@@ -1964,11 +2575,13 @@ def _delete_records(dynamodb_table, keys: list[Dict[str, Any]]) -> int:
 
 def _remove_rematch_references(deleted_tokens: set[str]) -> None:
     for token in deleted_tokens:
-        for challenge in _scan_all(
+        challenges, _ = _segmented_scan(
             challenges_table,
+            projection=["challengeToken"],
             FilterExpression="rematchOfToken = :token",
             ExpressionAttributeValues={":token": token},
-        ):
+        )
+        for challenge in challenges:
             challenges_table.update_item(
                 Key={"challengeToken": challenge["challengeToken"]},
                 UpdateExpression="REMOVE rematchOfToken",
@@ -2047,6 +2660,7 @@ def _delete_linked_account_data(data: Dict[str, Any]) -> Dict[str, int]:
             ],
         ),
     }
+    _remove_twin_index_members(data["profiles"])
     _analytics_overview_cache.clear()
     return counts
 
@@ -2135,6 +2749,7 @@ def _sweep_expired_profiles(now_seconds: int) -> int:
             )
         if int(expiration_time) <= now_seconds:
             moral_profiles_table.delete_item(Key={"publicId": profile["publicId"]})
+            _remove_twin_index_members([profile])
             deleted += 1
     return deleted
 
@@ -2188,6 +2803,231 @@ def retention_sweep_handler(_event, _context):
     return result
 
 
+def _rebuild_archetype_census(now_seconds: int) -> Dict[str, Any]:
+    """Count every live profile under the current archetypes version and
+    store the census as a single row. Each scan page is tallied as it
+    arrives, so only one page per segment is ever held in memory."""
+    archetypes_version = get_archetypes_version()
+    counts: Counter = Counter()
+    stored_versions: Counter = Counter()
+    dimension_values: Dict[str, Counter] = defaultdict(Counter)
+    twin_members: Dict[str, tuple[str, str]] = {}
+    tally_lock = Lock()
+
+    def tally_page(profiles: list[Dict[str, Any]]) -> None:
+        page_counts, page_versions, page_values = tally_profiles(profiles, archetypes_version, now_seconds)
+        page_twins = _live_twin_members(profiles, now_seconds)
+        with tally_lock:
+            counts.update(page_counts)
+            stored_versions.update(page_versions)
+            for dimension, values in page_values.items():
+                dimension_values[dimension].update(values)
+            twin_members.update(page_twins)
+
+    _, scan_stats = _segmented_scan(
+        moral_profiles_table,
+        ARCHETYPE_CENSUS_SCAN_SEGMENTS,
+        projection=["publicId", "archetypeId", "archetypesVersion", "dimensionAverages", "expirationTime", "createdAt"],
+        page_handler=tally_page,
+    )
+    census = build_archetype_census(counts, stored_versions, archetypes_version, now_seconds, dimension_values)
+    table.put_item(Item={
+        "_id": ARCHETYPE_CENSUS_ID,
+        "builtAt": now_seconds,
+        "census": json.dumps(census, separators=(",", ":")),
+    })
+    try:
+        twin_index_updates = _reconcile_twin_index(twin_members, now_seconds)
+    except Exception:
+        logger.exception("Unable to reconcile the moral twin index")
+        twin_index_updates = None
+    return {
+        **scan_stats,
+        "archetypesVersion": archetypes_version,
+        "profiles": census["total"],
+        "twinIndexUpdates": twin_index_updates,
+    }
+
+
+def _live_twin_members(profiles: list[Dict[str, Any]], now_seconds: int) -> Dict[str, tuple[str, str]]:
+    """{publicId: (twin cell, encoded member)} for the unexpired, readable
+    profiles of one scan page."""
+    members = {}
+    for profile in profiles:
+        expiration_time = profile.get("expirationTime")
+        if expiration_time is not None and int(expiration_time) <= now_seconds:
+            continue
+        try:
+            averages = json.loads(profile["dimensionAverages"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if not isinstance(averages, dict) or not profile.get("publicId"):
+            continue
+        members[profile["publicId"]] = (
+            twin_cell(averages),
+            encode_twin_member(averages, int(profile.get("createdAt") or 0) // 1000),
+        )
+    return members
+
+
+def _read_twin_index_cells() -> Dict[str, Dict[str, str]]:
+    """Every moral twin index member, {cell: {publicId: member}}, read with
+    a parallel scan of the index table."""
+    items, _ = _segmented_scan(
+        moral_twin_index_table, TWIN_INDEX_SCAN_SEGMENTS, projection=["cell", "publicId", "member", "removed"],
+    )
+    return twin_cell_members(items)
+
+
+def _read_twin_index_changes(since: int, until: int) -> list[Dict[str, Any]]:
+    """Index entries (members and removal markers) written from `since`
+    on, read from the table's ChangesIndex one changeDay bucket at a time:
+    the cost follows the number of writes, not the size of the index."""
+    items = []
+    for change_day in twin_change_days(since, until):
+        items.extend(_query_all(
+            moral_twin_index_table,
+            IndexName="ChangesIndex",
+            KeyConditionExpression="changeDay = :day AND updatedAt >= :since",
+            ExpressionAttributeValues={":day": change_day, ":since": int(since)},
+        ))
+    return items
+
+
+def _reconcile_twin_index(live_members: Dict[str, tuple[str, str]], scan_started_at: int) -> int:
+    """Bring the moral twin index in line with a full profile scan: file
+    profiles a failed best-effort write left out and drop members of
+    profiles deleted without their index entry. Returns the entries
+    changed."""
+    changes = twin_index_changes(_read_twin_index_cells(), live_members, scan_started_at)
+    changed = 0
+    now_seconds = int(time.time())
+    # batch_writer also retries unprocessed writes.
+    with moral_twin_index_table.batch_writer() as writer:
+        for cell, change in sorted(changes.items()):
+            for public_id, member in sorted(change["set"].items()):
+                writer.put_item(Item=twin_index_item(cell, public_id, now_seconds, member))
+            for public_id in change["remove"]:
+                writer.put_item(Item=twin_index_item(cell, public_id, now_seconds))
+            changed += len(change["set"]) + len(change["remove"])
+    return changed
+
+
+def archetype_census_handler(_event, _context):
+    """Daily job, scheduled next to the retention sweep, that rebuilds the
+    population census behind the archetypeSharePct and dimensionPercentiles
+    that profile reads and /analyze-results return. Picks up a hot-reloaded
+    archetype catalog first, so the census is counted under the same
+    archetypesVersion the API serves."""
+    refresh_archetype_catalog()
+    result = _rebuild_archetype_census(int(time.time()))
+    logger.info("Archetype census completed: %s", result)
+    return result
+
+
+def _cached_stats_row(
+    cache: Dict[str, Any],
+    lock: Lock,
+    key: str,
+    row_id: str,
+    ttl_seconds: float,
+    parse: Callable[[Optional[Dict[str, Any]]], Any],
+) -> Any:
+    """`parse` of one stats row (None when the row doesn't exist), kept in
+    `cache[key]` and re-read with one GetItem every `ttl_seconds`. If the
+    row can't be read or parsed, the previous value keeps being served, or
+    parse(None) when nothing was cached yet."""
+    now = time.time()
+    with lock:
+        entry = cache.get(key)
+    if entry and now - entry["checkedAt"] < ttl_seconds:
+        return entry["value"]
+
+    try:
+        value = parse(table.get_item(Key={"_id": row_id}).get("Item"))
+    except Exception:
+        logger.exception("Unable to read stats row %s", row_id)
+        value = entry["value"] if entry else parse(None)
+    with lock:
+        cache[key] = {"value": value, "checkedAt": now}
+    return value
+
+
+def get_archetype_census() -> Dict[str, Any]:
+    """This container's copy of the archetype census, re-read every
+    ARCHETYPE_CENSUS_TTL_SECONDS. Before the first scheduled run (or if the
+    row is unreadable and nothing was cached yet) an empty census is
+    served, which reports no share for any archetype."""
+    return _cached_stats_row(
+        _archetype_census_cache, _archetype_census_lock, "census", ARCHETYPE_CENSUS_ID,
+        ARCHETYPE_CENSUS_TTL_SECONDS,
+        lambda item: json.loads(item["census"]) if item else empty_archetype_census(),
+    )
+
+
+def _load_twin_index() -> Dict[str, Any]:
+    """Bring this container's in-memory twin index up to date. The first
+    load scans the index table; later ones only read the entries written
+    since the previous read (see _read_twin_index_changes) and rebuild the
+    in-memory index only if any of them changed it. A full rescan happens
+    again only when the previous read is older than removal markers are
+    kept. If the table can't be read the previous index (or an empty one)
+    keeps being served and the same window is retried next time."""
+    with _twin_index_lock:
+        entry = _twin_index_cache.get("index")
+    now_seconds = int(time.time())
+    try:
+        if entry and now_seconds - entry["syncedAt"] < TWIN_REMOVAL_RETENTION_SECONDS - TWIN_INDEX_CHANGE_OVERLAP_SECONDS:
+            changed_cells = apply_twin_index_changes(
+                entry["cells"],
+                _read_twin_index_changes(entry["syncedAt"] - TWIN_INDEX_CHANGE_OVERLAP_SECONDS, now_seconds),
+            )
+            if changed_cells is None:
+                cells, index = entry["cells"], entry["index"]
+            else:
+                cells, index = changed_cells, build_twin_index(changed_cells)
+        else:
+            cells = _read_twin_index_cells()
+            index = build_twin_index(cells)
+        synced_at = now_seconds
+    except Exception:
+        logger.exception("Unable to read the moral twin index")
+        if entry:
+            cells, index, synced_at = entry["cells"], entry["index"], entry["syncedAt"]
+        else:
+            cells, index, synced_at = {}, build_twin_index({}), 0
+    with _twin_index_lock:
+        _twin_index_cache["index"] = {"index": index, "cells": cells, "syncedAt": synced_at, "checkedAt": time.time()}
+        _twin_index_cache.pop("refreshing", None)
+    return index
+
+
+def get_twin_index() -> Dict[str, Any]:
+    """This container's in-memory moral twin index. Only the container's
+    first search waits for the index table to be read; after that, once
+    TWIN_INDEX_TTL_SECONDS have passed, the current index keeps being
+    served while a background worker applies what was written since, so a
+    new profile shows up in other containers' searches within about that
+    window."""
+    with _twin_index_lock:
+        entry = _twin_index_cache.get("index")
+        due = entry is not None and time.time() - entry["checkedAt"] >= TWIN_INDEX_TTL_SECONDS
+        if due and not _twin_index_cache.get("refreshing"):
+            _twin_index_cache["refreshing"] = True
+            _twin_index_executor.submit(_load_twin_index)
+    if entry:
+        return entry["index"]
+    return _load_twin_index()
+
+
+def _archetype_share_pct(archetype: Dict[str, Any]) -> Optional[int]:
+    return archetype_share_pct(get_archetype_census(), archetype["archetypeId"], archetype["archetypesVersion"])
+
+
+def _dimension_percentiles(averages: Dict[str, float]) -> Dict[str, Optional[int]]:
+    return dimension_percentiles(get_archetype_census(), averages)
+
+
 @app.delete("/users/me")
 async def delete_user_account(request: Request):
     """Delete the caller's account, linked app data, and Cognito identity."""
@@ -2222,6 +3062,21 @@ async def create_profile(profile_request: CreateProfileRequest, request: Request
     })
     return result
 
+@app.get("/archetypes")
+async def get_archetypes(request: Request, language: str = "en"):
+    """The localized copy of every archetype. It only changes with
+    archetypesVersion (a deploy), so it is tagged by version and language and
+    left to shared caches. Profile reads stay uncached: a deleted profile has
+    to stop resolving right away."""
+    lang_key = "it" if language == "it" else "en"
+    archetypes_version = get_archetypes_version()
+    etag = f'"archetypes.{archetypes_version}.{lang_key}"'
+    return _cacheable_response(request, {
+        "archetypesVersion": archetypes_version,
+        "language": lang_key,
+        "archetypes": archetype_catalog_copy(lang_key),
+    }, etag, CATALOG_READ_MAX_AGE_SECONDS)
+
 @app.get("/profiles/{public_id}")
 async def get_profile(public_id: str, request: Request, language: str = "en"):
     """Public, unlisted profile read (TASK-28/29). Excludes the owning
@@ -2229,14 +3084,305 @@ async def get_profile(public_id: str, request: Request, language: str = "en"):
     non-enumerable token so this is not a listing."""
     item = get_profile_or_404(public_id)
     averages = json.loads(item["dimensionAverages"])
-    archetype = assign_archetype(averages, language=language)
+    archetype = assign_archetype_cached(averages, language=language)
     return {
         "publicId": public_id,
         "averages": averages,
         "createdAt": item["createdAt"],
+        "archetypeSharePct": _archetype_share_pct(archetype),
+        "dimensionPercentiles": _dimension_percentiles(averages),
         **archetype,
     }
 
+
+@app.get("/profiles/{public_id}/twins")
+async def get_profile_twins(
+    public_id: str,
+    request: Request,
+    language: str = "en",
+    limit: int = Query(default=5, ge=1, le=TWIN_SEARCH_MAX_LIMIT),
+):
+    """The live profiles most compatible with this one ("moral twins"),
+    answered from the in-memory twin index (moral_twins.py) instead of
+    scoring every stored profile. Twins are described by their averages,
+    archetype and agreement only: their publicIds are unlisted links and
+    never leave the server."""
+    item = get_profile_or_404(public_id)
+    averages = json.loads(item["dimensionAverages"])
+    # Off the event loop: a container's first search reads the whole index.
+    index = await run_in_threadpool(get_twin_index)
+    twins = find_twins(index, averages, limit, exclude_public_id=public_id)
+    archetypes = assign_archetypes([twin["averages"] for twin in twins], language=language)
+    return {
+        "publicId": public_id,
+        "indexedProfiles": index["size"],
+        "twins": [
+            {
+                "overallAgreementPct": twin["overallAgreementPct"],
+                "averages": twin["averages"],
+                "archetype": archetype,
+            }
+            for twin, archetype in zip(twins, archetypes)
+        ],
+    }
+
+
+def _read_dilemma_catalog_manifest_version() -> Optional[str]:
+    """The version the populate script stamped on the catalog manifest row,
+    or None when the row is absent (e.g. a table populated before the
+    manifest existed) or unreadable - both mean "rescan on TTL"."""
+    try:
+        item = table.get_item(Key={"_id": CATALOG_MANIFEST_ID}).get("Item") or {}
+    except Exception as error:
+        logger.warning("Unable to read the dilemma catalog manifest: %s", type(error).__name__)
+        return None
+    version = item.get("catalogVersion")
+    return str(version) if version else None
+
+
+def _load_bundled_dilemma_catalog() -> Optional[Dict[str, Any]]:
+    """The artifact scripts/build_dilemma_catalog.py compiles into the Lambda
+    package as a flat sibling of this module, read once per container. None
+    outside a deployment package (local runs, tests), which just means every
+    load comes from the table."""
+    global _bundled_dilemma_catalog, _bundled_dilemma_catalog_loaded
+    if not _bundled_dilemma_catalog_loaded:
+        try:
+            _bundled_dilemma_catalog = load_catalog_artifact(str(Path(__file__).with_name(CATALOG_ARTIFACT_FILENAME)))
+        except (OSError, ValueError):
+            logger.exception("Bundled dilemma catalog is unreadable, loading from DynamoDB instead")
+            _bundled_dilemma_catalog = None
+        _bundled_dilemma_catalog_loaded = True
+    return _bundled_dilemma_catalog
+
+
+def _render_dilemma_response_heads(snapshot: Dict[str, Any]) -> Dict[str, bytes]:
+    """Serialize every catalog item as a DilemmaResponse once per snapshot.
+
+    Each value is the item's JSON body exactly as the response model would
+    render it, minus the vote counters and the closing brace, so a request
+    only has to append the live counters (see _dilemma_response_body).
+    Items the model rejects are left out and take the regular validated path.
+    """
+    heads = {}
+    for item_id, item in snapshot["itemsById"].items():
+        try:
+            rendered = DilemmaResponse.model_validate(item).model_dump(
+                mode="json", by_alias=True, exclude=set(VOTE_COUNTER_FIELDS)
+            )
+        except ValidationError:
+            logger.warning("Catalog dilemma %s does not match DilemmaResponse", item_id)
+            continue
+        # Same separators and escaping as Starlette's JSONResponse.
+        heads[item_id] = json.dumps(rendered, ensure_ascii=False, separators=(",", ":"))[:-1].encode("utf-8")
+    return heads
+
+
+def _dilemma_response_body(snapshot: Dict[str, Any], dilemma: Dict[str, Any]) -> Optional[bytes]:
+    """The pre-rendered body of `dilemma` with its live counters merged in,
+    left open so callers can append further fields. None when the item has
+    no pre-rendered head."""
+    head = snapshot.get("responseHeads", {}).get(dilemma["_id"])
+    if head is None:
+        return None
+    counters = f',"yesCount":{int(dilemma.get("yesCount", 0))},"noCount":{int(dilemma.get("noCount", 0))}'
+    return head + counters.encode("ascii")
+
+
+def _dilemma_etag(snapshot: Dict[str, Any], dilemma: Dict[str, Any]) -> str:
+    """Strong ETag of a single dilemma body: its copy is fixed by the catalog
+    version and `_id`, the counters are the only other varying bytes."""
+    return f'"{snapshot["version"]}.{dilemma["_id"]}.{int(dilemma.get("yesCount", 0))}.{int(dilemma.get("noCount", 0))}"'
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """Weak If-None-Match comparison (RFC 9110 13.1.2): `*` or any listed
+    tag whose opaque part equals `etag`'s, ignoring W/ prefixes."""
+    header = request.headers.get("If-None-Match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in header.split(","))
+
+
+def _cacheable_response(request: Request, payload: Any, etag: str, max_age: int) -> Response:
+    """`payload` as JSON with a validator and a shared-cache lifetime, or a
+    bodyless 304 when the caller already holds this representation. Callers
+    compute `etag` from in-memory versions only, so a revalidation never
+    reads DynamoDB."""
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max(0, int(max_age))}"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=payload, headers=headers)
+
+
+def get_dilemma_catalog(language: str) -> Dict[str, Any]:
+    """Return this container's catalog snapshot for `language`.
+
+    Loaded the first time a language is requested, then served from memory.
+    Once DILEMMA_CATALOG_TTL_SECONDS have passed, a single manifest GetItem
+    decides whether the copy actually changed: an unchanged manifest version
+    just extends the snapshot's lifetime, anything else triggers a reload. If
+    that reload fails, the stale snapshot keeps being served (and is retried
+    after another TTL) rather than turning a transient DynamoDB error into
+    failed questions.
+
+    When the bundled artifact was compiled from the same source files the
+    table was populated from (its catalogVersion equals the manifest's), the
+    snapshot is built from the artifact and the scan is skipped entirely;
+    any mismatch, or a table without a manifest, falls back to the scan.
+
+    Empty catalogs (an unsupported language) are not cached, so arbitrary
+    `language` values can't grow container memory.
+    """
+    now = time.time()
+    with _dilemma_catalog_lock:
+        entry = _dilemma_catalog_cache.get(language)
+    if entry and now - entry["checkedAt"] < DILEMMA_CATALOG_TTL_SECONDS:
+        return entry["snapshot"]
+
+    manifest_version = _read_dilemma_catalog_manifest_version()
+    if entry and manifest_version is not None and manifest_version == entry["snapshot"]["manifestVersion"]:
+        with _dilemma_catalog_lock:
+            _dilemma_catalog_cache[language] = {"snapshot": entry["snapshot"], "checkedAt": now}
+        return entry["snapshot"]
+
+    bundle = _load_bundled_dilemma_catalog()
+    if bundle and manifest_version is not None and bundle["catalogVersion"] == manifest_version:
+        items = bundle["languages"].get(language, [])
+        load_stats = {"source": "bundle", "segments": 0, "pages": 0, "consumedCapacityUnits": 0.0}
+    else:
+        try:
+            items, load_stats = _segmented_scan(
+                table,
+                DILEMMA_CATALOG_SCAN_SEGMENTS,
+                FilterExpression="attribute_exists(#lang) AND #lang = :language",
+                ExpressionAttributeNames={"#lang": "language"},
+                ExpressionAttributeValues={":language": language},
+            )
+        except Exception:
+            if not entry:
+                raise
+            logger.exception("Dilemma catalog refresh failed, serving the previous snapshot")
+            with _dilemma_catalog_lock:
+                _dilemma_catalog_cache[language] = {"snapshot": entry["snapshot"], "checkedAt": now}
+            return entry["snapshot"]
+        load_stats["source"] = "table"
+
+    snapshot = build_catalog_snapshot(
+        language,
+        [decimal_to_native(item) for item in items],
+        manifest_version=manifest_version,
+        loaded_at=now,
+    )
+    snapshot["responseHeads"] = _render_dilemma_response_heads(snapshot)
+    logger.info(
+        "Dilemma catalog loaded: language=%s source=%s items=%s version=%s segments=%s pages=%s consumedCapacityUnits=%s",
+        language, load_stats["source"], len(snapshot["ids"]), snapshot["version"],
+        load_stats["segments"], load_stats["pages"], load_stats["consumedCapacityUnits"],
+    )
+    if snapshot["ids"]:
+        with _dilemma_catalog_lock:
+            _dilemma_catalog_cache[language] = {"snapshot": snapshot, "checkedAt": now}
+    return snapshot
+
+
+def _get_dilemmas_by_base_ids(snapshot: Dict[str, Any], base_ids: list[str]) -> Dict[str, Dict[str, Any]]:
+    """Lookup by baseId in `snapshot`, keyed by baseId. A miss (a dilemma
+    added after this container's snapshot was taken) falls back to one direct
+    BatchGetItem for just the missing keys, so a catalog refresh lagging
+    behind a populate run never hides a dilemma someone else already saw."""
+    language = snapshot["language"]
+    found = dilemmas_by_base_ids(snapshot, base_ids)
+    missing = [base_id for base_id in dict.fromkeys(base_ids) if base_id not in found]
+    if missing:
+        suffix = f"-{language}"
+        for item in _batch_get_dilemma_items([{"_id": f"{base_id}{suffix}"} for base_id in missing]):
+            found[item["_id"][:-len(suffix)]] = decimal_to_native(item)
+    return found
+
+
+def _batch_get_dilemma_items(keys: list[Dict[str, str]]) -> list[Dict[str, Any]]:
+    """One BatchGetItem for up to 100 dilemma keys, re-requesting any
+    UnprocessedKeys with a short backoff. Keys still unprocessed after
+    DILEMMA_BATCH_GET_ATTEMPTS calls fail the request with a 503 instead of
+    silently dropping those dilemmas."""
+    items = []
+    request = {DYNAMODB_TABLE: {"Keys": keys}}
+    for attempt in range(DILEMMA_BATCH_GET_ATTEMPTS):
+        if attempt:
+            time.sleep(0.05 * 2 ** attempt)
+        response = dynamodb.batch_get_item(RequestItems=request)
+        items.extend(response.get("Responses", {}).get(DYNAMODB_TABLE, []))
+        request = response.get("UnprocessedKeys") or {}
+        if not request:
+            return items
+    logger.warning("Dilemma BatchGetItem left %s keys unprocessed", len(request[DYNAMODB_TABLE]["Keys"]))
+    raise HTTPException(status_code=503, detail="Dilemmas are temporarily unavailable")
+
+
+def _vote_counter_keys(dilemma_id: str) -> list[str]:
+    if VOTE_COUNTER_SHARDS == 1:
+        return [dilemma_id]
+    return [dilemma_id] + [vote_counter_shard_id(dilemma_id, shard) for shard in range(VOTE_COUNTER_SHARDS)]
+
+
+def _read_vote_counters(dilemma_ids: list[str]) -> Dict[str, Dict[str, int]]:
+    """Merged counters of each dilemma row and its shard rows, read with
+    BatchGetItem calls that project only the counters. Dilemmas without any
+    counter row are absent."""
+    keys = [key for dilemma_id in dilemma_ids for key in _vote_counter_keys(dilemma_id)]
+    rows = []
+    for start in range(0, len(keys), 100):
+        response = dynamodb.batch_get_item(RequestItems={DYNAMODB_TABLE: {
+            "Keys": [{"_id": key} for key in keys[start:start + 100]],
+            "ProjectionExpression": "#id, " + ", ".join(VOTE_COUNTER_FIELDS),
+            "ExpressionAttributeNames": {"#id": "_id"},
+        }})
+        rows.extend(response.get("Responses", {}).get(DYNAMODB_TABLE, []))
+    return merge_vote_counters(decimal_to_native(row) for row in rows)
+
+
+def _with_live_vote_counts(items: list[Dict[str, Any]]) -> list[Dict[str, Any]]:
+    """Fill in the /vote counters catalog items don't carry. Best-effort: on
+    failure the counters stay absent, which every client already treats as
+    zero. With sharded counters the merged result is kept for
+    VOTE_COUNTER_ROLLUP_TTL_SECONDS per container."""
+    pending = [item for item in items if not all(field in item for field in VOTE_COUNTER_FIELDS)]
+    if not pending:
+        return items
+    dilemma_ids = list(dict.fromkeys(item["_id"] for item in pending))
+    counters_by_id: Dict[str, Dict[str, int]] = {}
+    now = time.time()
+    if VOTE_COUNTER_SHARDS > 1:
+        with _vote_counter_rollup_lock:
+            for dilemma_id in dilemma_ids:
+                cached = _vote_counter_rollup_cache.get(dilemma_id)
+                if cached and cached[0] > now:
+                    counters_by_id[dilemma_id] = cached[1]
+
+    missing = [dilemma_id for dilemma_id in dilemma_ids if dilemma_id not in counters_by_id]
+    if missing:
+        try:
+            fresh = _read_vote_counters(missing)
+        except Exception:
+            logger.exception("Unable to read dilemma vote counters")
+            fresh = None
+        if fresh is not None:
+            counters_by_id.update(fresh)
+            if VOTE_COUNTER_SHARDS > 1:
+                expires_at = now + VOTE_COUNTER_ROLLUP_TTL_SECONDS
+                with _vote_counter_rollup_lock:
+                    for dilemma_id in missing:
+                        _vote_counter_rollup_cache[dilemma_id] = (expires_at, fresh.get(dilemma_id, {}))
+
+    for item in pending:
+        item.update(counters_by_id.get(item["_id"], {}))
+    return items
+
+
 @app.get("/dilemmas/by-ids")
 async def get_dilemmas_by_ids(ids: str, request: Request, language: str = "en"):
     """Fetch specific dilemmas by their language-neutral baseId, in order.
@@ -2244,6 +3390,12 @@ async def get_dilemmas_by_ids(ids: str, request: Request, language: str = "en"):
     Used to serve a Duel invitee the exact same dilemmas the creator
     answered, in the invitee's own language (dilemmas share one baseId
     across languages; see scripts/populate_dynamodb_multilang.py).
+
+    Only the copy is returned; the live vote counters come from
+    /dilemmas/vote-counts. Every invitee of a Duel and every Party Room
+    participant asks for the same id list, so a fully catalog-backed answer
+    carries a weak ETag (catalog version + requested ids) and a public
+    max-age, and a revalidation gets its 304 from memory.
     """
     if not language or len(language) > 10 or not language.isalpha():
         raise HTTPException(status_code=400, detail="Invalid language parameter")
@@ -2251,18 +3403,171 @@ async def get_dilemmas_by_ids(ids: str, request: Request, language: str = "en"):
     if not base_ids:
         raise HTTPException(status_code=400, detail="No dilemma ids provided")
 
-    keys = [{"_id": f"{base_id}-{language}"} for base_id in base_ids]
-    response = dynamodb.batch_get_item(RequestItems={DYNAMODB_TABLE: {"Keys": keys}})
-    items_by_key = {
-        item["_id"]: decimal_to_native(item)
-        for item in response.get("Responses", {}).get(DYNAMODB_TABLE, [])
-    }
-    ordered = [
-        items_by_key[f"{base_id}-{language}"]
+    snapshot = get_dilemma_catalog(language)
+    if all(f"{base_id}-{language}" in snapshot["itemsById"] for base_id in base_ids):
+        ids_digest = hashlib.sha256(",".join(base_ids).encode("utf-8")).hexdigest()[:12]
+        etag = f'W/"{snapshot["version"]}.{ids_digest}"'
+        if _etag_matches(request, etag):
+            return _cacheable_response(request, None, etag, CATALOG_READ_MAX_AGE_SECONDS)
+        items_by_base_id = dilemmas_by_base_ids(snapshot, base_ids)
+        payload = {"dilemmas": [items_by_base_id[base_id] for base_id in base_ids]}
+        return _cacheable_response(request, payload, etag, CATALOG_READ_MAX_AGE_SECONDS)
+
+    # Some ids need the direct-read fallback, outside the versioned snapshot,
+    # so there is nothing stable to tag.
+    items_by_base_id = _get_dilemmas_by_base_ids(snapshot, base_ids)
+    return {"dilemmas": [
+        {key: value for key, value in items_by_base_id[base_id].items() if key not in VOTE_COUNTER_FIELDS}
         for base_id in base_ids
-        if f"{base_id}-{language}" in items_by_key
-    ]
-    return {"dilemmas": ordered}
+        if base_id in items_by_base_id
+    ]}
+
+
+@app.get("/dilemmas/vote-counts")
+async def get_dilemma_vote_counts(ids: str, language: str = "en"):
+    """Live yesCount/noCount of specific dilemmas (by baseId), the part of a
+    /dilemmas/by-ids answer that changes with every vote, so it is served
+    separately and never cached. Dilemmas without votes count zero."""
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    base_ids = list(dict.fromkeys(item.strip() for item in ids.split(",") if item.strip()))[:20]
+    if not base_ids:
+        raise HTTPException(status_code=400, detail="No dilemma ids provided")
+
+    counted = _with_live_vote_counts([{"_id": f"{base_id}-{language}"} for base_id in base_ids])
+    return {"counts": {
+        base_id: {field: int(item.get(field, 0)) for field in VOTE_COUNTER_FIELDS}
+        for base_id, item in zip(base_ids, counted)
+    }}
+
+
+def _vote_split_etag(index: Dict[str, Any], *parts: str) -> str:
+    digest = hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:12]
+    return f'"splits.{index["language"]}.{index.get("builtAt")}.{digest}"'
+
+
+@app.get("/dilemmas/splits")
+async def get_dilemma_splits(ids: str, request: Request, language: str = "en"):
+    """How everyone voted on specific dilemmas (by baseId), for the results
+    screen and the Party Room reveal. Served from the in-memory split
+    index, so the numbers are as of its last scheduled rebuild (`builtAt`);
+    dilemmas without votes are absent."""
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    base_ids = [item.strip() for item in ids.split(",") if item.strip()][:30]
+    if not base_ids:
+        raise HTTPException(status_code=400, detail="No dilemma ids provided")
+
+    index = get_vote_split_index(language)
+    return _cacheable_response(request, {
+        "language": language,
+        "builtAt": index.get("builtAt"),
+        "splits": splits_for_base_ids(index, base_ids),
+    }, _vote_split_etag(index, *base_ids), VOTE_SPLIT_INDEX_TTL_SECONDS)
+
+
+@app.get("/dilemmas/most-divisive")
+async def get_most_divisive_dilemmas(
+    request: Request,
+    language: str = "en",
+    limit: int = Query(default=10, ge=1, le=50),
+):
+    """The dilemmas whose votes split closest to 50/50 (with enough votes to
+    mean something), most divisive first, with their copy. O(limit)."""
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    index = get_vote_split_index(language)
+    ranking = most_divisive(index, limit)
+    snapshot = get_dilemma_catalog(language)
+    copies = dilemmas_by_base_ids(snapshot, [entry["baseId"] for entry in ranking])
+    return _cacheable_response(request, {
+        "language": language,
+        "builtAt": index.get("builtAt"),
+        "dilemmas": [
+            {
+                **entry,
+                "dilemma": copies[entry["baseId"]].get("dilemma"),
+                "firstAnswer": copies[entry["baseId"]].get("firstAnswer"),
+                "secondAnswer": copies[entry["baseId"]].get("secondAnswer"),
+            }
+            for entry in ranking
+            if entry["baseId"] in copies
+        ],
+    }, _vote_split_etag(index, "most-divisive", str(limit), snapshot["version"]), VOTE_SPLIT_INDEX_TTL_SECONDS)
+
+
+def _offline_catalog_item_ids(snapshot: Dict[str, Any]) -> list[str]:
+    """Catalog ids a client may store offline: the ones with a pre-rendered
+    body, i.e. exactly what /get-dilemma can serve."""
+    heads = snapshot.get("responseHeads", {})
+    return [item_id for item_id in snapshot["ids"] if item_id in heads]
+
+
+@app.get("/dilemmas/catalog")
+async def get_dilemma_catalog_manifest(request: Request, language: str = "en"):
+    """Versioned manifest of a language's catalog for clients that keep an
+    offline copy: the catalog version plus every baseId with its content
+    hash. A client whose stored version differs asks
+    /dilemmas/catalog/delta for just the items it lacks."""
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    snapshot = get_dilemma_catalog(language)
+    suffix_length = len(language) + 1
+    return _cacheable_response(request, {
+        "language": language,
+        "version": snapshot["version"],
+        "items": [
+            {"baseId": item_id[:-suffix_length], "hash": snapshot["itemHashes"][item_id]}
+            for item_id in _offline_catalog_item_ids(snapshot)
+        ],
+    }, f'"catalog.{language}.{snapshot["version"]}"', CATALOG_READ_MAX_AGE_SECONDS)
+
+
+@app.get("/dilemmas/catalog/delta")
+async def get_dilemma_catalog_delta(
+    request: Request,
+    language: str = "en",
+    since: str = "",
+    have: str = "",
+):
+    """Items added or changed since the client's stored catalog.
+
+    `since` is the catalog version the client last synced and `have` the
+    comma-separated item hashes it holds (from a previous manifest or
+    delta). A client already on the current version gets no items; anyone
+    else gets every item whose hash it doesn't hold, rendered exactly like
+    /get-dilemma minus the live vote counters. `baseIds` always lists the
+    full current catalog so the client can drop anything no longer in it.
+    """
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    if len(since) > 64 or len(have) > DILEMMA_CATALOG_DELTA_MAX_HAVE_LENGTH:
+        raise HTTPException(status_code=400, detail="Catalog delta parameters are too long")
+    snapshot = get_dilemma_catalog(language)
+    offline_ids = _offline_catalog_item_ids(snapshot)
+    if since == snapshot["version"]:
+        changed_ids = []
+    else:
+        offline = set(offline_ids)
+        known_hashes = [item_hash.strip() for item_hash in have.split(",") if item_hash.strip()]
+        changed_ids = [item_id for item_id in changed_item_ids(snapshot, known_hashes) if item_id in offline]
+
+    request_digest = hashlib.sha256(f"{since}|{have}".encode("utf-8")).hexdigest()[:12]
+    etag = f'"catalog-delta.{language}.{snapshot["version"]}.{request_digest}"'
+    if _etag_matches(request, etag):
+        return _cacheable_response(request, None, etag, CATALOG_READ_MAX_AGE_SECONDS)
+
+    heads = snapshot["responseHeads"]
+    suffix_length = len(language) + 1
+    return _cacheable_response(request, {
+        "language": language,
+        "version": snapshot["version"],
+        "baseIds": [item_id[:-suffix_length] for item_id in offline_ids],
+        "items": [
+            {**json.loads(heads[item_id] + b"}"), "hash": snapshot["itemHashes"][item_id]}
+            for item_id in changed_ids
+        ],
+    }, etag, CATALOG_READ_MAX_AGE_SECONDS)
 
 
 def _load_daily_moral_crime_catalog() -> Dict[str, Any]:
@@ -2348,7 +3653,7 @@ def _daily_moral_crime_base_id(day_key: str) -> tuple[str, str]:
 
 def _daily_moral_crime_dilemma(day_key: str) -> tuple[Dict[str, Any], str]:
     base_id, catalog_version = _daily_moral_crime_base_id(day_key)
-    dilemma = decimal_to_native(table.get_item(Key={"_id": f"{base_id}-en"}).get("Item") or {})
+    dilemma = _get_dilemmas_by_base_ids(get_dilemma_catalog("en"), [base_id]).get(base_id) or {}
     if not dilemma:
         logger.error("Daily Moral Crime configured dilemma is missing: %s", base_id)
         raise HTTPException(status_code=503, detail="Today's dilemma is temporarily unavailable")
@@ -2383,13 +3688,13 @@ def _daily_moral_crime_results(day_key: str) -> Dict[str, int]:
     }
 
 
-def _daily_moral_crime_response(
+def _daily_moral_crime_copy(
     window: Dict[str, Any],
-    anonymous_user_id: str,
+    dilemma: Dict[str, Any],
+    catalog_version: str,
 ) -> Dict[str, Any]:
-    dilemma, catalog_version = _daily_moral_crime_dilemma(window["dayKey"])
-    vote = _daily_moral_crime_vote(window["dayKey"], anonymous_user_id)
-    response = {
+    """The part of a Daily response that is the same for every caller."""
+    return {
         "dayKey": window["dayKey"],
         "catalogVersion": catalog_version,
         "releaseAt": window["releaseAt"].isoformat(),
@@ -2400,6 +3705,17 @@ def _daily_moral_crime_response(
             "firstAnswer": dilemma.get("firstAnswer"),
             "secondAnswer": dilemma.get("secondAnswer"),
         },
+    }
+
+
+def _daily_moral_crime_response(
+    window: Dict[str, Any],
+    anonymous_user_id: str,
+) -> Dict[str, Any]:
+    dilemma, catalog_version = _daily_moral_crime_dilemma(window["dayKey"])
+    vote = _daily_moral_crime_vote(window["dayKey"], anonymous_user_id)
+    response = {
+        **_daily_moral_crime_copy(window, dilemma, catalog_version),
         "hasVoted": vote is not None,
     }
     # Aggregates and the tailored reflection stay behind the vote. The raw
@@ -2428,6 +3744,28 @@ async def get_daily_moral_crime(request: Request):
     return _daily_moral_crime_response(_daily_moral_crime_window(), anonymous_user_id)
 
 
+@app.get("/daily-moral-crime/dilemma")
+async def get_daily_moral_crime_dilemma(request: Request):
+    """Today's Daily copy alone: the identity-free part of GET
+    /daily-moral-crime (no vote, reflection or results), so it is the same
+    bytes for everyone until the next release. Tagged by day, deck version
+    and EN catalog version, and cacheable until `nextReleaseAt`."""
+    window = _daily_moral_crime_window()
+    _, catalog_version = _daily_moral_crime_base_id(window["dayKey"])
+    etag = f'"{window["dayKey"]}.{catalog_version}.{get_dilemma_catalog("en")["version"]}"'
+    seconds_until_release = ceil((window["nextReleaseAt"] - datetime.now(timezone.utc)).total_seconds())
+    if _etag_matches(request, etag):
+        return _cacheable_response(request, None, etag, seconds_until_release)
+
+    dilemma, _ = _daily_moral_crime_dilemma(window["dayKey"])
+    return _cacheable_response(
+        request,
+        _daily_moral_crime_copy(window, dilemma, catalog_version),
+        etag,
+        seconds_until_release,
+    )
+
+
 @app.post("/daily-moral-crime/vote")
 async def vote_daily_moral_crime(vote_request: DailyMoralCrimeVoteRequest, request: Request):
     """Atomically store one immutable Daily vote and increment its aggregate.
@@ -2548,7 +3886,7 @@ async def open_challenge(token: str, request: Request, language: str = "en"):
     creator_participant = get_participant(token, "creator")
     creator_profile = get_profile_or_404(creator_participant["profilePublicId"])
     creator_averages = json.loads(creator_profile["dimensionAverages"])
-    creator_archetype = assign_archetype(creator_averages, language=language)
+    creator_archetype = assign_archetype_cached(creator_averages, language=language)
 
     invitee_participant = get_participant(token, "invitee")
     is_own_challenge = creator_participant["anonymousUserId"] == anonymous_user_id
@@ -2655,9 +3993,47 @@ async def submit_challenge(token: str, submit_request: SubmitChallengeRequest, r
         ExpressionAttributeNames={"#status": "status"},
         ExpressionAttributeValues={":completed": "completed"},
     )
+    _record_duel_agreement(token, profile_result["averages"])
     _track_duel_event(request, "challenge_completed", {"archetype_id": profile_result["archetypeId"]})
     return {"challengeToken": token, "status": "completed", "profilePublicId": profile_result["publicId"]}
 
+
+def _record_duel_agreement(token: str, invitee_averages: Dict[str, float]) -> None:
+    """Add a just-completed duel's overall agreement to the distribution
+    behind /compare's agreementTopPct, with one atomic ADD. Runs once per
+    duel, since submit_challenge only gets here once per challenge.
+    Best-effort: a failure leaves the duel out of the distribution."""
+    try:
+        creator_participant = get_participant(token, "creator")
+        creator_profile = moral_profiles_table.get_item(
+            Key={"publicId": creator_participant["profilePublicId"]},
+        ).get("Item")
+        if not creator_profile:
+            return
+        agreement_pct = compute_compatibility(
+            json.loads(creator_profile["dimensionAverages"]), invitee_averages,
+        )["overallAgreementPct"]
+        table.update_item(
+            Key={"_id": DUEL_AGREEMENT_DISTRIBUTION_ID},
+            UpdateExpression="ADD #bucket :one, #total :one",
+            ExpressionAttributeNames={"#bucket": agreement_bucket_attribute(agreement_pct), "#total": "total"},
+            ExpressionAttributeValues={":one": 1},
+        )
+    except Exception:
+        logger.exception("Unable to record duel agreement for the distribution")
+
+
+def _duel_agreement_top_pct(agreement_pct: float) -> Optional[int]:
+    """"Top X%" of a pair's agreement among recorded duels, from this
+    container's copy of the distribution, re-read every
+    DUEL_AGREEMENT_TTL_SECONDS. None while too few duels are recorded."""
+    distribution = _cached_stats_row(
+        _duel_agreement_cache, _duel_agreement_lock, "distribution", DUEL_AGREEMENT_DISTRIBUTION_ID,
+        DUEL_AGREEMENT_TTL_SECONDS, agreement_distribution,
+    )
+    return agreement_top_pct(distribution, agreement_pct)
+
+
 def _fallback_duel_pair_insight(creator_name: str, invitee_name: str, overall_pct: int, language: str) -> str:
     """Always-available, no-AI insight (core flow must work without Groq)."""
     if language == "it":
@@ -2729,8 +4105,8 @@ async def compare_challenge(token: str, request: Request, language: str = "en"):
 
     creator_averages = json.loads(creator_profile["dimensionAverages"])
     invitee_averages = json.loads(invitee_profile["dimensionAverages"])
-    creator_archetype = assign_archetype(creator_averages, language=language)
-    invitee_archetype = assign_archetype(invitee_averages, language=language)
+    creator_archetype = assign_archetype_cached(creator_averages, language=language)
+    invitee_archetype = assign_archetype_cached(invitee_averages, language=language)
     compatibility = compute_compatibility(creator_averages, invitee_averages)
 
     # TASK-176: this page is intentionally viewable by anyone with the token
@@ -2751,6 +4127,7 @@ async def compare_challenge(token: str, request: Request, language: str = "en"):
         "creator": {"archetype": creator_archetype},
         "invitee": {"archetype": invitee_archetype},
         "compatibility": compatibility,
+        "agreementTopPct": _duel_agreement_top_pct(compatibility["overallAgreementPct"]),
         "pairInsightUnlocked": False,
         "isParticipant": is_participant,
     }
@@ -2870,25 +4247,52 @@ def _generate_room_code() -> str:
     return "".join(secrets.choice(PARTY_ROOM_CODE_ALPHABET) for _ in range(PARTY_ROOM_CODE_LENGTH))
 
 
-def _pick_random_dilemma_base_ids(language: str, count: int) -> list[str]:
+def _pick_random_dilemma_base_ids(language: str, count: int, focus: Optional[str] = None) -> list[str]:
     """Sample `count` distinct dilemma base ids once, up front, so every
     participant in the room answers the identical set (unlike Duel, where
-    dilemmas come from whichever profile the creator already completed)."""
-    response = table.scan(
-        FilterExpression='attribute_exists(#lang) AND #lang = :language',
-        ExpressionAttributeNames={'#lang': 'language'},
-        ExpressionAttributeValues={':language': language},
-    )
-    suffix = f"-{language}"
-    base_ids = sorted({
-        item['_id'][:-len(suffix)] for item in response.get('Items', [])
-        if item.get('_id', '').endswith(suffix)
-    })
-    if not base_ids:
+    dilemmas come from whichever profile the creator already completed).
+    With a `focus` the pick comes from the snapshot's dimension rankings."""
+    snapshot = get_dilemma_catalog(language)
+    if not snapshot["baseIds"]:
         raise HTTPException(status_code=404, detail=f"No dilemmas found for language: {language}")
-    if len(base_ids) <= count:
-        return base_ids
-    return random.sample(base_ids, count)
+    if focus:
+        return themed_base_ids(snapshot, count, focus)
+    return sample_base_ids(snapshot, count)
+
+
+def get_choice_signature_table(language: str, base_ids: list[str], build: bool = True) -> Optional[Dict[str, Any]]:
+    """The choice-signature table of a fixed deck in `language`, built once
+    per container, catalog version and archetypes version; with
+    build=False, only a table this container already built. None for decks
+    too long for a table or with dilemmas missing from the catalog, which
+    keep the per-vote path."""
+    if len(base_ids) > CHOICE_SIGNATURE_MAX_CHOICES:
+        return None
+    try:
+        snapshot = get_dilemma_catalog(language)
+    except HTTPException:
+        return None
+    key = (language, tuple(base_ids), snapshot["version"], get_archetypes_version())
+    with _choice_signature_lock:
+        signature_table = _choice_signature_tables.get(key)
+    if signature_table is not None or not build:
+        return signature_table
+
+    items = dilemmas_by_base_ids(snapshot, base_ids)
+    if len(items) != len(set(base_ids)):
+        return None
+    try:
+        signature_table = build_choice_signature_table(
+            signature_rounds([items[base_id] for base_id in base_ids], get_archetype_dimensions())
+        )
+    except (KeyError, TypeError, ValueError):
+        logger.exception("Unable to build a choice signature table for %s", language)
+        return None
+    with _choice_signature_lock:
+        while len(_choice_signature_tables) >= CHOICE_SIGNATURE_TABLE_CACHE_SIZE:
+            _choice_signature_tables.pop(next(iter(_choice_signature_tables)))
+        _choice_signature_tables[key] = signature_table
+    return signature_table
 
 
 def get_room_or_404(room_code: str) -> Dict[str, Any]:
@@ -2962,8 +4366,12 @@ def _advance_party_room_if_due(room: Dict[str, Any]) -> Dict[str, Any]:
                 ":false": False,
             }
         else:
-            update_expression = "SET #status = :newStatus"
-            expression_values = {":newStatus": "completed"}
+            # The final results only depend on votes that can no longer
+            # change, so they are computed once, here, and stored with the
+            # transition; polls of the completed room just read them back.
+            final_results = _party_room_final_results(room, _list_party_participants(room["roomCode"]))
+            update_expression = "SET #status = :newStatus, finalResults = :results"
+            expression_values = {":newStatus": "completed", ":results": json.dumps(final_results)}
 
     try:
         response = party_rooms_table.update_item(
@@ -2991,7 +4399,12 @@ async def create_party_room(create_request: CreatePartyRoomRequest, request: Req
     """Host creates a room (TASK-46). Anonymous-first, like every other core
     endpoint: only the existing X-Anonymous-User-Id identity is required."""
     anonymous_user_id = require_anonymous_user_id(request)
-    dilemma_base_ids = _pick_random_dilemma_base_ids(create_request.language, create_request.dilemmaCount)
+    dilemma_base_ids = _pick_random_dilemma_base_ids(
+        create_request.language, create_request.dilemmaCount, create_request.deckFocus,
+    )
+    # Precompute the deck's choice-signature table in the background, so
+    # final results on this container are a lookup.
+    _choice_signature_executor.submit(get_choice_signature_table, create_request.language, dilemma_base_ids)
 
     now = int(time.time() * 1000)
     expiration_time = int(time.time()) + PARTY_ROOM_TTL_SECONDS
@@ -3011,6 +4424,7 @@ async def create_party_room(create_request: CreatePartyRoomRequest, request: Req
                     "hostAdvanceRequested": False,
                     "createdAt": now,
                     "expirationTime": expiration_time,
+                    **({"deckFocus": create_request.deckFocus} if create_request.deckFocus else {}),
                 },
                 ConditionExpression="attribute_not_exists(roomCode)",
             )
@@ -3152,34 +4566,86 @@ async def submit_party_vote(room_code: str, vote_request: SubmitPartyVoteRequest
         raise HTTPException(status_code=403, detail="Join this room before voting")
 
     round_key = str(room["currentRoundIndex"])
-    try:
-        party_participants_table.update_item(
-            Key={"roomCode": room_code, "participantId": anonymous_user_id},
-            UpdateExpression="SET votes.#round = :vote",
-            ConditionExpression="attribute_not_exists(votes.#round)",
-            ExpressionAttributeNames={"#round": round_key},
-            ExpressionAttributeValues={
-                # chosenValues is stored as a JSON string, not a native Map -
-                # boto3's resource API rejects raw Python floats in DynamoDB
-                # attributes (they'd need converting to Decimal), and this
-                # matches the same json.dumps pattern already used for
-                # dimensionAverages on moral_profiles_table.
-                ":vote": {
-                    "choice": vote_request.choice,
-                    "chosenValues": json.dumps(vote_request.chosenValues, separators=(",", ":")),
+    chosen_values = json.dumps(vote_request.chosenValues, separators=(",", ":"))
+    for attempt in range(PARTY_VOTE_WRITE_ATTEMPTS):
+        votes = participant.get("votes", {})
+        if round_key in votes:
+            raise HTTPException(status_code=409, detail="You already voted this round")
+        dimension_sums = _party_vote_dimension_sums(participant, vote_request.chosenValues)
+        try:
+            party_participants_table.update_item(
+                Key={"roomCode": room_code, "participantId": anonymous_user_id},
+                UpdateExpression=(
+                    "SET votes.#round = :vote, dimensionSums = :sums, dimensionVoteCount = :vote_count"
+                ),
+                # size(votes) pins the running sums to the votes they were
+                # computed from: a vote landing in between fails the write
+                # and is re-read below instead of being counted twice or lost.
+                ConditionExpression="attribute_not_exists(votes.#round) AND size(votes) = :previous_votes",
+                ExpressionAttributeNames={"#round": round_key},
+                ExpressionAttributeValues={
+                    # chosenValues is stored as a JSON string, not a native Map -
+                    # boto3's resource API rejects raw Python floats in DynamoDB
+                    # attributes (they'd need converting to Decimal), and this
+                    # matches the same json.dumps pattern already used for
+                    # dimensionAverages on moral_profiles_table.
+                    ":vote": {"choice": vote_request.choice, "chosenValues": chosen_values},
+                    ":sums": dimension_sums,
+                    ":vote_count": len(votes) + 1,
+                    ":previous_votes": len(votes),
                 },
-            },
-        )
-    except ClientError as error:
-        if error.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+            )
+            break
+        except ClientError as error:
+            if error.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+            participant = party_participants_table.get_item(
+                Key={"roomCode": room_code, "participantId": anonymous_user_id}
+            ).get("Item") or {}
+    else:
+        if round_key in participant.get("votes", {}):
             raise HTTPException(status_code=409, detail="You already voted this round")
-        raise
+        raise HTTPException(status_code=409, detail="Your vote collided with another update, please retry")
 
     room = _advance_party_room_if_due(get_room_or_404(room_code))
     _track_duel_event(request, "party_room_vote_cast", {"room_code": room_code, "round_index": room["currentRoundIndex"]})
     return {"roomCode": room_code, "status": room["status"], "currentRoundIndex": room["currentRoundIndex"]}
 
 
+def _party_vote_dimension_sums(participant: Dict[str, Any], chosen_values: Dict[str, float]) -> Dict[str, Decimal]:
+    """The participant's running per-dimension sums with `chosen_values`
+    added, as stored on the participant item next to dimensionVoteCount.
+
+    Sums are accumulated as floats in vote order, the way
+    compute_dimension_averages adds answers, and stored as the Decimal of
+    their repr, which converts back to the identical float. A participant
+    whose stored sums don't cover all of its votes (one that voted before
+    sums were kept) has them rebuilt from its stored votes first."""
+    votes = participant.get("votes", {})
+    stored = participant.get("dimensionSums")
+    if stored is not None and participant.get("dimensionVoteCount") == len(votes):
+        sums = {dimension: float(total) for dimension, total in stored.items()}
+    else:
+        sums = {}
+        for round_key in sorted(votes, key=int):
+            for dimension, value in json.loads(votes[round_key]["chosenValues"]).items():
+                sums[dimension] = sums.get(dimension, 0) + value
+    for dimension, value in chosen_values.items():
+        sums[dimension] = sums.get(dimension, 0) + value
+    return {dimension: Decimal(repr(float(total))) for dimension, total in sums.items()}
+
+
+def _party_participant_averages(participant: Dict[str, Any]) -> Dict[str, float]:
+    """compute_dimension_averages over the participant's votes, read from
+    its running sums in O(dimensions) - falling back to parsing every
+    stored vote when the sums are missing or don't cover all of them."""
+    votes = participant.get("votes", {})
+    stored = participant.get("dimensionSums")
+    if stored is not None and votes and participant.get("dimensionVoteCount") == len(votes):
+        return {dimension: round(float(total) / len(votes), 2) for dimension, total in stored.items()}
+    return compute_dimension_averages([json.loads(vote["chosenValues"]) for vote in votes.values()])
+
+
 def _party_room_participant_summary(
     participant: Dict[str, Any], caller_anonymous_user_id: str, archetype: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
@@ -3206,6 +4672,128 @@ def _party_room_votes_by_round(participants: list, dilemma_count: int) -> list:
     return tallies
 
 
+def _party_room_final_results(room: Dict[str, Any], participants: list) -> Dict[str, Any]:
+    """The completed screen's results, in a form that is stored on the room
+    as JSON (finalResults): the participant list (query order, which is the
+    index the awards refer to), each voter's averages and matched archetype
+    id, the awards, the per-round tallies, and the most controversial
+    dilemma's text in the room's language. Nothing in it depends on the
+    language a poll asks for, so every poll can render it."""
+    # TASK-48/123: participant-index keys, never the raw anonymous_user_id,
+    # both for the awards computation and for referencing "which participant"
+    # from the response - consistent with never exposing internal IDs.
+    participant_averages_by_index: Dict[int, Dict[str, float]] = {}
+    participant_choices_by_index: Dict[int, Dict[int, str]] = {}
+    matched_by_index: Dict[int, tuple] = {}
+    # Participants who answered every round with the room's own catalog
+    # answers are a lookup in the deck's precomputed table; anyone else
+    # (skipped rounds, played in another language) is averaged from the
+    # running sums submit_party_vote keeps on the participant. The table has
+    # a row per signature (2**rounds) and these results are computed once
+    # per room, so it is only built here when it has no more rows than there
+    # are participants to assign; otherwise one this container built at room
+    # creation is used if there is one, and everyone else is assigned
+    # directly.
+    signature_table = get_choice_signature_table(
+        room["language"],
+        room["dilemmaBaseIds"],
+        build=1 << len(room["dilemmaBaseIds"]) <= len(participants),
+    )
+    for index, participant in enumerate(participants):
+        votes = participant.get("votes", {})
+        signature = choice_signature(signature_table, votes) if signature_table else None
+        if signature is not None:
+            averages, archetype_id, distance = lookup_choice_signature(signature_table, signature)
+            participant_averages_by_index[index] = averages
+            matched_by_index[index] = (archetype_id, distance)
+        elif votes:
+            participant_averages_by_index[index] = _party_participant_averages(participant)
+        participant_choices_by_index[index] = {
+            int(round_key): vote["choice"] for round_key, vote in votes.items()
+        }
+    # One vectorized assignment for everyone the table didn't cover.
+    remaining = [index for index in participant_averages_by_index if index not in matched_by_index]
+    matched_by_index.update(zip(remaining, [
+        (archetype["archetypeId"], archetype["distance"])
+        for archetype in assign_archetypes([participant_averages_by_index[index] for index in remaining])
+    ]))
+
+    votes_by_round = _party_room_votes_by_round(participants, len(room["dilemmaBaseIds"]))
+    awards = compute_party_room_awards(participant_averages_by_index, votes_by_round, participant_choices_by_index)
+    controversial_dilemma = None
+    if awards["mostControversialRoundIndex"] is not None:
+        controversial_dilemma = _party_room_dilemma_text(
+            room["dilemmaBaseIds"][awards["mostControversialRoundIndex"]], room["language"],
+        )
+
+    summaries = []
+    for index, participant in enumerate(participants):
+        summary = {
+            "participantId": participant["participantId"],
+            "displayName": participant["displayName"],
+            "isHost": participant.get("isHost", False),
+        }
+        if index in matched_by_index:
+            archetype_id, distance = matched_by_index[index]
+            summary.update({
+                "averages": participant_averages_by_index[index],
+                "archetypeId": archetype_id,
+                "distance": round(float(distance), 4),
+            })
+        summaries.append(summary)
+    return {
+        "archetypesVersion": get_archetypes_version(),
+        "participants": summaries,
+        "awards": awards,
+        "votesByRound": votes_by_round,
+        "controversialDilemma": controversial_dilemma,
+    }
+
+
+def _party_room_dilemma_text(base_id: str, language: str) -> Dict[str, Any]:
+    dilemma_item = _get_dilemmas_by_base_ids(get_dilemma_catalog(language), [base_id]).get(base_id) or {}
+    return {
+        "language": language,
+        "dilemma": dilemma_item.get("dilemma"),
+        "firstAnswer": dilemma_item.get("firstAnswer"),
+        "secondAnswer": dilemma_item.get("secondAnswer"),
+    }
+
+
+def _party_room_stored_results(room: Dict[str, Any]) -> Dict[str, Any]:
+    """finalResults of a completed room. Rooms that completed before results
+    were stored are computed from their participants once more, and the
+    result is stored for the next poll."""
+    if room.get("finalResults"):
+        return json.loads(room["finalResults"])
+    final_results = _party_room_final_results(room, _list_party_participants(room["roomCode"]))
+    try:
+        party_rooms_table.update_item(
+            Key={"roomCode": room["roomCode"]},
+            UpdateExpression="SET finalResults = :results",
+            ConditionExpression="attribute_not_exists(finalResults)",
+            ExpressionAttributeValues={":results": json.dumps(final_results)},
+        )
+    except ClientError:
+        logger.exception("Unable to store final results for party room %s", room["roomCode"])
+    return final_results
+
+
+def _party_room_results_archetypes(final_results: Dict[str, Any], language: str) -> Dict[int, Dict[str, Any]]:
+    """Archetype payloads, by participant index, for stored final results.
+    If the archetype catalog changed since they were stored, the stored
+    averages are matched again against the current one."""
+    indexes = [index for index, p in enumerate(final_results["participants"]) if "archetypeId" in p]
+    stored = [final_results["participants"][index] for index in indexes]
+    if final_results["archetypesVersion"] == get_archetypes_version():
+        payloads = archetype_payloads(
+            [p["archetypeId"] for p in stored], [p["distance"] for p in stored], language,
+        )
+    else:
+        payloads = assign_archetypes([p["averages"] for p in stored], language=language)
+    return dict(zip(indexes, payloads))
+
+
 def _fallback_party_group_verdict(archetype_names: list, language: str) -> str:
     """Always-available, no-AI verdict (core flow must work without Groq)."""
     unique_count = len(set(archetype_names))
@@ -3261,27 +4849,14 @@ async def get_party_room(room_code: str, request: Request, language: str = "en")
     anonymous_user_id = require_anonymous_user_id(request)
     room = get_room_or_404(room_code)
     room = _advance_party_room_if_due(room)
-    participants = _list_party_participants(room_code)
-    caller = next((p for p in participants if p["participantId"] == anonymous_user_id), None)
     is_completed = room["status"] == "completed"
-
-    # TASK-48/123: participant-index keys, never the raw anonymous_user_id,
-    # both for the awards computation and for referencing "which participant"
-    # from the response - consistent with never exposing internal IDs.
-    participant_averages_by_index: Dict[int, Dict[str, float]] = {}
-    participant_choices_by_index: Dict[int, Dict[int, str]] = {}
-    archetypes_by_index: Dict[int, Dict[str, Any]] = {}
-    if is_completed:
-        for index, participant in enumerate(participants):
-            votes = participant.get("votes", {})
-            answers = [json.loads(vote["chosenValues"]) for vote in votes.values()]
-            if answers:
-                averages = compute_dimension_averages(answers)
-                participant_averages_by_index[index] = averages
-                archetypes_by_index[index] = assign_archetype(averages, language=language)
-            participant_choices_by_index[index] = {
-                int(round_key): vote["choice"] for round_key, vote in votes.items()
-            }
+    # A completed room renders from the results stored when it completed,
+    # participant list included, so its polls don't query participants or
+    # recompute anything.
+    final_results = _party_room_stored_results(room) if is_completed else None
+    participants = final_results["participants"] if is_completed else _list_party_participants(room_code)
+    caller = next((p for p in participants if p["participantId"] == anonymous_user_id), None)
+    archetypes_by_index = _party_room_results_archetypes(final_results, language) if is_completed else {}
 
     response = {
         "roomCode": room_code,
@@ -3302,9 +4877,9 @@ async def get_party_room(room_code: str, request: Request, language: str = "en")
     if room["status"] in ("question", "reveal") and caller:
         round_key = str(room["currentRoundIndex"])
         current_base_id = room["dilemmaBaseIds"][room["currentRoundIndex"]]
-        dilemma_key = f"{current_base_id}-{language}"
-        dilemma_item = decimal_to_native(table.get_item(Key={"_id": dilemma_key}).get("Item") or {})
-        response["currentDilemma"] = dilemma_item or None
+        response["currentDilemma"] = _get_dilemmas_by_base_ids(
+            get_dilemma_catalog(language), [current_base_id],
+        ).get(current_base_id)
         response["hasVotedThisRound"] = round_key in caller.get("votes", {})
         if room["status"] == "reveal":
             first_votes = sum(1 for p in participants if p.get("votes", {}).get(round_key, {}).get("choice") == "first")
@@ -3324,20 +4899,18 @@ async def get_party_room(room_code: str, request: Request, language: str = "en")
             ]
 
     if is_completed:
-        votes_by_round = _party_room_votes_by_round(participants, len(room["dilemmaBaseIds"]))
-        awards = compute_party_room_awards(participant_averages_by_index, votes_by_round, participant_choices_by_index)
+        awards = dict(final_results["awards"])
         controversial_index = awards["mostControversialRoundIndex"]
         if controversial_index is not None:
-            base_id = room["dilemmaBaseIds"][controversial_index]
-            dilemma_item = decimal_to_native(
-                table.get_item(Key={"_id": f"{base_id}-{language}"}).get("Item") or {}
-            )
-            round_tally = votes_by_round[controversial_index]
+            dilemma_text = final_results["controversialDilemma"]
+            if dilemma_text["language"] != language:
+                dilemma_text = _party_room_dilemma_text(room["dilemmaBaseIds"][controversial_index], language)
+            round_tally = final_results["votesByRound"][controversial_index]
             awards["mostControversialDilemma"] = {
                 "roundIndex": controversial_index,
-                "dilemma": dilemma_item.get("dilemma"),
-                "firstAnswer": dilemma_item.get("firstAnswer"),
-                "secondAnswer": dilemma_item.get("secondAnswer"),
+                "dilemma": dilemma_text["dilemma"],
+                "firstAnswer": dilemma_text["firstAnswer"],
+                "secondAnswer": dilemma_text["secondAnswer"],
                 # Same naming as the live "reveal" phase's roundResult.
                 "firstVotes": round_tally["first"],
                 "secondVotes": round_tally["second"],
@@ -3425,6 +4998,10 @@ async def health_check():
         health_status["checks"]["ssm_parameter"] = f"error: {str(e)}"
         health_status["status"] = "degraded"
 
+    # Hit rate of the archetype assignment memo, for tuning
+    # ARCHETYPE_MEMO_MAX_ENTRIES.
+    health_status["caches"] = {"archetypeMemo": archetype_memo_stats()}
+
     # Set appropriate HTTP status code
     status_code = 200 if health_status["status"] == "healthy" else 503
 
@@ -3652,6 +5229,13 @@ ABUSE_MONITORING_THRESHOLDS = {
 }
 
 
+def _analytics_fetched_dilemma_count(event: Dict[str, Any]) -> int:
+    try:
+        return max(1, int(event["properties"].get("count") or 1))
+    except (TypeError, ValueError):
+        return 1
+
+
 def build_abuse_monitoring(events: list[Dict[str, Any]]) -> Dict[str, Any]:
     """Flag anomalous patterns without returning IPs, user agents, or stable IDs."""
     grouped = defaultdict(list)
@@ -3661,6 +5245,13 @@ def build_abuse_monitoring(events: list[Dict[str, Any]]) -> Dict[str, Any]:
     rows = []
     for risk_identity, identity_events in grouped.items():
         event_counts = Counter(event["eventName"] for event in identity_events)
+        # A /dilemmas/next prefetch records one dilemma_fetched event for the
+        # whole batch, carrying how many dilemmas it served.
+        event_counts["dilemma_fetched"] = sum(
+            _analytics_fetched_dilemma_count(event)
+            for event in identity_events
+            if event["eventName"] == "dilemma_fetched"
+        )
         minute_counts = Counter(event["occurredAt"] // 60000 for event in identity_events)
         day_counts = Counter(
             datetime.fromtimestamp(event["occurredAt"] / 1000, tz=timezone.utc).date().isoformat()
@@ -3883,6 +5474,9 @@ def build_analytics_overview(
         dilemma_id = event["properties"].get("dilemma_id")
         if dilemma_id:
             dilemma_counts[str(dilemma_id)] += 1
+        dilemma_ids = event["properties"].get("dilemma_ids")
+        if isinstance(dilemma_ids, list):
+            dilemma_counts.update(str(batch_dilemma_id) for batch_dilemma_id in dilemma_ids if batch_dilemma_id)
 
         for stage_key, event_names in funnel_definitions:
             if event["eventName"] in event_names:
@@ -4027,6 +5621,93 @@ async def analytics_overview(
         logger.error("Unable to aggregate analytics: %s", str(error))
         raise HTTPException(status_code=503, detail="Analytics data is temporarily unavailable")
 
+def _apply_vote_increments(dilemma_id: str, increments: Dict[str, int]) -> Dict[str, Any]:
+    """Add `increments` (counter field -> amount) to a dilemma's counters
+    with one UpdateItem and return the new values. With sharded counters the
+    ADD lands on one random shard row and, since the merged total is only
+    known at read time, nothing is returned."""
+    fields = [field for field in VOTE_COUNTER_FIELDS if increments.get(field)]
+    add_expression = "ADD " + ", ".join(f"{field} :{field}" for field in fields)
+    values = {f":{field}": increments[field] for field in fields}
+    if VOTE_COUNTER_SHARDS > 1:
+        table.update_item(
+            Key={'_id': vote_counter_shard_id(dilemma_id, secrets.randbelow(VOTE_COUNTER_SHARDS))},
+            UpdateExpression=f"{add_expression} SET {VOTE_COUNTER_SHARD_OWNER_FIELD} = :dilemma",
+            ExpressionAttributeValues={**values, ':dilemma': dilemma_id},
+        )
+        return {}
+    response = table.update_item(
+        Key={'_id': dilemma_id},
+        UpdateExpression=add_expression,
+        ExpressionAttributeValues=values,
+        ReturnValues='UPDATED_NEW'
+    )
+    return decimal_to_native(response.get('Attributes', {}))
+
+
+def _buffer_vote(dilemma_id: str, count_attribute: str, amount: int = 1) -> None:
+    global _vote_buffer_pending, _vote_buffer_oldest_at
+    with _vote_buffer_lock:
+        counters = _vote_buffer.setdefault(dilemma_id, {})
+        counters[count_attribute] = counters.get(count_attribute, 0) + amount
+        _vote_buffer_pending += amount
+        if _vote_buffer_oldest_at is None:
+            _vote_buffer_oldest_at = time.time()
+
+
+def _vote_buffer_due(now: Optional[float] = None) -> bool:
+    now = time.time() if now is None else now
+    with _vote_buffer_lock:
+        return _vote_buffer_pending >= VOTE_WRITE_BEHIND_MAX_VOTES or (
+            _vote_buffer_oldest_at is not None and now - _vote_buffer_oldest_at >= VOTE_WRITE_BEHIND_MAX_AGE_SECONDS
+        )
+
+
+def flush_vote_buffer() -> int:
+    """Write every buffered increment, one UpdateItem per dilemma, and return
+    how many votes were written. Increments whose write fails go back into
+    the buffer for the next flush."""
+    global _vote_buffer, _vote_buffer_pending, _vote_buffer_oldest_at
+    with _vote_buffer_lock:
+        pending, _vote_buffer = _vote_buffer, {}
+        _vote_buffer_pending = 0
+        _vote_buffer_oldest_at = None
+
+    written = 0
+    for dilemma_id, increments in pending.items():
+        try:
+            _apply_vote_increments(dilemma_id, increments)
+        except Exception:
+            logger.exception("Buffered vote flush failed for dilemma_id: %s", dilemma_id)
+            for count_attribute, amount in increments.items():
+                _buffer_vote(dilemma_id, count_attribute, amount)
+            continue
+        written += sum(increments.values())
+    if pending:
+        logger.info("Flushed %s buffered votes across %s dilemmas", written, len(pending))
+    return written
+
+
+def _flush_vote_buffer_on_shutdown() -> None:
+    try:
+        flush_vote_buffer()
+    except Exception:
+        logger.exception("Final buffered vote flush failed")
+
+
+def _exit_on_sigterm(_signum, _frame) -> None:
+    # Turn SIGTERM into a normal interpreter exit so atexit hooks run.
+    raise SystemExit(0)
+
+
+if VOTE_WRITE_BEHIND_ENABLED:
+    # Best effort: Lambda only delivers SIGTERM to runtimes that have an
+    # extension registered, which is why the flush thresholds, not this
+    # hook, bound the documented loss window.
+    atexit.register(_flush_vote_buffer_on_shutdown)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+
 @app.post("/vote")
 async def vote(vote_request: VoteRequest, request: Request):
     """
@@ -4049,18 +5730,14 @@ async def vote(vote_request: VoteRequest, request: Request):
         # Determine which count to increment
         count_attribute = 'yesCount' if vote_type == 'yes' else 'noCount'
 
-        # Update the vote count in DynamoDB
-        response = table.update_item(
-            Key={'_id': dilemma_id},
-            UpdateExpression=f'SET {count_attribute} = if_not_exists({count_attribute}, :start) + :inc',
-            ExpressionAttributeValues={
-                ':inc': 1,
-                ':start': 0
-            },
-            ReturnValues='UPDATED_NEW'
-        )
-
-        logger.info(f"Successfully incremented {count_attribute} for dilemma_id: {dilemma_id}")
+        if VOTE_WRITE_BEHIND_ENABLED:
+            # Acknowledged now, written by the next due flush.
+            _buffer_vote(dilemma_id, count_attribute)
+            updated = {}
+        else:
+            # Update the vote count in DynamoDB
+            updated = _apply_vote_increments(dilemma_id, {count_attribute: 1})
+            logger.info(f"Successfully incremented {count_attribute} for dilemma_id: {dilemma_id}")
 
         # Track analytics event
         session_id = extract_session_id(request)
@@ -4078,7 +5755,7 @@ async def vote(vote_request: VoteRequest, request: Request):
 
         return {
             "message": f"Successfully recorded your '{vote_type}' vote.",
-            "updated": decimal_to_native(response.get('Attributes', {}))
+            "updated": updated
         }
 
     except HTTPException:
@@ -4087,21 +5764,198 @@ async def vote(vote_request: VoteRequest, request: Request):
         logger.error(f"Error in /vote: {str(e)}")
         raise HTTPException(status_code=500, detail="Vote recording is unavailable")
 
-@app.get("/get-dilemma", response_model=DilemmaResponse, response_model_by_alias=True)
-async def get_dilemma(request: Request, language: str = "en", exclude: str = ""):
+
+def _compact_vote_counter_shard(shard: Dict[str, Any]) -> int:
+    """Move one shard row's counts onto its dilemma row in a single
+    transaction and return how many votes moved. The shard side is
+    conditioned on still holding at least those counts, so an overlapping
+    compaction run can't move the same votes twice; /vote increments that
+    land meanwhile simply stay on the shard for the next run."""
+    amounts = {field: int(shard.get(field, 0) or 0) for field in VOTE_COUNTER_FIELDS}
+    amounts = {field: amount for field, amount in amounts.items() if amount > 0}
+    if not amounts:
+        return 0
+
+    names = {f"#c{index}": field for index, field in enumerate(amounts)}
+    values = {f":c{index}": amount for index, amount in enumerate(amounts.values())}
+    negated = {f":n{index}": -amount for index, amount in enumerate(amounts.values())}
+    try:
+        dynamodb.meta.client.transact_write_items(TransactItems=[
+            {
+                "Update": {
+                    "TableName": DYNAMODB_TABLE,
+                    "Key": _dynamodb_item({"_id": shard["_id"]}),
+                    "UpdateExpression": "ADD " + ", ".join(f"#c{index} :n{index}" for index in range(len(amounts))),
+                    "ConditionExpression": " AND ".join(f"#c{index} >= :c{index}" for index in range(len(amounts))),
+                    "ExpressionAttributeNames": names,
+                    "ExpressionAttributeValues": _dynamodb_item({**values, **negated}),
+                },
+            },
+            {
+                "Update": {
+                    "TableName": DYNAMODB_TABLE,
+                    "Key": _dynamodb_item({"_id": shard[VOTE_COUNTER_SHARD_OWNER_FIELD]}),
+                    "UpdateExpression": "SET " + ", ".join(
+                        f"#c{index} = if_not_exists(#c{index}, :zero) + :c{index}" for index in range(len(amounts))
+                    ),
+                    "ExpressionAttributeNames": names,
+                    "ExpressionAttributeValues": _dynamodb_item({**values, ":zero": 0}),
+                },
+            },
+        ])
+    except ClientError as error:
+        if error.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+            raise
+        logger.info("Vote counter shard %s changed during compaction, retrying next run", shard["_id"])
+        return 0
+    return sum(amounts.values())
+
+
+def _rebuild_vote_split_indexes(now_seconds: int) -> Dict[str, int]:
+    """Merge every counter row (dilemma rows and any shards left) into one
+    split index per catalog language and store each as a single row.
+    Returns how many dilemmas each index covers."""
+    rows = _scan_all(
+        table,
+        FilterExpression="attribute_exists(yesCount) OR attribute_exists(noCount)",
+        ProjectionExpression="#id, #owner, " + ", ".join(VOTE_COUNTER_FIELDS),
+        ExpressionAttributeNames={"#id": "_id", "#owner": VOTE_COUNTER_SHARD_OWNER_FIELD},
+    )
+    counters_by_id = merge_vote_counters(decimal_to_native(row) for row in rows)
+    sizes = {}
+    for language in DILEMMA_SOURCE_FILES:
+        index = build_vote_split_index(language, counters_by_id, now_seconds)
+        table.put_item(Item={
+            "_id": vote_split_index_id(language),
+            "builtAt": now_seconds,
+            "index": json.dumps(index, separators=(",", ":")),
+        })
+        sizes[language] = len(index["splits"])
+    return sizes
+
+
+def vote_counter_compaction_handler(_event, _context):
+    """Scheduled job that folds sharded vote counters back into their dilemma
+    rows, keeping the per-read shard fan-in mostly zeros and the dilemma row
+    the long-term total, then rebuilds the per-language vote split indexes
+    from the result. Every shard row is visited, not just the first
+    VOTE_COUNTER_SHARDS, so lowering the shard count loses nothing once this
+    has run. Safe to run concurrently with /vote and with itself."""
+    shards = _scan_all(
+        table,
+        FilterExpression="attribute_exists(#owner)",
+        ProjectionExpression="#id, #owner, " + ", ".join(VOTE_COUNTER_FIELDS),
+        ExpressionAttributeNames={"#id": "_id", "#owner": VOTE_COUNTER_SHARD_OWNER_FIELD},
+    )
+    moved_votes = 0
+    compacted_shards = 0
+    for shard in shards:
+        moved = _compact_vote_counter_shard(decimal_to_native(shard))
+        if moved:
+            moved_votes += moved
+            compacted_shards += 1
+    result = {
+        "shardRows": len(shards),
+        "compactedShards": compacted_shards,
+        "movedVotes": moved_votes,
+        "splitIndexes": _rebuild_vote_split_indexes(int(time.time())),
+    }
+    logger.info("Vote counter compaction completed: %s", result)
+    return result
+
+
+def get_vote_split_index(language: str) -> Dict[str, Any]:
+    """This container's copy of a language's vote split index, re-read every
+    VOTE_SPLIT_INDEX_TTL_SECONDS. Before the first scheduled rebuild (or if
+    the row is unreadable and nothing was cached yet) an empty index is
+    served, which callers show as "no votes yet"."""
+    return _cached_stats_row(
+        _vote_split_index_cache, _vote_split_index_lock, language, vote_split_index_id(language),
+        VOTE_SPLIT_INDEX_TTL_SECONDS,
+        lambda item: json.loads(item["index"]) if item else empty_vote_split_index(language),
+    )
+
+def _get_dilemma_deck_cursor_key() -> bytes:
+    """HMAC key for session-deck cursors, derived from the analytics pepper
+    (with its own label, so cursor signatures reveal nothing about network
+    pseudonyms) and therefore shared by every container. Without a
+    configured pepper (local runs) a per-container random key is used:
+    cursors from another container then just fail verification and start a
+    fresh deck.
+
+    If the pepper is configured but can't be read right now, this request
+    alone gets a throwaway key (its cursor doesn't verify) and the next call
+    tries again, so a transient SSM error never pins a warm container to a
+    key no other container shares."""
+    global _dilemma_deck_cursor_key
+    if _dilemma_deck_cursor_key is None:
+        try:
+            pepper = get_analytics_fingerprint_secret().encode("utf-8")
+            _dilemma_deck_cursor_key = hmac.new(pepper, b"dilemma-deck-cursor", hashlib.sha256).digest()
+        except HTTPException:
+            if ANALYTICS_FINGERPRINT_SECRET_SSM_NAME:
+                logger.warning("Deck cursor key unavailable, cursors of this request start a new deck")
+                return secrets.token_bytes(32)
+            _dilemma_deck_cursor_key = secrets.token_bytes(32)
+    return _dilemma_deck_cursor_key
+
+
+def _next_deck_dilemmas(
+    snapshot: Dict[str, Any], language: str, deck: str, count: int = 1
+) -> tuple[list[Dict[str, Any]], str]:
+    """The next `count` distinct dilemmas of a session deck plus the cursor
+    for the one after.
+
+    `deck` is "new" or a cursor from a previous response. A cursor that
+    doesn't verify, belongs to another language, or was issued for a
+    different set of dilemma ids (the catalog changed) starts a new deck
+    rather than failing the question. `count` is capped at the catalog size;
+    a batch that runs across the end of one pass skips dilemmas it already
+    holds, so every batch is distinct.
     """
-    Get a random dilemma from DynamoDB, excluding already seen dilemmas
+    key = _get_dilemma_deck_cursor_key()
+    cursor = decode_deck_cursor(key, deck) if deck != "new" else None
+    if cursor and (cursor["language"] != language or cursor["deckVersion"] != snapshot["deckVersion"]):
+        cursor = None
+    if cursor is None:
+        if deck != "new":
+            logger.info("Starting a new dilemma deck for language %s: cursor not reusable", language)
+        cursor = {"seed": secrets.randbits(48), "position": 0}
+
+    count = min(count, len(snapshot["ids"]))
+    position = cursor["position"]
+    dilemmas: list[Dict[str, Any]] = []
+    seen_ids = set()
+    while len(dilemmas) < count:
+        dilemma = deck_dilemma(snapshot, cursor["seed"], position)
+        position += 1
+        if dilemma["_id"] not in seen_ids:
+            seen_ids.add(dilemma["_id"])
+            dilemmas.append(dilemma)
+    return dilemmas, encode_deck_cursor(key, language, snapshot["deckVersion"], cursor["seed"], position)
+
+
+@app.get("/get-dilemma", response_model=SessionDilemmaResponse, response_model_by_alias=True)
+async def get_dilemma(request: Request, language: str = "en", exclude: str = "", deck: str = ""):
+    """
+    Get a random dilemma from the catalog, excluding already seen dilemmas
 
     Returns a random dilemma with all its attributes in the specified language.
 
     - **language**: Language code (e.g., 'en', 'it')
     - **exclude**: Comma-separated list of dilemma IDs to exclude (e.g., 'id1,id2,id3')
+    - **deck**: 'new' or the previous response's deckCursor. Walks a
+      repeat-free shuffled deck of the catalog without any exclude list;
+      `exclude` is ignored in this mode.
     """
     try:
         # Validate language parameter
         if not language or len(language) > 10 or not language.isalpha():
             raise HTTPException(status_code=400, detail="Invalid language parameter")
 
+        if len(deck) > 200:
+            raise HTTPException(status_code=400, detail="Invalid deck cursor")
+
         # Parse excluded IDs
         excluded_ids = set()
         if exclude:
@@ -4111,37 +5965,24 @@ async def get_dilemma(request: Request, language: str = "en", exclude: str = "")
             if len(excluded_ids) > 1000:
                 raise HTTPException(status_code=400, detail="Too many excluded IDs")
 
-        # Scan DynamoDB for all items with the specified language
-        response = table.scan(
-            FilterExpression='attribute_exists(#lang) AND #lang = :language',
-            ExpressionAttributeNames={
-                '#lang': 'language'
-            },
-            ExpressionAttributeValues={
-                ':language': language
-            }
-        )
-
-        items = response.get('Items', [])
+        # Served from this container's in-memory catalog (already converted
+        # from Decimal), not a per-request scan of the whole table.
+        snapshot = get_dilemma_catalog(language)
 
-        if not items:
+        if not snapshot["ids"]:
             logger.warning(f"No dilemmas found for language: {language}")
             raise HTTPException(status_code=404, detail=f"No dilemmas found for language: {language}")
 
-        # Filter out excluded dilemmas
-        available_items = [item for item in items if item.get('_id') not in excluded_ids]
-
-        # If all dilemmas have been seen, reset and use all dilemmas
-        if not available_items:
-            logger.info(f"All dilemmas seen for language {language}, resetting pool")
-            available_items = items
-
-        # Select a random dilemma
-        import random
-        dilemma = random.choice(available_items)
-
-        # Convert Decimal types to native Python types
-        dilemma = decimal_to_native(dilemma)
+        if deck:
+            deck_dilemmas, next_cursor = _next_deck_dilemmas(snapshot, language, deck)
+            dilemma = deck_dilemmas[0]
+            dilemma["deckCursor"] = next_cursor
+        else:
+            # If all dilemmas have been seen, the pick resets to the whole pool
+            if excluded_ids.issuperset(snapshot["ids"]):
+                logger.info(f"All dilemmas seen for language {language}, resetting pool")
+            dilemma = pick_random_dilemma(snapshot, excluded_ids)
+        dilemma = _with_live_vote_counts([dilemma])[0]
 
         # Ensure all required fields have default values
         dilemma.setdefault('yesCount', 0)
@@ -4164,7 +6005,21 @@ async def get_dilemma(request: Request, language: str = "en", exclude: str = "")
             **extract_client_analytics_context(request),
         )
 
-        return dilemma
+        # Catalog items were rendered once when the snapshot was built; only
+        # the counters (and the deck cursor) are appended per request.
+        body = _dilemma_response_body(snapshot, dilemma)
+        if body is None:
+            return dilemma
+        if deck:
+            # Every deck response carries a new cursor, so there's no stable
+            # representation to tag.
+            body += b',"deckCursor":' + json.dumps(dilemma["deckCursor"]).encode("ascii") + b"}"
+            return Response(content=body, media_type="application/json")
+        return Response(
+            content=body + b',"deckCursor":null}',
+            media_type="application/json",
+            headers={"ETag": _dilemma_etag(snapshot, dilemma)},
+        )
 
     except HTTPException:
         raise
@@ -4172,10 +6027,136 @@ async def get_dilemma(request: Request, language: str = "en", exclude: str = "")
         logger.error(f"Error in /get-dilemma: {str(e)}")
         raise HTTPException(status_code=500, detail="Unable to fetch a dilemma")
 
+@app.get("/dilemmas/next", response_model=DilemmaBatchResponse, response_model_by_alias=True)
+async def get_next_dilemmas(
+    request: Request,
+    language: str = "en",
+    count: int = Query(default=10, ge=1, le=DILEMMA_PREFETCH_MAX_COUNT),
+    deck: str = "new",
+):
+    """Prefetch the next `count` distinct dilemmas of a session deck at once.
+
+    Same deck semantics as /get-dilemma?deck=..., so a client on a slow
+    network can load a whole test in one round trip and continue the same
+    repeat-free deck afterwards with the returned deckCursor. The batch is
+    recorded as a single dilemma_fetched analytics event.
+    """
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+    if not deck or len(deck) > 200:
+        raise HTTPException(status_code=400, detail="Invalid deck cursor")
+
+    snapshot = get_dilemma_catalog(language)
+    if not snapshot["ids"]:
+        raise HTTPException(status_code=404, detail=f"No dilemmas found for language: {language}")
+
+    dilemmas, next_cursor = _next_deck_dilemmas(snapshot, language, deck, count)
+    dilemmas = _with_live_vote_counts(dilemmas)
+    for dilemma in dilemmas:
+        dilemma.setdefault("yesCount", 0)
+        dilemma.setdefault("noCount", 0)
+    bodies = [_dilemma_response_body(snapshot, dilemma) for dilemma in dilemmas]
+
+    track_analytics_event(
+        session_id=extract_session_id(request),
+        action_type="dilemma_fetched",
+        action_data={
+            "dilemma_ids": [dilemma["_id"] for dilemma in dilemmas],
+            "count": len(dilemmas),
+            "source": "database",
+            "batch": True,
+        },
+        language=language,
+        user_agent=request.headers.get("User-Agent"),
+        ip_address=request.client.host if request.client else None,
+        **extract_client_analytics_context(request),
+    )
+
+    if any(body is None for body in bodies):
+        return {"dilemmas": dilemmas, "deckCursor": next_cursor}
+    return Response(
+        content=(
+            b'{"dilemmas":[' + b"},".join(bodies) + b'}],"deckCursor":'
+            + json.dumps(next_cursor).encode("ascii") + b"}"
+        ),
+        media_type="application/json",
+    )
+
+
+def get_adaptive_index(language: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    """The dilemma-by-archetype-pair discrimination index for `snapshot`,
+    built once per catalog and archetypes version and kept per language."""
+    version = (snapshot["version"], get_archetypes_version())
+    with _adaptive_index_lock:
+        entry = _adaptive_index_cache.get(language)
+    if entry and entry["version"] == version:
+        return entry["index"]
+    index = build_discrimination_index(snapshot, archetype_centroids(), get_archetype_dimensions())
+    with _adaptive_index_lock:
+        _adaptive_index_cache[language] = {"version": version, "index": index}
+    return index
+
+
+@app.post("/dilemmas/adaptive-next")
+async def get_adaptive_next_dilemma(
+    adaptive_request: AdaptiveNextDilemmaRequest,
+    request: Request,
+    language: str = "en",
+):
+    """Pick the next question of an adaptive archetype test.
+
+    Given the answers so far (the same baseId + chosenValues pairs /profiles
+    takes), returns the archetype they currently match, the nearest
+    candidates, and the unanswered dilemma that best separates those
+    candidates. `settled` is true once no remaining answer, within
+    `maxQuestions` in total, can change the match: the client can stop and
+    go to the results, and `dilemma` is null. `dilemma` is also null once
+    the budget is used up.
+    """
+    if not language or len(language) > 10 or not language.isalpha():
+        raise HTTPException(status_code=400, detail="Invalid language parameter")
+
+    snapshot = get_dilemma_catalog(language)
+    if not snapshot["ids"]:
+        raise HTTPException(status_code=404, detail=f"No dilemmas found for language: {language}")
+
+    answers = [(answer.dilemmaBaseId, answer.chosenValues) for answer in adaptive_request.answers]
+    step = next_adaptive_step(get_adaptive_index(language, snapshot), answers, adaptive_request.maxQuestions)
+
+    dilemma = None
+    if step["nextBaseId"] is not None:
+        dilemma = dilemmas_by_base_ids(snapshot, [step["nextBaseId"]])[step["nextBaseId"]]
+        dilemma = _with_live_vote_counts([dilemma])[0]
+        dilemma.setdefault("yesCount", 0)
+        dilemma.setdefault("noCount", 0)
+        track_analytics_event(
+            session_id=extract_session_id(request),
+            action_type="dilemma_fetched",
+            action_data={
+                "dilemma_id": dilemma["_id"],
+                "source": "adaptive",
+                "answered": len(answers),
+            },
+            language=language,
+            user_agent=request.headers.get("User-Agent"),
+            ip_address=request.client.host if request.client else None,
+            **extract_client_analytics_context(request),
+        )
+
+    return {
+        "archetypeId": step["leader"],
+        "archetypesVersion": get_archetypes_version(),
+        "candidates": step["candidates"],
+        "settled": step["settled"],
+        "answered": len(answers),
+        "dilemma": dilemma,
+    }
+
+
 @app.post("/generate-dilemma")
 async def generate_dilemma(request: Request, language: str = "en"):
     """
-    Generate a new dilemma using Groq AI API, inspired by existing dilemmas from DynamoDB
+    Generate a new dilemma using Groq AI API, inspired by existing dilemmas from the catalog
 
     Returns a newly generated ethical dilemma in the specified language
     """
@@ -4186,32 +6167,20 @@ async def generate_dilemma(request: Request, language: str = "en"):
 
         api_key = get_groq_api_key()
 
-        # Fetch sample dilemmas from DynamoDB to use as style/context examples
-        sample_dilemmas = []
+        # Sample existing dilemmas from the catalog to use as style/context examples
+        few_shot_dilemmas = []
         try:
-            response = table.scan(
-                FilterExpression='attribute_exists(#lang) AND #lang = :language',
-                ExpressionAttributeNames={
-                    '#lang': 'language'
-                },
-                ExpressionAttributeValues={
-                    ':language': language
-                },
-                Limit=5  # Get up to 5 sample dilemmas
-            )
-            
-            sample_items = response.get('Items', [])
-            sample_dilemmas = [decimal_to_native(item) for item in sample_items]
-            logger.info(f"Retrieved {len(sample_dilemmas)} sample dilemmas for language: {language}")
+            few_shot_dilemmas = sample_dilemmas(get_dilemma_catalog(language), 3)
+            logger.info(f"Retrieved {len(few_shot_dilemmas)} sample dilemmas for language: {language}")
         except Exception as e:
             logger.warning(f"Could not fetch sample dilemmas: {str(e)}")
-            sample_dilemmas = []
+            few_shot_dilemmas = []
 
         # Build the examples string from database dilemmas
         examples_text = ""
-        if sample_dilemmas:
+        if few_shot_dilemmas:
             examples_text = "\n\nHere are some examples of the style and complexity I'm looking for:\n"
-            for i, dilemma in enumerate(sample_dilemmas[:3], 1):
+            for i, dilemma in enumerate(few_shot_dilemmas, 1):
                 examples_text += f"\nExample {i}:\n"
                 examples_text += f'{{"dilemma": "{dilemma.get("dilemma", "")[:100]}...", '
                 examples_text += f'"firstAnswer": "{dilemma.get("firstAnswer", "")}", '
@@ -4324,6 +6293,7 @@ async def analyze_results(analyze_request: AnalyzeResultsRequest, request: Reque
         # analysis below fails or is unavailable.
         averages = compute_dimension_averages(analyze_request.answers)
         archetype = assign_archetype(averages, language=language)
+        percentiles = _dimension_percentiles(averages)
 
         # Create a summary of the moral profile
         profile_summary = ", ".join([f"{key}: {value}" for key, value in averages.items()])
@@ -4418,6 +6388,7 @@ async def analyze_results(analyze_request: AnalyzeResultsRequest, request: Reque
                 content={
                     "analysis": None,
                     "averages": averages,
+                    "dimensionPercentiles": percentiles,
                     "archetype": archetype,
                     "aiUnavailable": True,
                     "error": "Failed to connect to external API",
@@ -4430,6 +6401,7 @@ async def analyze_results(analyze_request: AnalyzeResultsRequest, request: Reque
                 content={
                     "analysis": None,
                     "averages": averages,
+                    "dimensionPercentiles": percentiles,
                     "archetype": archetype,
                     "aiUnavailable": True,
                     "error": str(e.detail),
@@ -4442,6 +6414,7 @@ async def analyze_results(analyze_request: AnalyzeResultsRequest, request: Reque
                 content={
                     "analysis": None,
                     "averages": averages,
+                    "dimensionPercentiles": percentiles,
                     "archetype": archetype,
                     "aiUnavailable": True,
                     "error": "Invalid response from external API",
@@ -4468,6 +6441,7 @@ async def analyze_results(analyze_request: AnalyzeResultsRequest, request: Reque
         return {
             "analysis": analysis_text,
             "averages": averages,
+            "dimensionPercentiles": percentiles,
             "archetype": archetype,
         }
 
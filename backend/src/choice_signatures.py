@@ -0,0 +1,118 @@
+"""Archetype lookup tables for fixed decks of binary choices.
+
+A Party Room deck is a fixed, ordered list of at most
+PARTY_ROOM_MAX_DILEMMAS dilemmas, each answered "first" or "second", so a
+participant who answered every round is fully described by an n-bit choice
+signature (bit r set = "first" in round r). For n <= CHOICE_SIGNATURE_MAX_CHOICES
+there are at most 4096 signatures, and their dimension averages and
+archetypes can all be computed up front with one batch assignment. Final
+results then become a table lookup instead of parsing every stored
+chosenValues JSON string and re-averaging. Nothing here touches AWS.
+"""
+
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    from src.archetype_engine import assign_archetypes_batch, averages_matrix
+except ImportError:
+    try:
+        from .archetype_engine import assign_archetypes_batch, averages_matrix
+    except ImportError:
+        from archetype_engine import assign_archetypes_batch, averages_matrix
+
+# 2**12 signatures; longer decks are left to the per-vote path.
+CHOICE_SIGNATURE_MAX_CHOICES = 12
+
+
+def choice_values(item: Dict[str, Any], choice: str, dimensions: Sequence[str]) -> Dict[str, float]:
+    """The chosenValues a client sends for `choice` on catalog `item`: the
+    chosen answer's weight for each dimension, in dimension order."""
+    prefix = "firstAnswer" if choice == "first" else "secondAnswer"
+    return {dimension: float(item[f"{prefix}{dimension}"]) for dimension in dimensions}
+
+
+def stored_choice_values(values: Dict[str, float]) -> str:
+    """chosenValues in the form submit_party_vote stores it."""
+    return json.dumps(values, separators=(",", ":"))
+
+
+def build_choice_signature_table(rounds: Sequence[Tuple[Dict[str, float], Dict[str, float]]]) -> Dict[str, Any]:
+    """Averages and archetype for every choice signature over `rounds`, a
+    (first answer values, second answer values) pair per round in deck order.
+
+    Averages match compute_dimension_averages over the answers in round
+    order, and every signature is assigned in one assign_archetypes_batch
+    call. "storedValues" keeps the stored form of each round's two answers
+    so a vote can be matched to the table without parsing it.
+    """
+    if len(rounds) > CHOICE_SIGNATURE_MAX_CHOICES:
+        raise ValueError(f"At most {CHOICE_SIGNATURE_MAX_CHOICES} choices fit a signature table")
+    dimensions = list(rounds[0][0]) if rounds else []
+    signatures = np.arange(1 << len(rounds))
+    # Summed round by round, like compute_dimension_averages does over the
+    # answers in order, then divided and rounded with Python's round() so
+    # every average is bit-for-bit what the per-vote path produces.
+    sums = np.zeros((len(signatures), len(dimensions)))
+    for round_index, (first, second) in enumerate(rounds):
+        chose_first = ((signatures >> round_index) & 1).astype(bool)[:, np.newaxis]
+        sums = sums + np.where(
+            chose_first,
+            np.array([first[dimension] for dimension in dimensions]),
+            np.array([second[dimension] for dimension in dimensions]),
+        )
+    count = len(rounds)
+    averages = [
+        tuple(round(total / count, 2) for total in row) for row in sums.tolist()
+    ] if count else [()]
+    archetype_ids, distances = assign_archetypes_batch(
+        np.array(averages) if count else averages_matrix([{}])
+    )
+    return {
+        "choiceCount": count,
+        "dimensions": tuple(dimensions),
+        "storedValues": tuple(
+            (stored_choice_values(first), stored_choice_values(second)) for first, second in rounds
+        ),
+        "averages": tuple(averages),
+        "archetypeIds": tuple(archetype_ids),
+        "distances": tuple(float(distance) for distance in distances),
+    }
+
+
+def choice_signature(table: Dict[str, Any], votes: Dict[str, Dict[str, Any]]) -> Optional[int]:
+    """The signature of a participant's `votes` ({round key: {"choice",
+    "chosenValues"}}), or None when the table can't stand in for them: a
+    round was skipped, or a stored chosenValues differs from the catalog
+    answer the table was built from (e.g. the dilemma was shown in another
+    language). O(rounds) string comparisons, no JSON parsing."""
+    if len(votes) != table["choiceCount"]:
+        return None
+    signature = 0
+    for round_index, (first, second) in enumerate(table["storedValues"]):
+        vote = votes.get(str(round_index))
+        if vote is None:
+            return None
+        if vote["choice"] == "first" and vote["chosenValues"] == first:
+            signature |= 1 << round_index
+        elif vote["choice"] != "second" or vote["chosenValues"] != second:
+            return None
+    return signature
+
+
+def lookup_choice_signature(table: Dict[str, Any], signature: int) -> Tuple[Dict[str, float], str, float]:
+    """(averages, archetype id, unrounded distance) for one signature."""
+    return (
+        dict(zip(table["dimensions"], table["averages"][signature])),
+        table["archetypeIds"][signature],
+        table["distances"][signature],
+    )
+
+
+def signature_rounds(
+    items: List[Dict[str, Any]], dimensions: Sequence[str],
+) -> List[Tuple[Dict[str, float], Dict[str, float]]]:
+    """The (first, second) answer values of each catalog item, in order."""
+    return [(choice_values(item, "first", dimensions), choice_values(item, "second", dimensions)) for item in items]
@@ -7,7 +7,9 @@ compute_compatibility(B, A) with the "a"/"b" labels swapped, and the same
 inputs at the same COMPATIBILITY_VERSION always produce the same result.
 """
 
-from typing import Any, Dict
+from typing import Any, Dict, Sequence
+
+import numpy as np
 
 COMPATIBILITY_VERSION = 1
 
@@ -54,3 +56,77 @@ def compute_compatibility(
         "mostDivergentDimension": most_divergent_dimension,
         "mostAlignedDimension": most_aligned_dimension,
     }
+
+
+def compatibility_vectors(averages_list: Sequence[Dict[str, float]]) -> np.ndarray:
+    """N x 6 matrix of averages in DIMENSIONS order, missing dimensions
+    filled the way compute_compatibility fills them."""
+    return np.array(
+        [[averages.get(dimension, _NEUTRAL_DIMENSION_VALUE) for dimension in DIMENSIONS] for averages in averages_list],
+        dtype=np.float64,
+    ).reshape(len(averages_list), len(DIMENSIONS))
+
+
+def agreement_pcts(distances: np.ndarray) -> np.ndarray:
+    """_agreement_pct over an array of (mean) distances. The arithmetic is
+    the same IEEE operations in the same order; the final one-decimal
+    rounding uses Python's round() per element because NumPy's round can
+    differ on halfway values, so every entry is bit-for-bit the scalar
+    result. Non-increasing in the distance."""
+    unrounded = np.maximum(0.0, 1 - distances / _MAX_DIMENSION_DISTANCE) * 100
+    return np.array([round(value, 1) for value in unrounded.ravel().tolist()], dtype=np.float64).reshape(
+        unrounded.shape
+    )
+
+
+def _total_distances(vectors_a: np.ndarray, vectors_b: np.ndarray) -> np.ndarray:
+    """Summed per-dimension distances between broadcast rows, accumulated
+    one dimension at a time in DIMENSIONS order like compute_compatibility
+    does (a single sum over the last axis could add them in another order)."""
+    total_distance = np.zeros(np.broadcast_shapes(vectors_a.shape, vectors_b.shape)[:-1])
+    for column in range(len(DIMENSIONS)):
+        total_distance = total_distance + np.abs(vectors_a[..., column] - vectors_b[..., column])
+    return total_distance
+
+
+def total_distances(averages_a: Dict[str, float], matrix_b: np.ndarray) -> np.ndarray:
+    """The unrounded summed distance compute_compatibility derives its
+    overall score from, against every row of `matrix_b`. A smaller distance
+    never scores lower."""
+    vector_a = compatibility_vectors([averages_a])[0]
+    return _total_distances(vector_a, np.asarray(matrix_b, dtype=np.float64).reshape(-1, len(DIMENSIONS)))
+
+
+def overall_agreement_pcts(averages_a: Dict[str, float], matrix_b: np.ndarray) -> np.ndarray:
+    """Just the "overallAgreementPct" of compute_compatibility_many."""
+    return agreement_pcts(total_distances(averages_a, matrix_b) / len(DIMENSIONS))
+
+
+def compute_compatibility_many(averages_a: Dict[str, float], matrix_b: np.ndarray) -> Dict[str, Any]:
+    """compute_compatibility(averages_a, b) against every row b of
+    `matrix_b` (an N x 6 compatibility_vectors matrix) in one pass, for
+    callers that only need the scores: "overallAgreementPct" is an (N,)
+    array and "perDimensionAgreementPct" an N x 6 array in DIMENSIONS
+    order, each entry bit-for-bit the scalar function's."""
+    vector_a = compatibility_vectors([averages_a])[0]
+    matrix_b = np.asarray(matrix_b, dtype=np.float64).reshape(-1, len(DIMENSIONS))
+    return {
+        "compatibilityVersion": COMPATIBILITY_VERSION,
+        "overallAgreementPct": overall_agreement_pcts(averages_a, matrix_b),
+        "perDimensionAgreementPct": agreement_pcts(np.abs(vector_a - matrix_b)),
+    }
+
+
+def overall_agreement_matrix(averages_list: Sequence[Dict[str, float]]) -> np.ndarray:
+    """compute_compatibility(averages_list[i], averages_list[j])["overallAgreementPct"]
+    for every pair, as a symmetric N x N matrix, without building the
+    per-dimension breakdown of each pair."""
+    vectors = compatibility_vectors(averages_list)
+    count = len(vectors)
+    # |a - b| is symmetric, so score the upper triangle once and mirror it.
+    rows, columns = np.triu_indices(count, k=1)
+    scores = agreement_pcts(_total_distances(vectors[rows], vectors[columns]) / len(DIMENSIONS))
+    matrix = np.full((count, count), _agreement_pct(0.0))
+    matrix[rows, columns] = scores
+    matrix[columns, rows] = scores
+    return matrix
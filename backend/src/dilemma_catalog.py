@@ -0,0 +1,410 @@
+"""In-memory, per-language dilemma catalog snapshots.
+
+Dilemma copy and its six-dimension weights only change when
+scripts/populate_dynamodb_multilang.py reloads the dilemmas table, so each
+warm container keeps one immutable snapshot per language (loaded and
+refreshed by backend_fastapi.get_dilemma_catalog) and serves random picks,
+exclusions and baseId lookups from memory instead of scanning DynamoDB on
+every question. Nothing here touches AWS: snapshots are built from items
+that were already read and converted to native Python types, or from the
+precompiled artifact scripts/build_dilemma_catalog.py bundles into the
+Lambda package.
+"""
+
+import hashlib
+import hmac
+import json
+import random
+from typing import Any, Dict, Iterable, List, Optional
+
+# A single non-dilemma row in the dilemmas table, written last by the
+# populate script. It has no `language` attribute, so the catalog's language
+# filter never returns it, and '#' is outside VoteRequest's id pattern, so it
+# can't be reached through /vote either.
+CATALOG_MANIFEST_ID = "catalog#manifest"
+
+# Precomputed statistics (vote split indexes, the archetype census, the duel
+# agreement distribution) are stored as rows of the dilemmas table with ids
+# under this prefix. For the same reasons as the manifest they are invisible
+# to the catalog scan and to /vote, so they can share the table without a
+# language filter or id check of their own.
+STATS_ROW_ID_PREFIX = "stats#"
+
+# Live per-dilemma counters, written by /vote. They are not part of a
+# snapshot (they change on every vote while the copy doesn't); endpoints that
+# return them read them separately.
+VOTE_COUNTER_FIELDS = ("yesCount", "noCount")
+
+# Write-sharded vote counters (VOTE_COUNTER_SHARDS > 1 in the API): /vote
+# ADDs to one of N `<dilemma id>#votes#<k>` rows instead of the dilemma item,
+# so a popular dilemma's increments spread over N partition keys. Like the
+# manifest row they have no `language` and contain '#', so neither the
+# catalog scan nor /vote's id pattern can reach them. `counterShardOf` names
+# the dilemma, which lets compaction find every shard with one filtered scan.
+VOTE_COUNTER_SHARD_MARKER = "#votes#"
+VOTE_COUNTER_SHARD_OWNER_FIELD = "counterShardOf"
+
+# The source files scripts/populate_dynamodb_multilang.py loads, in the order
+# their bytes are hashed into the catalog version.
+DILEMMA_SOURCE_FILES = {"en": "dilemmas_en.json", "it": "dilemmas_it.json"}
+DIMENSIONS = ("Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty")
+_REQUIRED_TEXT_FIELDS = ("_id", "dilemma", "firstAnswer", "secondAnswer", "teaseOption1", "teaseOption2")
+
+CATALOG_ARTIFACT_FILENAME = "dilemma_catalog.json"
+CATALOG_ARTIFACT_FORMAT = 1
+
+
+def catalog_source_version(sources: Dict[str, bytes]) -> str:
+    """Version of a set of raw source files, keyed by language.
+
+    The populate script stamps this on the manifest row and the build script
+    on the bundled artifact, so equal versions mean the table and the bundle
+    were produced from byte-identical files.
+    """
+    digest = hashlib.sha256()
+    for language in sorted(sources):
+        digest.update(language.encode("utf-8") + b"\0" + sources[language])
+    return digest.hexdigest()[:16]
+
+
+def catalog_items_for_language(language: str, dilemmas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Validate one source file and reshape it the way the populate script
+    stores it: `<baseId>-<language>` ids plus `language`/`baseId`, without
+    vote counters. Raises ValueError naming the first offending dilemma."""
+    items = []
+    seen = set()
+    for position, dilemma in enumerate(dilemmas):
+        if not isinstance(dilemma, dict):
+            raise ValueError(f"{language}[{position}]: expected an object")
+        for field in _REQUIRED_TEXT_FIELDS:
+            if not isinstance(dilemma.get(field), str) or not dilemma[field].strip():
+                raise ValueError(f"{language}[{position}]: missing text field {field!r}")
+        base_id = dilemma["_id"]
+        if base_id in seen:
+            raise ValueError(f"{language}[{position}]: duplicate _id {base_id!r}")
+        seen.add(base_id)
+        for prefix in ("firstAnswer", "secondAnswer"):
+            for dimension in DIMENSIONS:
+                weight = dilemma.get(f"{prefix}{dimension}")
+                if isinstance(weight, bool) or not isinstance(weight, (int, float)) or not 0 <= weight <= 1:
+                    raise ValueError(f"{language}[{position}]: {prefix}{dimension} must be a number in [0, 1]")
+        item = {key: value for key, value in dilemma.items() if key not in VOTE_COUNTER_FIELDS}
+        item.update({"_id": f"{base_id}-{language}", "baseId": base_id, "language": language})
+        items.append(item)
+    return items
+
+
+def compile_catalog_artifact(sources: Dict[str, bytes]) -> Dict[str, Any]:
+    """Compile raw source files (keyed by language) into the bundled artifact."""
+    return {
+        "format": CATALOG_ARTIFACT_FORMAT,
+        "catalogVersion": catalog_source_version(sources),
+        "languages": {
+            language: catalog_items_for_language(language, json.loads(raw.decode("utf-8")))
+            for language, raw in sorted(sources.items())
+        },
+    }
+
+
+def load_catalog_artifact(path: str) -> Optional[Dict[str, Any]]:
+    """The bundled artifact at `path`, or None when it is absent (local runs,
+    tests) or not in a format this code understands."""
+    try:
+        with open(path, "r", encoding="utf-8") as artifact_file:
+            artifact = json.load(artifact_file)
+    except FileNotFoundError:
+        return None
+    if (
+        not isinstance(artifact, dict)
+        or artifact.get("format") != CATALOG_ARTIFACT_FORMAT
+        or not isinstance(artifact.get("catalogVersion"), str)
+        or not isinstance(artifact.get("languages"), dict)
+    ):
+        return None
+    return artifact
+
+
+def _canonical_value(value: Any) -> Any:
+    # Items read from DynamoDB come back with integral weights as ints
+    # (decimal_to_native), the bundled JSON keeps them as floats; both must
+    # hash the same.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _canonical_item(item: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: _canonical_value(value) for key, value in sorted(item.items()) if key not in VOTE_COUNTER_FIELDS}
+
+
+def content_version(items: Iterable[Dict[str, Any]]) -> str:
+    """Stable short hash of a set of catalog items, ignoring vote counters."""
+    canonical = [_canonical_item(item) for item in sorted(items, key=lambda item: item.get("_id", ""))]
+    payload = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def item_content_hash(item: Dict[str, Any]) -> str:
+    """Short hash of one item's copy and weights, ignoring vote counters.
+
+    Clients keeping an offline copy send back the hashes they hold, so the
+    delta endpoint only returns items they are missing or hold an older
+    revision of. Collisions only need to be unlikely within one language's
+    catalog, hence the short digest (it travels in a query string).
+    """
+    payload = json.dumps(_canonical_item(item), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:10]
+
+
+def dimension_separation(item: Dict[str, Any], dimension: str) -> float:
+    """How far apart a dilemma's two answers put `dimension`: the absolute
+    difference of the two weights, 0 when either is missing. The larger it
+    is, the more that dimension decides what an answer says about you."""
+    first = item.get(f"firstAnswer{dimension}")
+    second = item.get(f"secondAnswer{dimension}")
+    if isinstance(first, bool) or isinstance(second, bool):
+        return 0.0
+    if not isinstance(first, (int, float)) or not isinstance(second, (int, float)):
+        return 0.0
+    return abs(float(first) - float(second))
+
+
+def build_catalog_snapshot(
+    language: str,
+    items: Iterable[Dict[str, Any]],
+    manifest_version: Optional[str] = None,
+    loaded_at: float = 0.0,
+) -> Dict[str, Any]:
+    """Index one language's items by `_id` and by language-neutral baseId.
+
+    Only items whose `_id` carries the `-<language>` suffix written by the
+    populate script are kept, which is the same rule the previous per-request
+    scans applied when deriving base ids. Vote counters are dropped.
+    """
+    suffix = f"-{language}"
+    items_by_id: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        item_id = item.get("_id", "")
+        if item.get("language") == language and item_id.endswith(suffix):
+            items_by_id[item_id] = {
+                key: value for key, value in item.items() if key not in VOTE_COUNTER_FIELDS
+            }
+
+    ids = tuple(sorted(items_by_id))
+    base_id_by_id = {item_id: item_id[:-len(suffix)] for item_id in ids}
+    return {
+        "language": language,
+        "version": content_version(items_by_id.values()),
+        "manifestVersion": manifest_version,
+        "loadedAt": loaded_at,
+        "itemsById": items_by_id,
+        "itemHashes": {item_id: item_content_hash(item) for item_id, item in items_by_id.items()},
+        "ids": ids,
+        "baseIds": tuple(base_id_by_id[item_id] for item_id in ids),
+        # Base ids ordered by how strongly each dilemma separates a dimension
+        # (see dimension_separation), strongest first, for themed decks.
+        "dimensionRankings": {
+            dimension: tuple(
+                base_id_by_id[item_id]
+                for item_id in sorted(ids, key=lambda item_id: (-dimension_separation(items_by_id[item_id], dimension), item_id))
+            )
+            for dimension in DIMENSIONS
+        },
+        # Session decks permute positions in `ids`, so a deck cursor stays
+        # valid exactly as long as this (copy edits don't reshuffle decks).
+        "deckVersion": hashlib.sha256("\n".join(ids).encode("utf-8")).hexdigest()[:12],
+    }
+
+
+def pick_random_dilemma(
+    snapshot: Dict[str, Any],
+    excluded_ids: Optional[set] = None,
+    rng: random.Random = random,
+) -> Optional[Dict[str, Any]]:
+    """A copy of one random item not in `excluded_ids`. Once every item has
+    been excluded the whole catalog is eligible again, so a long session
+    keeps getting questions instead of an error. None only for an empty
+    catalog."""
+    ids = snapshot["ids"]
+    if not ids:
+        return None
+    available = [item_id for item_id in ids if item_id not in excluded_ids] if excluded_ids else ids
+    chosen_id = rng.choice(available or ids)
+    return dict(snapshot["itemsById"][chosen_id])
+
+
+def sample_base_ids(snapshot: Dict[str, Any], count: int, rng: random.Random = random) -> List[str]:
+    """`count` distinct base ids, or every base id (sorted) if there aren't
+    more than `count` of them."""
+    base_ids = list(snapshot["baseIds"])
+    if len(base_ids) <= count:
+        return base_ids
+    return rng.sample(base_ids, count)
+
+
+def sample_dilemmas(snapshot: Dict[str, Any], count: int, rng: random.Random = random) -> List[Dict[str, Any]]:
+    """Copies of up to `count` distinct random items (few-shot examples)."""
+    ids = snapshot["ids"]
+    chosen = rng.sample(ids, min(count, len(ids)))
+    return [dict(snapshot["itemsById"][item_id]) for item_id in chosen]
+
+
+# Deck focus values: one of DIMENSIONS, or this to cover all six evenly.
+BALANCED_DECK_FOCUS = "balanced"
+
+
+def themed_base_ids(
+    snapshot: Dict[str, Any],
+    count: int,
+    focus: str,
+    rng: random.Random = random,
+) -> List[str]:
+    """`count` distinct base ids chosen for `focus` in O(count) from the
+    precomputed dimension rankings.
+
+    A dimension focus samples from that dimension's strongest
+    2 * `count` separators, so repeated decks vary but stay on theme.
+    "balanced" walks the six rankings round-robin, each from a random
+    offset within its strongest third, so every dimension is probed about
+    equally. Falls back to a uniform sample when the catalog is too small
+    for the request.
+    """
+    rankings = snapshot["dimensionRankings"]
+    size = len(snapshot["baseIds"])
+    if count >= size:
+        return sample_base_ids(snapshot, count, rng)
+    if focus in rankings:
+        pool = rankings[focus][:min(size, 2 * count)]
+        return rng.sample(pool, count)
+    if focus != BALANCED_DECK_FOCUS:
+        raise ValueError(f"Unknown deck focus: {focus!r}")
+
+    window = max(1, size // 3)
+    cursors = {dimension: rng.randrange(window) for dimension in DIMENSIONS}
+    order = list(DIMENSIONS)
+    rng.shuffle(order)
+    chosen: List[str] = []
+    seen = set()
+    while len(chosen) < count:
+        for dimension in order:
+            ranking = rankings[dimension]
+            # Every ranking holds every base id, so this advances at most
+            # `size` steps in total per dimension before finding a new one.
+            while ranking[cursors[dimension] % size] in seen:
+                cursors[dimension] += 1
+            base_id = ranking[cursors[dimension] % size]
+            cursors[dimension] += 1
+            seen.add(base_id)
+            chosen.append(base_id)
+            if len(chosen) == count:
+                break
+    return chosen
+
+
+def dilemmas_by_base_ids(snapshot: Dict[str, Any], base_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """Copies of every requested base id present in the snapshot, keyed by
+    base id. Ids the snapshot doesn't know are simply absent."""
+    items_by_id = snapshot["itemsById"]
+    language = snapshot["language"]
+    found: Dict[str, Dict[str, Any]] = {}
+    for base_id in base_ids:
+        item = items_by_id.get(f"{base_id}-{language}")
+        if item is not None:
+            found[base_id] = dict(item)
+    return found
+
+
+def changed_item_ids(snapshot: Dict[str, Any], known_hashes: Iterable[str]) -> List[str]:
+    """Ids (sorted) of the items whose current hash is not among
+    `known_hashes`: everything a client holding those hashes is missing."""
+    known = set(known_hashes)
+    item_hashes = snapshot["itemHashes"]
+    return [item_id for item_id in snapshot["ids"] if item_hashes[item_id] not in known]
+
+
+def vote_counter_shard_id(dilemma_id: str, shard: int) -> str:
+    return f"{dilemma_id}{VOTE_COUNTER_SHARD_MARKER}{shard}"
+
+
+def merge_vote_counters(rows: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Sum the counters of dilemma rows and their shard rows, keyed by
+    dilemma id. Every dilemma that had at least one row gets both fields."""
+    merged: Dict[str, Dict[str, int]] = {}
+    for row in rows:
+        row_id = row.get("_id", "")
+        dilemma_id = row.get(VOTE_COUNTER_SHARD_OWNER_FIELD) or row_id.partition(VOTE_COUNTER_SHARD_MARKER)[0]
+        counters = merged.setdefault(dilemma_id, {field: 0 for field in VOTE_COUNTER_FIELDS})
+        for field in VOTE_COUNTER_FIELDS:
+            counters[field] += int(row.get(field, 0) or 0)
+    return merged
+
+
+# Session decks: a stateless, repeat-free walk through a language's catalog.
+# The client holds a signed cursor (deck version, seed, position); each call
+# maps the position through a keyed pseudo-random permutation of the catalog
+# and hands back the cursor for position + 1, so nothing grows per question
+# and nothing is stored server-side. Every `size` positions form one full
+# pass with its own permutation, so a deck never runs out.
+DECK_CURSOR_FORMAT = "1"
+_DECK_FEISTEL_ROUNDS = 4
+
+
+def _deck_round(seed: int, deck_pass: int, round_index: int, value: int) -> int:
+    digest = hashlib.blake2b(f"{seed}:{deck_pass}:{round_index}:{value}".encode("ascii"), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def deck_index(seed: int, position: int, size: int) -> int:
+    """Catalog index shown at `position` of the deck seeded with `seed`.
+
+    O(1): a balanced Feistel network is a bijection on [0, 4**half_bits), and
+    cycle-walking (re-applying it until the value lands below `size`) turns
+    that into a bijection on [0, size) in at most a few expected steps.
+    """
+    if size <= 1:
+        return 0
+    deck_pass, value = divmod(position, size)
+    half_bits = max(1, ((size - 1).bit_length() + 1) // 2)
+    mask = (1 << half_bits) - 1
+    while True:
+        left, right = value >> half_bits, value & mask
+        for round_index in range(_DECK_FEISTEL_ROUNDS):
+            left, right = right, left ^ (_deck_round(seed, deck_pass, round_index, right) & mask)
+        value = (left << half_bits) | right
+        if value < size:
+            return value
+
+
+def deck_dilemma(snapshot: Dict[str, Any], seed: int, position: int) -> Optional[Dict[str, Any]]:
+    """A copy of the item at `position` of a deck, or None for an empty catalog."""
+    ids = snapshot["ids"]
+    if not ids:
+        return None
+    return dict(snapshot["itemsById"][ids[deck_index(seed, position, len(ids))]])
+
+
+def _deck_signature(key: bytes, payload: str) -> str:
+    return hmac.new(key, payload.encode("ascii"), hashlib.sha256).hexdigest()[:16]
+
+
+def encode_deck_cursor(key: bytes, language: str, deck_version: str, seed: int, position: int) -> str:
+    payload = f"{DECK_CURSOR_FORMAT}.{language}.{deck_version}.{seed:x}.{position:x}"
+    return f"{payload}.{_deck_signature(key, payload)}"
+
+
+def decode_deck_cursor(key: bytes, cursor: str) -> Optional[Dict[str, Any]]:
+    """The cursor's fields, or None if it is malformed or not signed with `key`."""
+    payload, _, signature = cursor.rpartition(".")
+    parts = payload.split(".")
+    if len(parts) != 5 or parts[0] != DECK_CURSOR_FORMAT:
+        return None
+    if not hmac.compare_digest(signature, _deck_signature(key, payload)):
+        return None
+    try:
+        seed = int(parts[3], 16)
+        position = int(parts[4], 16)
+    except ValueError:
+        return None
+    if seed < 0 or position < 0:
+        return None
+    return {"language": parts[1], "deckVersion": parts[2], "seed": seed, "position": position}
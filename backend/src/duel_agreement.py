@@ -0,0 +1,67 @@
+"""Distribution of overall agreement across completed Moral Duels.
+
+/compare shows a pair's overallAgreementPct with no sense of whether it is
+high or low. Every completed duel adds one to the bucket of its score
+(scores have one decimal, so there are at most 1001 buckets) on a single
+stats row, written once per submit_challenge with an atomic ADD. API
+containers turn the row into a cumulative histogram, cached in memory, and
+answer "your pair is in the top X%" with a bisect over it: O(log n) in the
+number of distinct scores seen. Nothing here touches AWS.
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, List, Optional
+
+try:
+    from src.archetype_census import cumulative_histogram
+    from src.dilemma_catalog import STATS_ROW_ID_PREFIX
+except ImportError:
+    try:
+        from .archetype_census import cumulative_histogram
+        from .dilemma_catalog import STATS_ROW_ID_PREFIX
+    except ImportError:
+        from archetype_census import cumulative_histogram
+        from dilemma_catalog import STATS_ROW_ID_PREFIX
+
+# One stats row for every language: a duel's score doesn't depend on it.
+DUEL_AGREEMENT_DISTRIBUTION_ID = f"{STATS_ROW_ID_PREFIX}duel-agreement"
+
+# No "top X%" until this many duels have been recorded, the same floor the
+# archetype census uses (ARCHETYPE_CENSUS_MIN_PROFILES) before it reports
+# shares.
+DUEL_AGREEMENT_MIN_DUELS = 20
+
+_BUCKET_PREFIX = "b"
+
+
+def agreement_bucket_attribute(agreement_pct: float) -> str:
+    """Row attribute counting duels that scored `agreement_pct`, e.g.
+    "b723" for 72.3."""
+    return f"{_BUCKET_PREFIX}{int(round(agreement_pct * 10))}"
+
+
+def agreement_distribution(row: Optional[Dict[str, Any]]) -> Dict[str, List]:
+    """Cumulative histogram ({"values", "cumulative"}, scores in tenths of a
+    percent) of a stored distribution row; empty when there is no row."""
+    value_counts = {}
+    for attribute, count in (row or {}).items():
+        if attribute.startswith(_BUCKET_PREFIX) and attribute[len(_BUCKET_PREFIX):].isdigit() and int(count) > 0:
+            value_counts[int(attribute[len(_BUCKET_PREFIX):])] = int(count)
+    return cumulative_histogram(value_counts)
+
+
+def agreement_top_pct(
+    distribution: Dict[str, List],
+    agreement_pct: float,
+    min_duels: int = DUEL_AGREEMENT_MIN_DUELS,
+) -> Optional[int]:
+    """"Top X%": the rounded-up percentage of recorded duels that agreed at
+    least as much as `agreement_pct`, so the best pair so far is in the top
+    1% and the worst in the top 100%. None below `min_duels` duels."""
+    total = distribution["cumulative"][-1] if distribution["cumulative"] else 0
+    if total < min_duels:
+        return None
+    position = bisect_left(distribution["values"], int(round(agreement_pct * 10)))
+    below = distribution["cumulative"][position - 1] if position else 0
+    at_least = total - below
+    return max(1, min(100, -(-at_least * 100 // total)))
@@ -0,0 +1,308 @@
+"""Nearest-profile ("moral twin") search over stored dimension averages.
+
+Finding the live profiles most compatible with a given one by calling
+compute_compatibility against every profile is a full table scan per
+request. Instead each profile is filed under a cell of a coarse grid over
+the six dimensions (TWIN_GRID_STEPS buckets per dimension) as one small
+item of the moral twin index table, keyed by (cell, publicId) and holding
+the encoded averages. Profile creation puts that item and every profile
+delete overwrites it with a removal marker, so the index stays current
+without any rebuild and no write ever touches another profile's item; the
+daily census scan reconciles whatever a failed best-effort write left
+behind. Every write is stamped with its time and day bucket, which a
+"changes" index on the table is keyed by, so a container that already holds
+the index only reads what was written since it last looked
+(twin_change_days, apply_twin_index_changes) instead of rescanning.
+
+API containers load every member into memory (build_twin_index), split
+into small KD-tree style leaves, and answer find_twins from there: leaves
+are visited in order of the best agreement any of their members could reach
+(from each leaf's bounding box), and the search stops as soon as no
+remaining leaf can beat the current results, so a query scores a few
+leaves instead of every profile. Results are exact, not
+approximate. Nothing here touches AWS.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from src.compatibility_engine import DIMENSIONS, agreement_pcts, compatibility_vectors, total_distances
+except ImportError:
+    try:
+        from .compatibility_engine import DIMENSIONS, agreement_pcts, compatibility_vectors, total_distances
+    except ImportError:
+        from compatibility_engine import DIMENSIONS, agreement_pcts, compatibility_vectors, total_distances
+
+# Buckets per dimension: 4**6 = 4096 cells, which spread the index table's
+# partition keys and give build_twin_index its first split. Changing it
+# re-files every profile on the next reconcile.
+TWIN_GRID_STEPS = 4
+
+# In memory, cells are split further (at the median of their widest
+# dimension, like a KD-tree) into leaves of at most this many profiles, so
+# a query only scores profiles near the answer.
+TWIN_LEAF_SIZE = 32
+
+# Dilemma weights, and so averages, fall in this range.
+_GRID_LOW = 0.1
+_GRID_HIGH = 1.0
+
+# A member created this shortly before a reconcile scan started may have
+# been missed by it, so the reconcile never removes it.
+TWIN_RECONCILE_GRACE_SECONDS = 600
+
+# Width of the day buckets ("changeDay") the table's changes index is
+# partitioned by. Profile writes are rare enough for one partition a day.
+TWIN_CHANGE_BUCKET_SECONDS = 86400
+
+# Removal markers expire (DynamoDB TTL on expirationTime) after this long;
+# a container whose last read is older than that rescans the table instead.
+TWIN_REMOVAL_RETENTION_SECONDS = 7 * 86400
+
+
+def twin_cell(averages: Dict[str, float]) -> str:
+    """Grid cell of a set of averages, e.g. "0.2.1.1.0.2". Missing
+    dimensions count as neutral, as they do for compatibility."""
+    buckets = np.floor((compatibility_vectors([averages])[0] - _GRID_LOW) / (_GRID_HIGH - _GRID_LOW) * TWIN_GRID_STEPS)
+    return ".".join(str(int(bucket)) for bucket in np.clip(buckets, 0, TWIN_GRID_STEPS - 1))
+
+
+def encode_twin_member(averages: Dict[str, float], created_at_seconds: int) -> str:
+    """A member's map value: "<created at>|<six averages in DIMENSIONS order>"."""
+    vector = compatibility_vectors([averages])[0].tolist()
+    return f"{int(created_at_seconds)}|" + ",".join(repr(value) for value in vector)
+
+
+def decode_twin_member(value: str) -> Tuple[int, List[float]]:
+    created_at, vector = value.split("|", 1)
+    return int(created_at), [float(component) for component in vector.split(",")]
+
+
+def twin_index_item(cell: str, public_id: str, updated_at: int, member: Optional[str] = None) -> Dict[str, Any]:
+    """The index table item filing `member` under `cell`, or, without a
+    member, the removal marker that replaces it. Both carry the write time
+    the changes index is keyed by."""
+    item: Dict[str, Any] = {
+        "cell": cell,
+        "publicId": public_id,
+        "updatedAt": int(updated_at),
+        "changeDay": int(updated_at) // TWIN_CHANGE_BUCKET_SECONDS,
+    }
+    if member is None:
+        item["removed"] = True
+        item["expirationTime"] = int(updated_at) + TWIN_REMOVAL_RETENTION_SECONDS
+    else:
+        item["member"] = member
+    return item
+
+
+def twin_cell_members(items: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, str]]:
+    """{cell: {publicId: member}} from index table items; removal markers
+    are left out."""
+    cells: Dict[str, Dict[str, str]] = {}
+    for item in items:
+        if not item.get("removed"):
+            cells.setdefault(item["cell"], {})[item["publicId"]] = item.get("member")
+    return cells
+
+
+def twin_change_days(since: int, until: int) -> List[int]:
+    """The changeDay buckets holding writes made between `since` and
+    `until` (seconds), oldest first."""
+    return list(range(int(since) // TWIN_CHANGE_BUCKET_SECONDS, int(until) // TWIN_CHANGE_BUCKET_SECONDS + 1))
+
+
+def apply_twin_index_changes(
+    cell_members: Dict[str, Dict[str, str]],
+    items: Iterable[Dict[str, Any]],
+) -> Optional[Dict[str, Dict[str, str]]]:
+    """`cell_members` with the latest write of each changed index item
+    applied: members are set, removal markers drop theirs. Items already
+    reflected are no-ops, so overlapping reads are harmless. Returns None
+    when nothing changed; otherwise a new mapping (`cell_members` itself is
+    left untouched, it may still be serving searches)."""
+    latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for item in sorted(items, key=lambda item: int(item.get("updatedAt") or 0)):
+        latest[(item["cell"], item["publicId"])] = item
+
+    updated: Dict[str, Dict[str, str]] = dict(cell_members)
+    copied = set()
+    changed = False
+    for (cell, public_id), item in latest.items():
+        current = updated.get(cell)
+        if current is None:
+            current = {}
+        if item.get("removed"):
+            if public_id not in current:
+                continue
+        elif current.get(public_id) == item.get("member"):
+            continue
+        if cell not in copied:
+            current = dict(current)
+            updated[cell] = current
+            copied.add(cell)
+        if item.get("removed"):
+            del current[public_id]
+        else:
+            current[public_id] = item.get("member")
+        changed = True
+    return updated if changed else None
+
+
+def _split_leaves(vectors: np.ndarray, members: np.ndarray, leaves: List[np.ndarray]) -> None:
+    """Append to `leaves` the member positions of each leaf, splitting at the
+    median of the widest dimension until a leaf fits TWIN_LEAF_SIZE."""
+    if len(members) <= TWIN_LEAF_SIZE:
+        leaves.append(members)
+        return
+    cell_vectors = vectors[members]
+    widest = int(np.argmax(cell_vectors.max(axis=0) - cell_vectors.min(axis=0)))
+    order = members[np.argsort(cell_vectors[:, widest], kind="stable")]
+    half = len(order) // 2
+    _split_leaves(vectors, order[:half], leaves)
+    _split_leaves(vectors, order[half:], leaves)
+
+
+def build_twin_index(cell_members: Dict[str, Dict[str, str]]) -> Dict[str, Any]:
+    """In-memory index over {cell: {publicId: encoded member}}. Each cell is
+    split into leaves of at most TWIN_LEAF_SIZE members; members are laid
+    out leaf by leaf ("vectors", "ids", and "idRanks", each member's
+    position in publicId order for tie-breaks), with every leaf's
+    [start, end) slice and bounding box. Unreadable members are skipped."""
+    decoded: Dict[str, Dict[str, List[float]]] = {}
+    for cell in sorted(cell_members):
+        for public_id, member in (cell_members[cell] or {}).items():
+            try:
+                _, vector = decode_twin_member(member)
+            except (AttributeError, TypeError, ValueError):
+                continue
+            if len(vector) == len(DIMENSIONS):
+                decoded.setdefault(cell, {})[public_id] = vector
+    ranks = {public_id: rank for rank, public_id in enumerate(sorted(
+        public_id for members in decoded.values() for public_id in members
+    ))}
+
+    ids: List[str] = []
+    vector_rows: List[List[float]] = []
+    leaves: List[np.ndarray] = []
+    for cell, members in decoded.items():
+        offset = len(ids)
+        cell_ids = sorted(members)
+        ids.extend(cell_ids)
+        vector_rows.extend(members[public_id] for public_id in cell_ids)
+        leaves_before = len(leaves)
+        _split_leaves(
+            np.array([members[public_id] for public_id in cell_ids], dtype=np.float64),
+            np.arange(len(cell_ids)),
+            leaves,
+        )
+        for position in range(leaves_before, len(leaves)):
+            leaves[position] = leaves[position] + offset
+
+    layout = np.concatenate(leaves) if leaves else np.zeros(0, dtype=np.int64)
+    vectors = np.array(vector_rows, dtype=np.float64).reshape(-1, len(DIMENSIONS))[layout]
+    ends = np.cumsum([len(leaf) for leaf in leaves]).astype(np.int64)
+    starts = ends - np.array([len(leaf) for leaf in leaves], dtype=np.int64)
+    ordered_ids = [ids[position] for position in layout.tolist()]
+    return {
+        "ids": ordered_ids,
+        "idRanks": np.array([ranks[public_id] for public_id in ordered_ids], dtype=np.int64),
+        "vectors": vectors,
+        "starts": starts,
+        "ends": ends,
+        "lower": np.array([vectors[start:end].min(axis=0) for start, end in zip(starts, ends)]).reshape(-1, len(DIMENSIONS)),
+        "upper": np.array([vectors[start:end].max(axis=0) for start, end in zip(starts, ends)]).reshape(-1, len(DIMENSIONS)),
+        "ranks": ranks,
+        "size": len(ordered_ids),
+    }
+
+
+def find_twins(
+    index: Dict[str, Any],
+    averages: Dict[str, float],
+    limit: int,
+    exclude_public_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """The `limit` indexed profiles closest to `averages` by the summed
+    distance compute_compatibility scores, nearest first, ties broken by
+    publicId. Each is {"publicId", "overallAgreementPct", "averages"}, the
+    score being exactly what compute_compatibility returns; a nearer
+    profile never scores lower.
+
+    A leaf's bound sums, dimension by dimension, the gap between the query
+    and the leaf's bounding box: never more than any member's summed
+    distance, even in floating point. Leaves are scored nearest bound
+    first, in doubling batches, until the next leaf's bound exceeds the
+    farthest distance among the current results, at which point no
+    remaining leaf can change them.
+    """
+    if not index["size"] or limit < 1:
+        return []
+    query = compatibility_vectors([averages])[0]
+    gaps = np.maximum(0.0, np.maximum(index["lower"] - query, query - index["upper"]))
+    bounds = np.zeros(len(gaps))
+    for column in range(len(DIMENSIONS)):
+        bounds = bounds + gaps[:, column]
+    leaf_order = np.argsort(bounds, kind="stable")
+    excluded_rank = index["ranks"].get(exclude_public_id, -1)
+
+    visited = min(len(leaf_order), 8)
+    while True:
+        chosen = leaf_order[:visited]
+        lengths = index["ends"][chosen] - index["starts"][chosen]
+        # Concatenated [start, end) ranges of the chosen leaves.
+        members = np.repeat(index["starts"][chosen] - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        members = members[index["idRanks"][members] != excluded_rank]
+        distances = total_distances(averages, index["vectors"][members])
+        if visited == len(leaf_order):
+            break
+        if len(distances) >= limit and bounds[leaf_order[visited]] > np.partition(distances, limit - 1)[limit - 1]:
+            break
+        visited = min(len(leaf_order), visited * 2)
+
+    nearest = np.lexsort((index["idRanks"][members], distances))[:limit]
+    scores = agreement_pcts(distances[nearest] / len(DIMENSIONS)).tolist()
+    return [
+        {
+            "publicId": index["ids"][member],
+            "overallAgreementPct": score,
+            "averages": dict(zip(DIMENSIONS, index["vectors"][member].tolist())),
+        }
+        for member, score in zip(members[nearest].tolist(), scores)
+    ]
+
+
+def twin_index_changes(
+    cell_members: Dict[str, Dict[str, str]],
+    live_members: Dict[str, Tuple[str, str]],
+    scan_started_at: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Per cell, the {"set": {publicId: member}, "remove": [publicId]} that
+    bring the stored index in line with `live_members` ({publicId: (cell,
+    member)} from a full profile scan started at `scan_started_at`).
+
+    Live profiles missing from their cell (or filed in another one) are set;
+    members no scanned live profile accounts for are removed, unless they
+    were created within TWIN_RECONCILE_GRACE_SECONDS of the scan start and
+    so may simply have been written after the scan passed them.
+    """
+    changes: Dict[str, Dict[str, Any]] = {}
+    for public_id, (cell, member) in live_members.items():
+        if (cell_members.get(cell) or {}).get(public_id) != member:
+            changes.setdefault(cell, {"set": {}, "remove": []})["set"][public_id] = member
+    for cell, members in cell_members.items():
+        for public_id, member in (members or {}).items():
+            if live_members.get(public_id, (None,))[0] == cell:
+                continue
+            try:
+                created_at, _ = decode_twin_member(member)
+            except (AttributeError, TypeError, ValueError):
+                created_at = 0
+            if created_at >= scan_started_at - TWIN_RECONCILE_GRACE_SECONDS:
+                continue
+            changes.setdefault(cell, {"set": {}, "remove": []})["remove"].append(public_id)
+    for change in changes.values():
+        change["remove"].sort()
+    return changes
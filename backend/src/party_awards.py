@@ -7,15 +7,17 @@ key) instead of depending on dict/iteration order - the same discipline as
 archetype_engine.py and compatibility_engine.py.
 """
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
 
 try:
-    from src.compatibility_engine import compute_compatibility
+    from src.compatibility_engine import overall_agreement_matrix
 except ImportError:
     try:
-        from .compatibility_engine import compute_compatibility
+        from .compatibility_engine import overall_agreement_matrix
     except ImportError:
-        from compatibility_engine import compute_compatibility
+        from compatibility_engine import overall_agreement_matrix
 
 
 def compute_most_controversial_round(votes_by_round: List[Dict[str, int]]) -> Optional[int]:
@@ -35,65 +37,81 @@ def compute_most_controversial_round(votes_by_round: List[Dict[str, int]]) -> Op
     return scored[0][1]
 
 
-def compute_closest_pair(participant_averages: Dict[int, Dict[str, float]]) -> Optional[Dict[str, Any]]:
-    """The two participants (by index key) with the highest pairwise
-    agreement. Needs at least 2 participants."""
+def party_agreement_matrix(
+    participant_averages: Dict[int, Dict[str, float]],
+) -> Tuple[List[int], np.ndarray]:
+    """(sorted participant keys, N x N overallAgreementPct matrix in that
+    key order). Built once per room and shared by the closest pair, moral
+    minority and most aligned awards instead of each calling
+    compute_compatibility for every pair."""
     keys = sorted(participant_averages.keys())
-    if len(keys) < 2:
+    return keys, overall_agreement_matrix([participant_averages[key] for key in keys])
+
+
+def _average_agreement(matrix: np.ndarray) -> np.ndarray:
+    """Each participant's mean agreement with everyone else. The diagonal is
+    zeroed and each row summed left to right (cumsum, not NumPy's pairwise
+    sum), which adds the same floats in the same order as summing the scores
+    over the other keys in sorted order."""
+    others = matrix.copy()
+    np.fill_diagonal(others, 0.0)
+    return np.cumsum(others, axis=1)[:, -1] / (len(matrix) - 1)
+
+
+def compute_closest_pair(
+    participant_averages: Dict[int, Dict[str, float]],
+    agreement: Optional[Tuple[List[int], np.ndarray]] = None,
+) -> Optional[Dict[str, Any]]:
+    """The two participants (by index key) with the highest pairwise
+    agreement. Needs at least 2 participants. `agreement` is a precomputed
+    party_agreement_matrix. Ties resolve to the lowest key pair."""
+    if len(participant_averages) < 2:
         return None
-    best = None
-    for i, key_a in enumerate(keys):
-        for key_b in keys[i + 1:]:
-            result = compute_compatibility(participant_averages[key_a], participant_averages[key_b])
-            candidate = (result["overallAgreementPct"], key_a, key_b)
-            if best is None or candidate[0] > best[0]:
-                best = candidate
-    return {"participantKeys": [best[1], best[2]], "agreementPct": best[0]}
+    keys, matrix = agreement or party_agreement_matrix(participant_averages)
+    # Only pairs above the diagonal compete; argmax returns the first
+    # maximum in row-major order, i.e. the lowest (key_a, key_b).
+    candidates = np.where(np.triu(np.ones(matrix.shape, dtype=bool), k=1), matrix, -np.inf)
+    row, column = np.unravel_index(int(np.argmax(candidates)), matrix.shape)
+    return {"participantKeys": [keys[row], keys[column]], "agreementPct": float(matrix[row, column])}
 
 
-def compute_moral_minority(participant_averages: Dict[int, Dict[str, float]]) -> Optional[Dict[str, Any]]:
+def compute_moral_minority(
+    participant_averages: Dict[int, Dict[str, float]],
+    agreement: Optional[Tuple[List[int], np.ndarray]] = None,
+) -> Optional[Dict[str, Any]]:
     """The participant least aligned with the rest of the group on average.
     Needs at least 3 participants: with exactly 2, neither is a "minority"
     relative to the other, they are just different from one person."""
-    keys = sorted(participant_averages.keys())
-    if len(keys) < 3:
+    if len(participant_averages) < 3:
         return None
-    average_agreement = {}
-    for key in keys:
-        others = [k for k in keys if k != key]
-        scores = [
-            compute_compatibility(participant_averages[key], participant_averages[other])["overallAgreementPct"]
-            for other in others
-        ]
-        average_agreement[key] = sum(scores) / len(scores)
-    least_aligned_key = min(keys, key=lambda k: (average_agreement[k], k))
+    keys, matrix = agreement or party_agreement_matrix(participant_averages)
+    average_agreement = _average_agreement(matrix)
+    # argmin returns the first minimum, i.e. the lowest key among ties.
+    least_aligned = int(np.argmin(average_agreement))
     return {
-        "participantKey": least_aligned_key,
-        "averageAgreementPct": round(average_agreement[least_aligned_key], 1),
+        "participantKey": keys[least_aligned],
+        "averageAgreementPct": round(float(average_agreement[least_aligned]), 1),
     }
 
 
-def compute_most_aligned_with_group(participant_averages: Dict[int, Dict[str, float]]) -> Optional[Dict[str, Any]]:
+def compute_most_aligned_with_group(
+    participant_averages: Dict[int, Dict[str, float]],
+    agreement: Optional[Tuple[List[int], np.ndarray]] = None,
+) -> Optional[Dict[str, Any]]:
     """TASK-123 - "the machine's favorite": the inverse of moral minority,
     the participant most in step with everyone else on average. Needs 3+
     participants for the same reason moral minority does: with exactly 2,
     both share the same single mutual score, so there's no meaningful
     "most" to single out."""
-    keys = sorted(participant_averages.keys())
-    if len(keys) < 3:
+    if len(participant_averages) < 3:
         return None
-    average_agreement = {}
-    for key in keys:
-        others = [k for k in keys if k != key]
-        scores = [
-            compute_compatibility(participant_averages[key], participant_averages[other])["overallAgreementPct"]
-            for other in others
-        ]
-        average_agreement[key] = sum(scores) / len(scores)
-    most_aligned_key = max(keys, key=lambda k: (average_agreement[k], -k))
+    keys, matrix = agreement or party_agreement_matrix(participant_averages)
+    average_agreement = _average_agreement(matrix)
+    # argmax returns the first maximum, i.e. the lowest key among ties.
+    most_aligned = int(np.argmax(average_agreement))
     return {
-        "participantKey": most_aligned_key,
-        "averageAgreementPct": round(average_agreement[most_aligned_key], 1),
+        "participantKey": keys[most_aligned],
+        "averageAgreementPct": round(float(average_agreement[most_aligned]), 1),
     }
 
 
@@ -136,11 +154,14 @@ def compute_party_room_awards(
     participant_choices: Dict[int, Dict[int, str]],
 ) -> Dict[str, Any]:
     """One entry point bundling all five awards, each independently omitted
-    (None) rather than fabricated when the group is too small to support it."""
+    (None) rather than fabricated when the group is too small to support it.
+    The pairwise agreement matrix is built once and shared by the three
+    awards that need it."""
+    agreement = party_agreement_matrix(participant_averages) if len(participant_averages) >= 2 else None
     return {
-        "closestPair": compute_closest_pair(participant_averages),
-        "moralMinority": compute_moral_minority(participant_averages),
-        "mostAlignedWithGroup": compute_most_aligned_with_group(participant_averages),
+        "closestPair": compute_closest_pair(participant_averages, agreement),
+        "moralMinority": compute_moral_minority(participant_averages, agreement),
+        "mostAlignedWithGroup": compute_most_aligned_with_group(participant_averages, agreement),
         "contrarian": compute_contrarian(participant_choices, votes_by_round),
         "mostControversialRoundIndex": compute_most_controversial_round(votes_by_round),
     }
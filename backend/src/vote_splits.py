@@ -0,0 +1,96 @@
+"""Per-dilemma vote split statistics and the "most divisive" ranking.
+
+The only vote data is the yes/no counters /vote keeps per dilemma (possibly
+spread over shard rows, see dilemma_catalog.merge_vote_counters). Ranking
+dilemmas by how evenly they split would need every counter, so a scheduled
+job (backend_fastapi.vote_counter_compaction_handler) merges them once per
+run into one compact index per language; API containers read that index
+with a single GetItem and answer split lookups in O(1) and top-k rankings
+in O(k) from memory. Nothing here touches AWS.
+"""
+
+from fractions import Fraction
+from typing import Any, Dict, Iterable, Optional
+
+try:
+    from src.dilemma_catalog import STATS_ROW_ID_PREFIX
+except ImportError:
+    try:
+        from .dilemma_catalog import STATS_ROW_ID_PREFIX
+    except ImportError:
+        from dilemma_catalog import STATS_ROW_ID_PREFIX
+
+# One stats row per language, written by the scheduled job.
+VOTE_SPLIT_INDEX_ID_PREFIX = f"{STATS_ROW_ID_PREFIX}votes#"
+
+# A ranking of dilemmas with a handful of votes is noise; below this many
+# total votes a dilemma still gets its split but is never "most divisive".
+VOTE_SPLIT_MIN_RANKED_VOTES = 20
+VOTE_SPLIT_RANKING_SIZE = 50
+
+
+def vote_split_index_id(language: str) -> str:
+    return f"{VOTE_SPLIT_INDEX_ID_PREFIX}{language}"
+
+
+def vote_split(yes_count: int, no_count: int) -> Dict[str, int]:
+    """Counts and rounded percentages, same shape as the Daily results."""
+    total = yes_count + no_count
+    return {
+        "yesCount": yes_count,
+        "noCount": no_count,
+        "totalVotes": total,
+        "yesPct": round((yes_count / total) * 100) if total else 0,
+        "noPct": round((no_count / total) * 100) if total else 0,
+    }
+
+
+def _divisiveness_key(base_id: str, split: Dict[str, int]) -> tuple:
+    # Closest to 50/50 first (compared as exact fractions, not floats), then
+    # the most votes, then baseId so equal splits always rank the same way.
+    total = split["totalVotes"]
+    return (Fraction(abs(split["yesCount"] - split["noCount"]), total), -total, base_id)
+
+
+def build_vote_split_index(
+    language: str,
+    counters_by_id: Dict[str, Dict[str, int]],
+    built_at: int,
+    min_ranked_votes: int = VOTE_SPLIT_MIN_RANKED_VOTES,
+    ranking_size: int = VOTE_SPLIT_RANKING_SIZE,
+) -> Dict[str, Any]:
+    """Index one language's merged counters (keyed by `<baseId>-<language>`
+    dilemma id) by baseId, plus the baseIds of the `ranking_size` most evenly
+    split dilemmas with at least `min_ranked_votes` votes."""
+    suffix = f"-{language}"
+    splits = {
+        dilemma_id[:-len(suffix)]: vote_split(int(counters.get("yesCount", 0)), int(counters.get("noCount", 0)))
+        for dilemma_id, counters in counters_by_id.items()
+        if dilemma_id.endswith(suffix)
+    }
+    ranked = sorted(
+        (base_id for base_id, split in splits.items() if split["totalVotes"] >= max(1, min_ranked_votes)),
+        key=lambda base_id: _divisiveness_key(base_id, splits[base_id]),
+    )
+    return {
+        "language": language,
+        "builtAt": built_at,
+        "splits": splits,
+        "mostDivisive": ranked[:ranking_size],
+    }
+
+
+def splits_for_base_ids(index: Dict[str, Any], base_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Splits of the requested base ids; ids without votes are absent."""
+    splits = index["splits"]
+    return {base_id: splits[base_id] for base_id in base_ids if base_id in splits}
+
+
+def most_divisive(index: Dict[str, Any], limit: int) -> list:
+    """The `limit` most divisive base ids with their splits, in rank order."""
+    splits = index["splits"]
+    return [{"baseId": base_id, **splits[base_id]} for base_id in index["mostDivisive"][:limit]]
+
+
+def empty_vote_split_index(language: str, built_at: Optional[int] = None) -> Dict[str, Any]:
+    return {"language": language, "builtAt": built_at, "splits": {}, "mostDivisive": []}
@@ -409,6 +409,59 @@ resource "aws_dynamodb_table" "party_participants" {
   }
 }
 
+# Moral twin index (see backend/src/moral_twins.py): one small item per live
+# profile, keyed by its grid cell and publicId, so adding or removing a
+# profile never rewrites anyone else's entry. Deletes leave a removal marker
+# that expires via TTL. API containers load it once with a parallel scan,
+# then only query ChangesIndex for what was written since (one partition per
+# day of writes). Bursty, hence on-demand.
+resource "aws_dynamodb_table" "moral_twin_index" {
+  name         = "${var.environment}-${var.stack_name}-moral-twin-index"
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "cell"
+  range_key    = "publicId"
+
+  attribute {
+    name = "cell"
+    type = "S"
+  }
+
+  attribute {
+    name = "publicId"
+    type = "S"
+  }
+
+  attribute {
+    name = "changeDay"
+    type = "N"
+  }
+
+  attribute {
+    name = "updatedAt"
+    type = "N"
+  }
+
+  global_secondary_index {
+    name               = "ChangesIndex"
+    hash_key           = "changeDay"
+    range_key          = "updatedAt"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["member", "removed"]
+  }
+
+  ttl {
+    attribute_name = "expirationTime"
+    enabled        = true
+  }
+
+  tags = {
+    Name        = "Moral Torture Machine Moral Twin Index"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+    Purpose     = "Per-profile dimension averages for nearest-profile searches"
+  }
+}
+
 # TASK-42/43: one private, anonymous-first vote plus one public aggregate per
 # global Daily Moral Crime window. A conditional transaction writes the two
 # rows together, so repeat requests cannot inflate the aggregate. The GSI is
@@ -750,6 +803,8 @@ resource "aws_iam_role_policy" "lambda_permissions" {
           "${aws_dynamodb_table.challenge_participants.arn}/index/*",
           aws_dynamodb_table.party_rooms.arn,
           aws_dynamodb_table.party_participants.arn,
+          aws_dynamodb_table.moral_twin_index.arn,
+          "${aws_dynamodb_table.moral_twin_index.arn}/index/*",
           aws_dynamodb_table.daily_moral_crime_votes.arn,
           "${aws_dynamodb_table.daily_moral_crime_votes.arn}/index/*",
           aws_dynamodb_table.ops_error_alerts.arn
@@ -816,6 +871,40 @@ resource "aws_iam_role_policy" "lambda_permissions" {
   })
 }
 
+# Read access to the hot-reload copy of archetypes.json, only when
+# archetypes_source points at S3 (a local path needs no permission).
+resource "aws_iam_role_policy" "lambda_archetypes_source" {
+  count = startswith(var.archetypes_source, "s3://") ? 1 : 0
+  name  = "archetypes-source"
+  role  = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect   = "Allow"
+      Action   = ["s3:GetObject"]
+      Resource = ["arn:aws:s3:::${trimprefix(var.archetypes_source, "s3://")}"]
+    }]
+  })
+}
+
+# The census job re-matches stored profiles under the current archetypes
+# version, so it reads the same hot-reload copy as the API.
+resource "aws_iam_role_policy" "archetype_census_archetypes_source" {
+  count = startswith(var.archetypes_source, "s3://") ? 1 : 0
+  name  = "archetypes-source"
+  role  = aws_iam_role.archetype_census_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect   = "Allow"
+      Action   = ["s3:GetObject"]
+      Resource = ["arn:aws:s3:::${trimprefix(var.archetypes_source, "s3://")}"]
+    }]
+  })
+}
+
 # TASK-15.1/TASK-64: the retention worker needs a smaller permission set than
 # the public API Lambda. Keeping the scheduled cascade separate prevents a
 # timer-triggered function from reading dilemmas, calling Groq, or publishing
@@ -870,6 +959,12 @@ resource "aws_iam_role_policy" "retention_sweep_permissions" {
           "${aws_dynamodb_table.daily_moral_crime_votes.arn}/index/*",
         ]
       },
+      {
+        # Deleted profiles leave a removal marker in the moral twin index.
+        Effect   = "Allow"
+        Action   = ["dynamodb:PutItem"]
+        Resource = [aws_dynamodb_table.moral_twin_index.arn]
+      },
       {
         # Only historic account rows without cognitoUsername need this lookup;
         # all new rows use their stored immutable Cognito username directly.
@@ -929,6 +1024,7 @@ resource "aws_lambda_function" "api" {
       CHALLENGE_PARTICIPANTS_TABLE              = aws_dynamodb_table.challenge_participants.name
       PARTY_ROOMS_TABLE                         = aws_dynamodb_table.party_rooms.name
       PARTY_PARTICIPANTS_TABLE                  = aws_dynamodb_table.party_participants.name
+      MORAL_TWIN_INDEX_TABLE                    = aws_dynamodb_table.moral_twin_index.name
       DAILY_MORAL_CRIME_VOTES_TABLE             = aws_dynamodb_table.daily_moral_crime_votes.name
       OPS_ERROR_ALERTS_TABLE                    = aws_dynamodb_table.ops_error_alerts.name
       GROQ_API_KEY_SSM_NAME                     = aws_ssm_parameter.groq_api_key.name
@@ -944,6 +1040,16 @@ resource "aws_lambda_function" "api" {
       ABUSE_DUEL_WRITE_REQUESTS_PER_MINUTE      = tostring(var.abuse_duel_write_requests_per_minute)
       ABUSE_PUBLIC_READ_REQUESTS_PER_MINUTE     = tostring(var.abuse_public_read_requests_per_minute)
       ABUSE_PARTY_ROOM_POLL_REQUESTS_PER_MINUTE = tostring(var.abuse_party_room_poll_requests_per_minute)
+      DILEMMA_CATALOG_TTL_SECONDS               = tostring(var.dilemma_catalog_ttl_seconds)
+      DILEMMA_CATALOG_SCAN_SEGMENTS             = tostring(var.dilemma_catalog_scan_segments)
+      VOTE_COUNTER_SHARDS                       = tostring(var.vote_counter_shards)
+      VOTE_COUNTER_ROLLUP_TTL_SECONDS           = tostring(var.vote_counter_rollup_ttl_seconds)
+      VOTE_WRITE_BEHIND_ENABLED                 = tostring(var.vote_write_behind_enabled)
+      VOTE_WRITE_BEHIND_MAX_VOTES               = tostring(var.vote_write_behind_max_votes)
+      VOTE_WRITE_BEHIND_MAX_AGE_SECONDS         = tostring(var.vote_write_behind_max_age_seconds)
+      ARCHETYPE_MEMO_MAX_ENTRIES                = tostring(var.archetype_memo_max_entries)
+      ARCHETYPES_SOURCE                         = var.archetypes_source
+      ARCHETYPES_RELOAD_TTL_SECONDS             = tostring(var.archetypes_reload_ttl_seconds)
       OPS_ALERTS_TOPIC_ARN                      = aws_sns_topic.ops_alerts.arn
       OPS_ERROR_NOTIFICATIONS_ENABLED           = tostring(var.ops_error_notifications_enabled)
       OPS_ERROR_NOTIFICATION_COOLDOWN_SECONDS   = tostring(var.ops_error_notification_cooldown_seconds)
@@ -998,6 +1104,7 @@ resource "aws_lambda_function" "retention_sweep" {
       CHALLENGE_PARTICIPANTS_TABLE            = aws_dynamodb_table.challenge_participants.name
       PARTY_ROOMS_TABLE                       = aws_dynamodb_table.party_rooms.name
       PARTY_PARTICIPANTS_TABLE                = aws_dynamodb_table.party_participants.name
+      MORAL_TWIN_INDEX_TABLE                  = aws_dynamodb_table.moral_twin_index.name
       DAILY_MORAL_CRIME_VOTES_TABLE           = aws_dynamodb_table.daily_moral_crime_votes.name
       OPS_ERROR_ALERTS_TABLE                  = aws_dynamodb_table.ops_error_alerts.name
       GROQ_API_KEY_SSM_NAME                   = aws_ssm_parameter.groq_api_key.name
@@ -1043,6 +1150,244 @@ resource "aws_lambda_permission" "retention_sweep" {
   source_arn    = aws_cloudwatch_event_rule.retention_sweep.arn
 }
 
+# Daily population archetype census next to the retention sweep: scans the
+# moral profiles table in parallel segments and writes one census row to the
+# dilemmas table, which profile reads and /analyze-results turn into "N% of
+# players share your archetype" and per-dimension percentiles. Read-only on
+# profiles.
+resource "aws_iam_role" "archetype_census_role" {
+  name = "${var.stack_name}-archetype-census-role"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect    = "Allow"
+      Principal = { Service = "lambda.amazonaws.com" }
+      Action    = "sts:AssumeRole"
+    }]
+  })
+
+  tags = {
+    Name        = "Moral Torture Machine Archetype Census Role"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_iam_role_policy" "archetype_census_permissions" {
+  name = "archetype-census"
+  role = aws_iam_role.archetype_census_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["dynamodb:Scan"]
+        Resource = [aws_dynamodb_table.moral_profiles.arn]
+      },
+      {
+        Effect   = "Allow"
+        Action   = ["dynamodb:PutItem"]
+        Resource = [aws_dynamodb_table.dilemmas.arn]
+      },
+      {
+        # Reconciling the moral twin index against the profile scan.
+        Effect = "Allow"
+        Action = [
+          "dynamodb:Scan",
+          "dynamodb:BatchWriteItem"
+        ]
+        Resource = [aws_dynamodb_table.moral_twin_index.arn]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "logs:CreateLogStream",
+          "logs:PutLogEvents"
+        ]
+        Resource = ["${aws_cloudwatch_log_group.archetype_census_logs.arn}:*"]
+      }
+    ]
+  })
+}
+
+resource "aws_cloudwatch_log_group" "archetype_census_logs" {
+  name              = "/aws/lambda/${var.stack_name}-archetype-census"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "Moral Torture Machine Archetype Census Logs"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_lambda_function" "archetype_census" {
+  function_name    = "${var.stack_name}-archetype-census"
+  filename         = "${path.module}/../lambda_function.zip"
+  source_code_hash = filebase64sha256("${path.module}/../lambda_function.zip")
+  handler          = "backend_fastapi.archetype_census_handler"
+  runtime          = "python3.11"
+  role             = aws_iam_role.archetype_census_role.arn
+  timeout          = 300
+  memory_size      = 512
+
+  environment {
+    variables = {
+      DYNAMODB_TABLE                 = aws_dynamodb_table.dilemmas.name
+      MORAL_PROFILES_TABLE           = aws_dynamodb_table.moral_profiles.name
+      MORAL_TWIN_INDEX_TABLE         = aws_dynamodb_table.moral_twin_index.name
+      ARCHETYPE_CENSUS_SCAN_SEGMENTS = tostring(var.archetype_census_scan_segments)
+      ARCHETYPES_SOURCE              = var.archetypes_source
+    }
+  }
+
+  depends_on = [
+    aws_iam_role_policy.archetype_census_permissions,
+    aws_cloudwatch_log_group.archetype_census_logs,
+  ]
+
+  tags = {
+    Name        = "Moral Torture Machine Archetype Census"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "archetype_census" {
+  name                = "${var.stack_name}-archetype-census"
+  description         = "Recount moral profiles per archetype and per dimension average for the population census once per day"
+  schedule_expression = "rate(1 day)"
+}
+
+resource "aws_cloudwatch_event_target" "archetype_census" {
+  rule      = aws_cloudwatch_event_rule.archetype_census.name
+  target_id = "archetype-census"
+  arn       = aws_lambda_function.archetype_census.arn
+}
+
+resource "aws_lambda_permission" "archetype_census" {
+  statement_id  = "allow-archetype-census"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.archetype_census.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.archetype_census.arn
+}
+
+# Sharded vote counters (VOTE_COUNTER_SHARDS > 1) spread /vote increments
+# over per-dilemma shard rows; this worker periodically folds them back into
+# the dilemma rows and rewrites the per-language vote split index rows
+# (/dilemmas/splits, /dilemmas/most-divisive). It only ever touches the
+# dilemmas table.
+resource "aws_iam_role" "vote_counter_compaction_role" {
+  name = "${var.stack_name}-vote-counter-compaction-role"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect    = "Allow"
+      Principal = { Service = "lambda.amazonaws.com" }
+      Action    = "sts:AssumeRole"
+    }]
+  })
+
+  tags = {
+    Name        = "Moral Torture Machine Vote Counter Compaction Role"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_iam_role_policy" "vote_counter_compaction_permissions" {
+  name = "vote-counter-compaction"
+  role = aws_iam_role.vote_counter_compaction_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:Scan",
+          "dynamodb:PutItem",
+          "dynamodb:UpdateItem",
+          "dynamodb:TransactWriteItems"
+        ]
+        Resource = [aws_dynamodb_table.dilemmas.arn]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "logs:CreateLogStream",
+          "logs:PutLogEvents"
+        ]
+        Resource = ["${aws_cloudwatch_log_group.vote_counter_compaction_logs.arn}:*"]
+      }
+    ]
+  })
+}
+
+resource "aws_cloudwatch_log_group" "vote_counter_compaction_logs" {
+  name              = "/aws/lambda/${var.stack_name}-vote-counter-compaction"
+  retention_in_days = var.log_retention_days
+
+  tags = {
+    Name        = "Moral Torture Machine Vote Counter Compaction Logs"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_lambda_function" "vote_counter_compaction" {
+  function_name    = "${var.stack_name}-vote-counter-compaction"
+  filename         = "${path.module}/../lambda_function.zip"
+  source_code_hash = filebase64sha256("${path.module}/../lambda_function.zip")
+  handler          = "backend_fastapi.vote_counter_compaction_handler"
+  runtime          = "python3.11"
+  role             = aws_iam_role.vote_counter_compaction_role.arn
+  timeout          = 60
+  memory_size      = 256
+
+  environment {
+    variables = {
+      DYNAMODB_TABLE      = aws_dynamodb_table.dilemmas.name
+      VOTE_COUNTER_SHARDS = tostring(var.vote_counter_shards)
+    }
+  }
+
+  depends_on = [
+    aws_iam_role_policy.vote_counter_compaction_permissions,
+    aws_cloudwatch_log_group.vote_counter_compaction_logs,
+  ]
+
+  tags = {
+    Name        = "Moral Torture Machine Vote Counter Compaction"
+    Environment = var.environment
+    ManagedBy   = "Terraform"
+  }
+}
+
+resource "aws_cloudwatch_event_rule" "vote_counter_compaction" {
+  name                = "${var.stack_name}-vote-counter-compaction"
+  description         = "Fold sharded dilemma vote counters back into their dilemma rows and rebuild the vote split indexes"
+  schedule_expression = var.vote_counter_compaction_schedule
+}
+
+resource "aws_cloudwatch_event_target" "vote_counter_compaction" {
+  rule      = aws_cloudwatch_event_rule.vote_counter_compaction.name
+  target_id = "vote-counter-compaction"
+  arn       = aws_lambda_function.vote_counter_compaction.arn
+}
+
+resource "aws_lambda_permission" "vote_counter_compaction" {
+  statement_id  = "allow-vote-counter-compaction"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.vote_counter_compaction.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.vote_counter_compaction.arn
+}
+
 # API Gateway HTTP API
 resource "aws_apigatewayv2_api" "api" {
   name          = "${var.stack_name}-api"
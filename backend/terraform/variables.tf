@@ -165,6 +165,128 @@ variable "abuse_party_room_poll_requests_per_minute" {
   }
 }
 
+variable "dilemma_catalog_ttl_seconds" {
+  description = "Seconds a warm Lambda container serves its in-memory dilemma catalog before re-checking the catalog manifest row (and rescanning only if its version changed)"
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = var.dilemma_catalog_ttl_seconds > 0
+    error_message = "The dilemma catalog TTL must be positive."
+  }
+}
+
+variable "dilemma_catalog_scan_segments" {
+  description = "Parallel Segment/TotalSegments scan workers used when a Lambda container (re)loads a language's dilemma catalog (capped at 16)"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.dilemma_catalog_scan_segments >= 1 && var.dilemma_catalog_scan_segments <= 16
+    error_message = "The dilemma catalog scan must use between 1 and 16 segments."
+  }
+}
+
+variable "archetype_census_scan_segments" {
+  description = "Parallel Segment/TotalSegments scan workers the daily archetype census uses over the moral profiles table (capped at 16)"
+  type        = number
+  default     = 4
+
+  validation {
+    condition     = var.archetype_census_scan_segments >= 1 && var.archetype_census_scan_segments <= 16
+    error_message = "The archetype census scan must use between 1 and 16 segments."
+  }
+}
+
+variable "vote_counter_shards" {
+  description = "Shard rows /vote spreads each dilemma's yes/no increments over (1 keeps a single counter row per dilemma, capped at 32)"
+  type        = number
+  default     = 1
+
+  validation {
+    condition     = var.vote_counter_shards >= 1 && var.vote_counter_shards <= 32
+    error_message = "Vote counters must use between 1 and 32 shards."
+  }
+}
+
+variable "vote_counter_rollup_ttl_seconds" {
+  description = "Seconds a warm Lambda container reuses a dilemma's merged sharded vote counters before reading its shard rows again"
+  type        = number
+  default     = 5
+
+  validation {
+    condition     = var.vote_counter_rollup_ttl_seconds > 0
+    error_message = "The vote counter rollup TTL must be positive."
+  }
+}
+
+variable "vote_write_behind_enabled" {
+  description = "Buffer /vote increments per dilemma inside each Lambda container and write them in batches (votes pending in a container that is reclaimed before its next flush are lost)"
+  type        = bool
+  default     = false
+}
+
+variable "vote_write_behind_max_votes" {
+  description = "Pending buffered votes per Lambda container that trigger a flush (upper bound of the per-container loss window)"
+  type        = number
+  default     = 50
+
+  validation {
+    condition     = var.vote_write_behind_max_votes > 0
+    error_message = "The vote write-behind vote threshold must be positive."
+  }
+}
+
+variable "vote_write_behind_max_age_seconds" {
+  description = "Age in seconds of the oldest buffered vote that triggers a flush on the container's next request"
+  type        = number
+  default     = 2
+
+  validation {
+    condition     = var.vote_write_behind_max_age_seconds > 0
+    error_message = "The vote write-behind age threshold must be positive."
+  }
+}
+
+variable "archetype_memo_max_entries" {
+  description = "Per-container LRU bound on memoized archetype assignments (hit/miss counts are reported by /health)"
+  type        = number
+  default     = 4096
+
+  validation {
+    condition     = var.archetype_memo_max_entries > 0
+    error_message = "The archetype memo size must be positive."
+  }
+}
+
+variable "archetypes_source" {
+  description = "Optional s3://bucket/key or local path of a newer archetypes.json that warm API containers hot-reload (empty keeps the bundled file)"
+  type        = string
+  default     = ""
+
+  validation {
+    condition     = var.archetypes_source == "" || startswith(var.archetypes_source, "s3://") || startswith(var.archetypes_source, "/")
+    error_message = "The archetypes source must be empty, an s3:// URI, or an absolute path."
+  }
+}
+
+variable "archetypes_reload_ttl_seconds" {
+  description = "Seconds between a container's checks of archetypes_source for a newer archetypes version"
+  type        = number
+  default     = 300
+
+  validation {
+    condition     = var.archetypes_reload_ttl_seconds > 0
+    error_message = "The archetypes reload interval must be positive."
+  }
+}
+
+variable "vote_counter_compaction_schedule" {
+  description = "EventBridge schedule expression for folding sharded vote counters back into their dilemma rows and rebuilding the vote split indexes"
+  type        = string
+  default     = "rate(15 minutes)"
+}
+
 variable "ops_error_notifications_enabled" {
   description = "TASK-104: whether every 4xx/5xx response emails the ops_alerts SNS topic"
   type        = bool
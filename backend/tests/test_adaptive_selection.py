@@ -0,0 +1,160 @@
+import asyncio
+import itertools
+import json
+import os
+import random
+import unittest
+from unittest.mock import Mock, patch
+
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    AdaptiveNextDilemmaRequest,
+    get_adaptive_next_dilemma,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.adaptive_selection import build_discrimination_index, next_adaptive_step  # noqa: E402
+from backend.src.archetype_engine import (  # noqa: E402
+    archetype_centroids,
+    assign_archetype,
+    compute_dimension_averages,
+    get_archetype_dimensions,
+)
+from backend.src.dilemma_catalog import build_catalog_snapshot, catalog_items_for_language  # noqa: E402
+
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def request_with_headers(headers, path="/dilemmas/adaptive-next"):
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+def _snapshot():
+    with open(os.path.join(_DATA_DIR, "dilemmas_en.json"), encoding="utf-8") as f:
+        return build_catalog_snapshot("en", catalog_items_for_language("en", json.load(f)))
+
+
+def _chosen_values(item, choice):
+    prefix = "firstAnswer" if choice == "first" else "secondAnswer"
+    return {dimension: float(item[f"{prefix}{dimension}"]) for dimension in get_archetype_dimensions()}
+
+
+class DiscriminationIndexTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.snapshot = _snapshot()
+        cls.index = build_discrimination_index(cls.snapshot, archetype_centroids(), get_archetype_dimensions())
+
+    def _answer(self, base_id, choice):
+        return base_id, _chosen_values(self.snapshot["itemsById"][f"{base_id}-en"], choice)
+
+    def test_one_column_per_archetype_pair_and_one_row_per_dilemma(self):
+        archetypes = len(archetype_centroids())
+        self.assertEqual(set(self.index["rows"]), set(self.snapshot["baseIds"]))
+        self.assertEqual(len(self.index["pairColumns"]), archetypes * (archetypes - 1) // 2)
+
+    def test_next_question_best_separates_the_leading_candidates(self):
+        step = next_adaptive_step(self.index, [], 10, random.Random(1), pick_spread=1)
+
+        ids = list(self.index["archetypeIds"])
+        candidates = sorted(ids.index(archetype_id) for archetype_id in step["candidates"])
+        columns = [self.index["pairColumns"][pair] for pair in itertools.combinations(candidates, 2)]
+        scores = {base_id: sum(row[column] for column in columns) for base_id, row in self.index["rows"].items()}
+        self.assertEqual(scores[step["nextBaseId"]], max(scores.values()))
+        self.assertFalse(step["settled"])
+
+    def test_leader_is_what_analyze_results_would_assign(self):
+        rng = random.Random(5)
+        answers = [self._answer(base_id, rng.choice(["first", "second"])) for base_id in self.snapshot["baseIds"][:6]]
+
+        step = next_adaptive_step(self.index, answers, 10, rng)
+
+        expected = assign_archetype(compute_dimension_averages([values for _, values in answers]))
+        self.assertEqual(step["leader"], expected["archetypeId"])
+
+    def test_a_settled_result_survives_every_remaining_answer(self):
+        # Whenever the walk reports settled, no single further answer (nor
+        # answering the rest one way) may change the assigned archetype.
+        settled_walks = 0
+        for seed in range(40):
+            rng = random.Random(seed)
+            answers = []
+            step = next_adaptive_step(self.index, answers, 12, rng)
+            while step["nextBaseId"] is not None:
+                answers.append(self._answer(step["nextBaseId"], rng.choice(["first", "second"])))
+                step = next_adaptive_step(self.index, answers, 12, rng)
+            if not step["settled"] or len(answers) == 12:
+                continue
+            settled_walks += 1
+            answered = {base_id for base_id, _ in answers}
+            unanswered = [base_id for base_id in self.snapshot["baseIds"] if base_id not in answered]
+            for base_id in unanswered:
+                for choice in ("first", "second"):
+                    extended = [values for _, values in answers] + [self._answer(base_id, choice)[1]]
+                    self.assertEqual(assign_archetype(compute_dimension_averages(extended))["archetypeId"], step["leader"])
+            for choice in ("first", "second"):
+                extended = [values for _, values in answers]
+                extended += [self._answer(base_id, choice)[1] for base_id in unanswered[:12 - len(answers)]]
+                self.assertEqual(assign_archetype(compute_dimension_averages(extended))["archetypeId"], step["leader"])
+        self.assertGreater(settled_walks, 0)
+
+    def test_budget_and_answered_dilemmas_end_the_walk(self):
+        answers = [self._answer(base_id, "first") for base_id in self.snapshot["baseIds"][:3]]
+
+        self.assertIsNone(next_adaptive_step(self.index, answers, 3)["nextBaseId"])
+        self.assertNotIn(next_adaptive_step(self.index, answers, 10)["nextBaseId"], self.snapshot["baseIds"][:3])
+
+
+class AdaptiveNextEndpointTests(unittest.TestCase):
+    def setUp(self):
+        snapshot = _snapshot()
+        self.item = snapshot["itemsById"][snapshot["ids"][0]]
+        patches = [
+            patch.object(backend_module, "get_dilemma_catalog", Mock(return_value=snapshot)),
+            patch.object(backend_module, "_adaptive_index_cache", {}),
+            patch.object(backend_module, "_with_live_vote_counts", side_effect=lambda items: items),
+            patch.object(backend_module, "track_analytics_event", Mock()),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def test_returns_the_next_dilemma_and_builds_the_index_once(self):
+        body = AdaptiveNextDilemmaRequest(answers=[
+            {"dilemmaBaseId": self.item["baseId"], "chosenValues": _chosen_values(self.item, "first")},
+        ])
+        first = asyncio.run(get_adaptive_next_dilemma(body, request_with_headers({})))
+        with patch.object(backend_module, "build_discrimination_index") as rebuild:
+            asyncio.run(get_adaptive_next_dilemma(body, request_with_headers({})))
+
+        rebuild.assert_not_called()
+        self.assertEqual(first["answered"], 1)
+        self.assertFalse(first["settled"])
+        self.assertNotEqual(first["dilemma"]["baseId"], self.item["baseId"])
+        self.assertEqual(first["dilemma"]["yesCount"], 0)
+        self.assertEqual(backend_module.track_analytics_event.call_args.kwargs["action_data"]["source"], "adaptive")
+
+    def test_no_dilemma_once_the_budget_is_spent(self):
+        body = AdaptiveNextDilemmaRequest(maxQuestions=1, answers=[
+            {"dilemmaBaseId": self.item["baseId"], "chosenValues": _chosen_values(self.item, "second")},
+        ])
+
+        result = asyncio.run(get_adaptive_next_dilemma(body, request_with_headers({})))
+
+        self.assertIsNone(result["dilemma"])
+        backend_module.track_analytics_event.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
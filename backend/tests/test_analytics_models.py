@@ -339,6 +339,31 @@ class AnalyticsOverviewTests(unittest.TestCase):
         self.assertNotIn("Mozilla", str(abuse))
 
 
+    def test_batched_prefetch_counts_every_dilemma_it_served(self):
+        now_ms = 1785369600000
+        rows = [
+            {
+                "sessionId": "prefetch-session",
+                "timestamp": now_ms - (10 * 60 * 1000) + (index * 60000),
+                "actionType": "dilemma_fetched",
+                "actionData": {
+                    "dilemma_ids": [f"d{index}-{i}-en" for i in range(10)],
+                    "count": 10,
+                    "batch": True,
+                },
+                "hashedIp": "network-value",
+                "userAgent": "Mozilla/5.0 Mobile Safari",
+            }
+            for index in range(6)
+        ]
+
+        overview = build_analytics_overview(rows, [], days=7, now_ms=now_ms)
+        anomaly = overview["abuseMonitoring"]["anomalies"][0]
+
+        self.assertEqual(anomaly["dilemmasFetched"], 60)
+        self.assertIn("rapid_replay_without_results", anomaly["reasons"])
+
+
 class AbuseGuardTests(unittest.TestCase):
     def test_sliding_window_rejects_then_recovers(self):
         key = f"test:{uuid.uuid4()}"
@@ -363,7 +388,14 @@ class AbuseGuardTests(unittest.TestCase):
         # TASK-67: profile/challenge reads and batch dilemma lookup are
         # unauthenticated and abuse-prone, so they get a dedicated bucket
         # rather than only the broad "global" one.
-        for path in ("/profiles/abc123", "/challenges/abc123", "/challenges/abc123/compare", "/dilemmas/by-ids"):
+        for path in (
+            "/profiles/abc123",
+            "/challenges/abc123",
+            "/challenges/abc123/compare",
+            "/dilemmas/by-ids",
+            "/archetypes",
+            "/daily-moral-crime/dilemma",
+        ):
             rules = _rate_limit_rules_for_request("GET", path)
             self.assertEqual([name for name, _ in rules], ["global", "public_read"])
 
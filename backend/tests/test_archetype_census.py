@@ -0,0 +1,214 @@
+import asyncio
+import json
+import os
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    AnalyzeResultsRequest,
+    _rebuild_archetype_census,
+    analyze_results,
+    get_profile,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.archetype_census import (  # noqa: E402
+    ARCHETYPE_CENSUS_ID,
+    archetype_share_pct,
+    build_archetype_census,
+    dimension_percentiles,
+    tally_profiles,
+)
+from backend.src.archetype_engine import assign_archetype, get_archetypes_version  # noqa: E402
+
+
+SIX_DIMENSIONS = ["Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty"]
+
+
+def request_with_headers(headers, path="/profiles/pub-1"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+def profile_row(value, archetypes_version="old", archetype_id="stale-id", expiration_time=None):
+    row = {
+        "dimensionAverages": json.dumps({d: value for d in SIX_DIMENSIONS}),
+        "archetypesVersion": archetypes_version,
+        "archetypeId": archetype_id,
+    }
+    if expiration_time is not None:
+        row["expirationTime"] = expiration_time
+    return row
+
+
+def archetype_id_for(value):
+    return assign_archetype({d: value for d in SIX_DIMENSIONS})["archetypeId"]
+
+
+class CensusCountTests(unittest.TestCase):
+    def test_old_versions_are_re_matched_and_current_ids_are_trusted(self):
+        version = get_archetypes_version()
+        profiles = [
+            profile_row(0.9),
+            profile_row(0.9, archetypes_version=""),
+            profile_row(0.1, archetypes_version=version, archetype_id="kept-as-stored"),
+            profile_row(0.5, expiration_time=100),
+            {"dimensionAverages": "not json", "archetypesVersion": "old"},
+        ]
+
+        counts, stored_versions, dimension_values = tally_profiles(profiles, version, now_seconds=100, batch_size=1)
+
+        self.assertEqual(counts, {archetype_id_for(0.9): 2, "kept-as-stored": 1})
+        self.assertEqual(stored_versions, {"old": 1, "": 1, str(version): 1})
+        self.assertEqual(dimension_values["Empathy"], {0.9: 2, 0.1: 1})
+
+    def test_share_needs_a_matching_version_and_enough_profiles(self):
+        census = build_archetype_census({"a": 30, "b": 69, "c": 1}, {"v1": 100}, "v1", built_at=5)
+
+        self.assertEqual(census["total"], 100)
+        self.assertEqual(archetype_share_pct(census, "a", "v1"), 30)
+        self.assertEqual(archetype_share_pct(census, "c", "v1", min_profiles=1), 1)
+        self.assertIsNone(archetype_share_pct(census, "missing", "v1"))
+        self.assertIsNone(archetype_share_pct(census, "a", "v2"))
+        self.assertIsNone(archetype_share_pct(census, "a", "v1", min_profiles=101))
+
+    def test_percentiles_count_strictly_lower_averages(self):
+        values = {0.2: 10, 0.5: 20, 0.8: 10}
+        census = build_archetype_census({}, {}, "v1", built_at=5, dimension_values={"Empathy": values})
+
+        self.assertEqual(census["dimensions"]["Empathy"], {"values": [0.2, 0.5, 0.8], "cumulative": [10, 30, 40]})
+        self.assertEqual(
+            dimension_percentiles(census, {"Empathy": 0.5, "Honesty": 0.5}),
+            {"Empathy": 25, "Honesty": None},
+        )
+        self.assertEqual(dimension_percentiles(census, {"Empathy": 0.1})["Empathy"], 0)
+        self.assertEqual(dimension_percentiles(census, {"Empathy": 0.81})["Empathy"], 100)
+        self.assertEqual(dimension_percentiles(census, {"Empathy": 0.6})["Empathy"], 75)
+        self.assertIsNone(dimension_percentiles(census, {"Empathy": 0.5}, min_profiles=41)["Empathy"])
+
+
+class CensusRebuildTests(unittest.TestCase):
+    def test_single_segment_rebuild_writes_one_census_row(self):
+        profiles_table = Mock()
+        profiles_table.scan.side_effect = [
+            {"Items": [profile_row(0.9), profile_row(0.9)], "LastEvaluatedKey": {"publicId": "p2"}},
+            {"Items": [profile_row(0.2, expiration_time=Decimal(50))]},
+        ]
+        dilemmas_table = Mock()
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_reconcile_twin_index", return_value=0), \
+                patch.object(backend_module, "ARCHETYPE_CENSUS_SCAN_SEGMENTS", 1):
+            result = _rebuild_archetype_census(100)
+
+        self.assertEqual(result["pages"], 2)
+        self.assertEqual(result["profiles"], 2)
+        item = dilemmas_table.put_item.call_args.kwargs["Item"]
+        self.assertEqual(item["_id"], ARCHETYPE_CENSUS_ID)
+        census = json.loads(item["census"])
+        self.assertEqual(census["counts"], {archetype_id_for(0.9): 2})
+        self.assertEqual(census["archetypesVersion"], get_archetypes_version())
+
+    def test_parallel_segments_are_tallied_together(self):
+        profiles_table = Mock()
+        profiles_table.name = "profiles"
+        low_level = {
+            "dimensionAverages": {"S": json.dumps({d: 0.9 for d in SIX_DIMENSIONS})},
+            "archetypesVersion": {"S": "old"},
+        }
+        profiles_table.meta.client.scan.side_effect = lambda **kwargs: {"Items": [low_level] * (kwargs["Segment"] + 1)}
+        dilemmas_table = Mock()
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_reconcile_twin_index", return_value=0), \
+                patch.object(backend_module, "ARCHETYPE_CENSUS_SCAN_SEGMENTS", 3):
+            result = _rebuild_archetype_census(100)
+
+        self.assertEqual(result["segments"], 3)
+        census = json.loads(dilemmas_table.put_item.call_args.kwargs["Item"]["census"])
+        self.assertEqual(census["counts"], {archetype_id_for(0.9): 6})
+        self.assertEqual(census["storedVersions"], {"old": 6})
+        self.assertEqual(census["dimensions"]["Honesty"], {"values": [0.9], "cumulative": [6]})
+
+
+class ProfileShareTests(unittest.TestCase):
+    def test_profile_reports_its_archetype_share_from_one_cached_read(self):
+        archetype_id = archetype_id_for(0.8)
+        census = build_archetype_census(
+            {archetype_id: 25, "other": 75}, {}, get_archetypes_version(), built_at=1,
+            dimension_values={"Empathy": {0.5: 60, 0.8: 30, 0.9: 10}},
+        )
+        dilemmas_table = Mock()
+        dilemmas_table.get_item.return_value = {"Item": {"_id": ARCHETYPE_CENSUS_ID, "census": json.dumps(census)}}
+        profiles_table = Mock()
+        profiles_table.get_item.return_value = {"Item": {
+            "publicId": "pub-1",
+            "dimensionAverages": json.dumps({d: 0.8 for d in SIX_DIMENSIONS}),
+            "createdAt": 1000,
+        }}
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_archetype_census_cache", {}):
+            first = asyncio.run(get_profile("pub-1", request_with_headers({}), language="en"))
+            second = asyncio.run(get_profile("pub-1", request_with_headers({}), language="it"))
+
+        self.assertEqual(first["archetypeSharePct"], 25)
+        self.assertEqual(second["archetypeSharePct"], 25)
+        self.assertEqual(first["dimensionPercentiles"]["Empathy"], 60)
+        self.assertIsNone(first["dimensionPercentiles"]["Honesty"])
+        dilemmas_table.get_item.assert_called_once_with(Key={"_id": ARCHETYPE_CENSUS_ID})
+
+    def test_no_share_before_the_first_census(self):
+        dilemmas_table = Mock()
+        dilemmas_table.get_item.return_value = {}
+        profiles_table = Mock()
+        profiles_table.get_item.return_value = {"Item": {
+            "publicId": "pub-1",
+            "dimensionAverages": json.dumps({d: 0.8 for d in SIX_DIMENSIONS}),
+            "createdAt": 1000,
+        }}
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_archetype_census_cache", {}):
+            result = asyncio.run(get_profile("pub-1", request_with_headers({}), language="en"))
+
+        self.assertIsNone(result["archetypeSharePct"])
+
+
+class AnalyzeResultsPercentileTests(unittest.TestCase):
+    def setUp(self):
+        backend_module._api_key_cache = "test-groq-key"
+
+    def tearDown(self):
+        backend_module._api_key_cache = None
+
+    def test_results_carry_percentiles_from_the_cached_census(self):
+        census = build_archetype_census({}, {}, get_archetypes_version(), built_at=1, dimension_values={
+            d: {0.2: 30, 0.9: 10} for d in SIX_DIMENSIONS
+        })
+        request = Request({"type": "http", "method": "POST", "path": "/analyze-results", "headers": []})
+        with patch.object(backend_module, "_archetype_census_cache", {"census": {"value": census, "checkedAt": 1e18}}), \
+                patch.object(backend_module, "call_groq_api_with_fallback", return_value={
+                    "choices": [{"message": {"content": "some analysis"}}],
+                }), \
+                patch.object(backend_module, "track_analytics_event"):
+            result = asyncio.run(analyze_results(
+                AnalyzeResultsRequest(answers=[{d: 0.5 for d in SIX_DIMENSIONS}]), request, language="en",
+            ))
+
+        self.assertEqual(result["dimensionPercentiles"], {d: 75 for d in SIX_DIMENSIONS})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,21 @@
 import json
 import os
+import random
 import unittest
 
+import numpy as np
+
 from backend.src.archetype_engine import (
+    archetype_catalog_copy,
+    archetype_memo_stats,
     assign_archetype,
+    assign_archetype_cached,
+    assign_archetypes,
+    assign_archetypes_batch,
+    averages_matrix,
     compute_dimension_averages,
     get_archetypes_version,
+    set_archetype_memo_size,
 )
 
 _ARCHETYPES_JSON = os.path.join(
@@ -91,6 +101,17 @@ class ArchetypeEngineTests(unittest.TestCase):
         result = assign_archetype(centroid, language="fr")
         self.assertEqual(result["name"], "The Moral Idealist")
 
+    def test_catalog_copy_matches_what_assignment_returns(self):
+        copy_by_id = {entry["archetypeId"]: entry for entry in archetype_catalog_copy("it")}
+        self.assertEqual(list(copy_by_id), [a["id"] for a in self.reference["archetypes"]])
+        for archetype_id, archetype in self.archetypes_by_id.items():
+            assigned = assign_archetype(archetype["centroid"], language="it")
+            expected = {
+                key: value for key, value in assigned.items()
+                if key not in ("archetypesVersion", "distance")
+            }
+            self.assertEqual(copy_by_id[archetype_id], expected)
+
     def test_compute_dimension_averages_matches_manual_mean(self):
         answers = [
             {"Empathy": 1.0, "Integrity": 0.5},
@@ -103,5 +124,80 @@ class ArchetypeEngineTests(unittest.TestCase):
         self.assertEqual(compute_dimension_averages([]), {})
 
 
+class BatchArchetypeAssignmentTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        reference = _load_reference_data()
+        cls.dimensions = reference["dimensions"]
+        centroids = [a["centroid"] for a in reference["archetypes"]]
+        rng = random.Random(3)
+        cls.averages_list = (
+            [{dim: round(rng.uniform(0, 1), 2) for dim in cls.dimensions} for _ in range(500)]
+            + centroids
+            # Every pairwise midpoint, which includes the genuine ties.
+            + [
+                {dim: (a[dim] + b[dim]) / 2 for dim in a}
+                for i, a in enumerate(centroids) for b in centroids[i + 1:]
+            ]
+            + [{}, {"Empathy": 0.9}]
+        )
+
+    def test_batch_matches_the_scalar_assignment_including_ties(self):
+        ids, distances = assign_archetypes_batch(averages_matrix(self.averages_list))
+
+        for averages, archetype_id, distance in zip(self.averages_list, ids, distances):
+            expected = assign_archetype(averages)
+            self.assertEqual(archetype_id, expected["archetypeId"])
+            self.assertEqual(round(float(distance), 4), expected["distance"])
+
+    def test_payloads_are_identical_to_assign_archetype(self):
+        self.assertEqual(
+            assign_archetypes(self.averages_list, language="it"),
+            [assign_archetype(averages, language="it") for averages in self.averages_list],
+        )
+        self.assertEqual(assign_archetypes([]), [])
+
+    def test_a_single_vector_is_accepted(self):
+        ids, distances = assign_archetypes_batch(np.array([0.5] * len(self.dimensions)))
+        self.assertEqual(len(ids), 1)
+        self.assertEqual(distances.shape, (1,))
+
+
+class ArchetypeMemoTests(unittest.TestCase):
+    def setUp(self):
+        set_archetype_memo_size(2)
+        self.addCleanup(set_archetype_memo_size, 4096)
+        self.averages = {"Empathy": 0.8, "Integrity": 0.3, "Responsibility": 0.55, "Justice": 0.4, "Altruism": 0.7, "Honesty": 0.25}
+
+    def test_grid_points_are_served_from_the_memo_as_a_shared_read_only_payload(self):
+        first = assign_archetype_cached(self.averages, language="it")
+        second = assign_archetype_cached(dict(self.averages), language="it")
+
+        self.assertIs(first, second)
+        self.assertEqual(archetype_memo_stats(), {"hits": 1, "misses": 1, "size": 1, "maxEntries": 2})
+        with self.assertRaises(TypeError):
+            first["name"] = "Changed"
+        with self.assertRaises(TypeError):
+            first["visual"]["emoji"] = "x"
+
+    def test_assign_archetype_returns_a_mutable_copy_of_the_same_result(self):
+        result = assign_archetype(self.averages)
+        result["visual"]["emoji"] = "x"
+
+        self.assertEqual(result["archetypeId"], assign_archetype_cached(self.averages)["archetypeId"])
+        self.assertNotEqual(assign_archetype(self.averages)["visual"]["emoji"], "x")
+        # Languages are separate entries; unknown languages share English's.
+        assign_archetype(self.averages, language="fr")
+        self.assertEqual(archetype_memo_stats()["size"], 1)
+
+    def test_off_grid_inputs_bypass_the_memo_and_the_bound_evicts(self):
+        assign_archetype_cached({**self.averages, "Empathy": 0.123456})
+        self.assertEqual(archetype_memo_stats()["size"], 0)
+
+        for value in (0.1, 0.2, 0.3):
+            assign_archetype_cached({**self.averages, "Empathy": value})
+        self.assertEqual(archetype_memo_stats()["size"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,198 @@
+import asyncio
+import copy
+import io
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, Mock, patch
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src import archetype_engine  # noqa: E402
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.archetype_engine import (  # noqa: E402
+    archetype_memo_stats,
+    assign_archetype,
+    assign_archetype_cached,
+    assign_archetypes_batch,
+    averages_matrix,
+    get_archetypes_version,
+    install_archetype_catalog,
+    validate_archetype_data,
+)
+
+_ARCHETYPES_JSON = os.path.join(os.path.dirname(__file__), "..", "data", "archetypes.json")
+
+
+def _reference_data():
+    with open(_ARCHETYPES_JSON, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _next_version(target_id):
+    """The bundled catalog one version up, with `target_id` moved onto the
+    neutral point so it wins for balanced averages."""
+    data = _reference_data()
+    data["version"] += 1
+    for archetype in data["archetypes"]:
+        if archetype["id"] == target_id:
+            archetype["centroid"] = {dim: 0.5 for dim in data["dimensions"]}
+            archetype["en"]["name"] = "Reloaded"
+    return data
+
+
+BALANCED = {dim: 0.5 for dim in _reference_data()["dimensions"]}
+
+
+class ArchetypeCatalogInstallTests(unittest.TestCase):
+    def setUp(self):
+        # Make sure the bundled catalog is compiled, then restore it after
+        # each test whatever the test installed.
+        get_archetypes_version()
+        current = patch.object(archetype_engine, "_catalog", archetype_engine._catalog)
+        current.start()
+        self.addCleanup(current.stop)
+        self.target = next(
+            archetype["id"] for archetype in _reference_data()["archetypes"]
+            if archetype["id"] != assign_archetype(BALANCED)["archetypeId"]
+        )
+
+    def test_a_newer_version_is_swapped_in_with_a_fresh_memo(self):
+        assign_archetype_cached(BALANCED)
+        self.assertEqual(archetype_memo_stats()["size"], 1)
+        old_version = get_archetypes_version()
+
+        self.assertTrue(install_archetype_catalog(_next_version(self.target)))
+
+        result = assign_archetype(BALANCED)
+        self.assertEqual(result["archetypeId"], self.target)
+        self.assertEqual(result["archetypesVersion"], old_version + 1)
+        self.assertEqual(result["name"], "Reloaded")
+        self.assertEqual(assign_archetypes_batch(averages_matrix([BALANCED]))[0], [self.target])
+        self.assertEqual(archetype_memo_stats()["size"], 1)
+        self.assertEqual(archetype_memo_stats()["misses"], 1)
+
+    def test_same_or_older_versions_are_ignored(self):
+        data = _next_version(self.target)
+        data["version"] = get_archetypes_version()
+
+        self.assertFalse(install_archetype_catalog(data))
+        self.assertNotEqual(assign_archetype(BALANCED)["archetypeId"], self.target)
+
+    def test_invalid_catalogs_are_rejected_and_the_current_one_kept(self):
+        version = get_archetypes_version()
+        broken = []
+        missing_centroid = _next_version(self.target)
+        del missing_centroid["archetypes"][0]["centroid"]["Honesty"]
+        broken.append(missing_centroid)
+        duplicate_id = _next_version(self.target)
+        duplicate_id["archetypes"].append(copy.deepcopy(duplicate_id["archetypes"][0]))
+        broken.append(duplicate_id)
+        no_copy = _next_version(self.target)
+        del no_copy["archetypes"][1]["it"]
+        broken.append(no_copy)
+        broken.append({**_next_version(self.target), "version": "3"})
+        broken.append([])
+
+        for data in broken:
+            with self.assertRaises(ValueError):
+                install_archetype_catalog(data)
+        self.assertEqual(get_archetypes_version(), version)
+        validate_archetype_data(_reference_data())
+
+
+class ArchetypeRefreshTests(unittest.TestCase):
+    def setUp(self):
+        get_archetypes_version()
+        patches = [
+            patch.object(archetype_engine, "_catalog", archetype_engine._catalog),
+            patch.object(backend_module, "_archetype_reload_state", {"checkedAt": 0.0, "fingerprint": None}),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+        self.version = get_archetypes_version()
+        self.target = next(
+            archetype["id"] for archetype in _reference_data()["archetypes"]
+            if archetype["id"] != assign_archetype(BALANCED)["archetypeId"]
+        )
+
+    def test_a_local_file_is_reloaded_once_per_ttl_and_only_when_it_changes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archetypes.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_next_version(self.target), f)
+            with patch.object(backend_module, "ARCHETYPES_SOURCE", path), \
+                    patch.object(backend_module, "install_archetype_catalog", wraps=install_archetype_catalog) as install:
+                self.assertTrue(backend_module.refresh_archetype_catalog(now=1000))
+                self.assertFalse(backend_module.refresh_archetype_catalog(now=1001))
+                self.assertFalse(backend_module.refresh_archetype_catalog(now=1000 + 10_000))
+
+        install.assert_called_once()
+        self.assertEqual(get_archetypes_version(), self.version + 1)
+        self.assertEqual(assign_archetype(BALANCED)["archetypeId"], self.target)
+
+    def test_s3_source_is_fetched_pinned_to_its_etag_and_bad_content_is_not_refetched(self):
+        s3 = Mock()
+        s3.head_object.return_value = {"ETag": '"abc"'}
+        s3.get_object.return_value = {"Body": io.BytesIO(b"{not json")}
+        with patch.object(backend_module, "ARCHETYPES_SOURCE", "s3://bucket/path/archetypes.json"), \
+                patch.object(backend_module, "s3_client", s3):
+            self.assertFalse(backend_module.refresh_archetype_catalog(now=1000))
+            self.assertFalse(backend_module.refresh_archetype_catalog(now=1000 + 10_000))
+
+        s3.get_object.assert_called_once_with(Bucket="bucket", Key="path/archetypes.json", IfMatch='"abc"')
+        self.assertEqual(s3.head_object.call_count, 2)
+        self.assertEqual(get_archetypes_version(), self.version)
+
+    def test_the_middleware_hands_a_due_check_to_the_background_worker(self):
+        executor = Mock()
+        call_next = AsyncMock(return_value="response")
+        with patch.object(backend_module, "ARCHETYPES_SOURCE", "s3://bucket/archetypes.json"), \
+                patch.object(backend_module, "_archetype_reload_executor", executor), \
+                patch.object(backend_module, "refresh_archetype_catalog") as refresh:
+            response = asyncio.run(backend_module.refresh_archetypes_if_due(Mock(), call_next))
+            backend_module._archetype_reload_state["checkedAt"] = backend_module.time.time()
+            asyncio.run(backend_module.refresh_archetypes_if_due(Mock(), call_next))
+
+        self.assertEqual(response, "response")
+        refresh.assert_not_called()
+        executor.submit.assert_called_once_with(refresh)
+
+    def test_the_census_job_counts_under_the_reloaded_version(self):
+        profiles_table = Mock()
+        profiles_table.scan.return_value = {"Items": [{
+            "publicId": "pub-1",
+            "dimensionAverages": json.dumps(BALANCED),
+            "archetypesVersion": self.version,
+            "archetypeId": assign_archetype(BALANCED)["archetypeId"],
+        }]}
+        dilemmas_table = Mock()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "archetypes.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(_next_version(self.target), f)
+            with patch.object(backend_module, "ARCHETYPES_SOURCE", path), \
+                    patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                    patch.object(backend_module, "table", dilemmas_table), \
+                    patch.object(backend_module, "_reconcile_twin_index", return_value=0), \
+                    patch.object(backend_module, "ARCHETYPE_CENSUS_SCAN_SEGMENTS", 1):
+                result = backend_module.archetype_census_handler({}, None)
+
+        census = json.loads(dilemmas_table.put_item.call_args.kwargs["Item"]["census"])
+        self.assertEqual(result["archetypesVersion"], self.version + 1)
+        self.assertEqual(census["archetypesVersion"], self.version + 1)
+        self.assertEqual(census["counts"], {self.target: 1})
+
+    def test_nothing_happens_without_a_source(self):
+        with patch.object(backend_module, "ARCHETYPES_SOURCE", ""):
+            self.assertFalse(backend_module.refresh_archetype_catalog(now=1000))
+        self.assertEqual(backend_module._archetype_reload_state["checkedAt"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
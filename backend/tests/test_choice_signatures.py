@@ -0,0 +1,60 @@
+import json
+import os
+import unittest
+
+from backend.src.archetype_engine import assign_archetype, compute_dimension_averages, get_archetype_dimensions
+from backend.src.choice_signatures import (
+    CHOICE_SIGNATURE_MAX_CHOICES,
+    build_choice_signature_table,
+    choice_signature,
+    choice_values,
+    lookup_choice_signature,
+    signature_rounds,
+    stored_choice_values,
+)
+
+_DILEMMAS_JSON = os.path.join(os.path.dirname(__file__), "..", "data", "dilemmas_en.json")
+
+
+class ChoiceSignatureTableTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open(_DILEMMAS_JSON, "r", encoding="utf-8") as f:
+            cls.items = json.load(f)
+        cls.dimensions = get_archetype_dimensions()
+
+    def test_every_signature_matches_averaging_the_answers(self):
+        rounds = signature_rounds(self.items[:8], self.dimensions)
+        table = build_choice_signature_table(rounds)
+
+        self.assertEqual(len(table["archetypeIds"]), 256)
+        for signature in range(256):
+            answers = [first if signature >> r & 1 else second for r, (first, second) in enumerate(rounds)]
+            averages = compute_dimension_averages(answers)
+            expected = assign_archetype(averages)
+            looked_up_averages, archetype_id, distance = lookup_choice_signature(table, signature)
+            self.assertEqual(looked_up_averages, averages)
+            self.assertEqual(archetype_id, expected["archetypeId"])
+            self.assertEqual(round(distance, 4), expected["distance"])
+
+    def test_votes_map_to_their_signature_only_when_they_match_the_catalog(self):
+        items = self.items[:3]
+        table = build_choice_signature_table(signature_rounds(items, self.dimensions))
+
+        def vote(item, choice):
+            return {"choice": choice, "chosenValues": stored_choice_values(choice_values(item, choice, self.dimensions))}
+
+        votes = {"0": vote(items[0], "first"), "1": vote(items[1], "second"), "2": vote(items[2], "first")}
+        self.assertEqual(choice_signature(table, votes), 0b101)
+        self.assertIsNone(choice_signature(table, {"0": votes["0"], "1": votes["1"]}))
+        self.assertIsNone(choice_signature(table, {**votes, "2": {"choice": "first", "chosenValues": '{"Empathy":0.5}'}}))
+        self.assertIsNone(choice_signature(table, {**votes, "2": {**votes["2"], "choice": "second"}}))
+
+    def test_long_decks_are_rejected(self):
+        rounds = signature_rounds(self.items[:CHOICE_SIGNATURE_MAX_CHOICES + 1], self.dimensions)
+        with self.assertRaises(ValueError):
+            build_choice_signature_table(rounds)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,13 @@
+import random
 import unittest
 
 from backend.src.compatibility_engine import (
     COMPATIBILITY_VERSION,
     DIMENSIONS,
+    compatibility_vectors,
     compute_compatibility,
+    compute_compatibility_many,
+    overall_agreement_matrix,
 )
 
 
@@ -62,5 +66,47 @@ class CompatibilityEngineTests(unittest.TestCase):
         self.assertEqual(result["overallAgreementPct"], 100.0)
 
 
+class BatchCompatibilityTests(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        # Two-decimal averages (as stored) with some dimensions missing, plus
+        # a coarse grid so halfway roundings and clamped scores show up.
+        self.profiles = [
+            {d: round(rng.uniform(0.1, 1.0), 2) for d in DIMENSIONS if rng.random() > 0.15}
+            for _ in range(150)
+        ] + [
+            {d: rng.choice([0.1, 0.325, 0.55, 0.775, 1.0]) for d in DIMENSIONS}
+            for _ in range(50)
+        ] + [{}]
+
+    def test_many_matches_the_scalar_function_bit_for_bit(self):
+        matrix_b = compatibility_vectors(self.profiles)
+        for averages_a in self.profiles[::20]:
+            result = compute_compatibility_many(averages_a, matrix_b)
+            self.assertEqual(result["compatibilityVersion"], COMPATIBILITY_VERSION)
+            self.assertEqual(result["overallAgreementPct"].shape, (len(self.profiles),))
+            for row, averages_b in enumerate(self.profiles):
+                expected = compute_compatibility(averages_a, averages_b)
+                self.assertEqual(result["overallAgreementPct"][row], expected["overallAgreementPct"])
+                self.assertEqual(
+                    result["perDimensionAgreementPct"][row].tolist(),
+                    [expected["perDimension"][d]["agreementPct"] for d in DIMENSIONS],
+                )
+
+    def test_empty_counterparts_give_empty_results(self):
+        result = compute_compatibility_many({}, compatibility_vectors([]))
+        self.assertEqual(result["overallAgreementPct"].shape, (0,))
+        self.assertEqual(result["perDimensionAgreementPct"].shape, (0, len(DIMENSIONS)))
+
+    def test_agreement_matrix_rows_match_many(self):
+        profiles = self.profiles[:40]
+        matrix = overall_agreement_matrix(profiles)
+        vectors = compatibility_vectors(profiles)
+        for row, averages in enumerate(profiles):
+            self.assertEqual(
+                matrix[row].tolist(), compute_compatibility_many(averages, vectors)["overallAgreementPct"].tolist(),
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,4 +1,5 @@
 import asyncio
+import json
 import os
 import unittest
 from datetime import datetime, timezone
@@ -17,7 +18,9 @@ from backend.src.backend_fastapi import (  # noqa: E402
     DailyMoralCrimeVoteRequest,
     _daily_moral_crime_base_id,
     _daily_moral_crime_window,
+    _load_daily_moral_crime_catalog,
     get_daily_moral_crime,
+    get_daily_moral_crime_dilemma,
     vote_daily_moral_crime,
 )
 from backend.src import backend_fastapi as backend_module  # noqa: E402
@@ -92,18 +95,26 @@ class DailyMoralCrimeTests(unittest.TestCase):
     def setUp(self):
         self.daily_votes = _FakeDailyVotesTable()
         self.dilemmas = Mock()
-        self.dilemmas.get_item.return_value = {"Item": {
-            "_id": "daily-base-en",
-            "baseId": "daily-base",
-            "dilemma": "A difficult choice.",
-            "firstAnswer": "Choose first",
-            "secondAnswer": "Choose second",
-            "teaseOption1": "First reflection.",
-            "teaseOption2": "Second reflection.",
-        }}
+        self.dilemmas.get_item.return_value = {}
+        # The Daily deck is a selection of the EN catalog, which is served
+        # from the in-memory dilemma catalog loaded by one scan.
+        self.dilemmas.scan.return_value = {"Items": [
+            {
+                "_id": f"{base_id}-en",
+                "baseId": base_id,
+                "language": "en",
+                "dilemma": "A difficult choice.",
+                "firstAnswer": "Choose first",
+                "secondAnswer": "Choose second",
+                "teaseOption1": "First reflection.",
+                "teaseOption2": "Second reflection.",
+            }
+            for base_id in _load_daily_moral_crime_catalog()["baseIds"]
+        ]}
         self.patches = [
             patch.object(backend_module, "daily_moral_crime_votes_table", self.daily_votes),
             patch.object(backend_module, "table", self.dilemmas),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
             patch.object(backend_module, "dynamodb", SimpleNamespace(meta=self.daily_votes.meta)),
         ]
         for current_patch in self.patches:
@@ -156,6 +167,29 @@ class DailyMoralCrimeTests(unittest.TestCase):
             "secondPct": 0,
         })
 
+    def test_shared_copy_is_identity_free_and_revalidates_from_memory(self):
+        personal = asyncio.run(get_daily_moral_crime(
+            request_with_headers({"X-Anonymous-User-Id": "anon-1"}),
+        ))
+        response = asyncio.run(get_daily_moral_crime_dilemma(
+            request_with_headers({}, "/daily-moral-crime/dilemma"),
+        ))
+
+        body = json.loads(response.body)
+        self.assertEqual(body, {key: value for key, value in personal.items() if key != "hasVoted"})
+        max_age = int(response.headers["cache-control"].removeprefix("public, max-age="))
+        self.assertTrue(0 < max_age <= 24 * 60 * 60)
+
+        self.dilemmas.reset_mock()
+        revalidated = asyncio.run(get_daily_moral_crime_dilemma(
+            request_with_headers({"If-None-Match": response.headers["etag"]}, "/daily-moral-crime/dilemma"),
+        ))
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.body, b"")
+        self.dilemmas.get_item.assert_not_called()
+        self.dilemmas.scan.assert_not_called()
+
     def test_retry_returns_the_original_vote_without_double_counting(self):
         day_key = _daily_moral_crime_window()["dayKey"]
         first = asyncio.run(vote_daily_moral_crime(
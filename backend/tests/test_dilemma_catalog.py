@@ -0,0 +1,627 @@
+import asyncio
+import json
+import os
+import random
+import unittest
+from threading import Lock
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    SessionDilemmaResponse,
+    _pick_random_dilemma_base_ids,
+    _segmented_scan,
+    get_dilemma,
+    get_dilemma_catalog,
+    get_dilemma_catalog_delta,
+    get_dilemma_catalog_manifest,
+    get_next_dilemmas,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.dilemma_catalog import (  # noqa: E402
+    DILEMMA_SOURCE_FILES,
+    build_catalog_snapshot,
+    catalog_source_version,
+    changed_item_ids,
+    compile_catalog_artifact,
+    content_version,
+    decode_deck_cursor,
+    deck_index,
+    dilemmas_by_base_ids,
+    encode_deck_cursor,
+    pick_random_dilemma,
+    sample_base_ids,
+    themed_base_ids,
+)
+
+
+_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+
+
+def request_with_headers(headers, path="/get-dilemma"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+def _items(language, count):
+    return [
+        {
+            "_id": f"d{i}-{language}",
+            "baseId": f"d{i}",
+            "language": language,
+            "dilemma": f"Dilemma {i}?",
+            "firstAnswer": "A",
+            "secondAnswer": "B",
+            "yesCount": i,
+        }
+        for i in range(count)
+    ]
+
+
+class CatalogSnapshotTests(unittest.TestCase):
+    def test_indexes_only_items_of_the_requested_language(self):
+        snapshot = build_catalog_snapshot("en", _items("en", 3) + _items("it", 2) + [{"_id": "catalog#manifest"}])
+
+        self.assertEqual(snapshot["ids"], ("d0-en", "d1-en", "d2-en"))
+        self.assertEqual(snapshot["baseIds"], ("d0", "d1", "d2"))
+
+    def test_content_version_ignores_vote_counters(self):
+        items = _items("en", 3)
+        bumped = [{**item, "yesCount": item["yesCount"] + 10} for item in items]
+        edited = [{**items[0], "dilemma": "Changed?"}] + items[1:]
+
+        self.assertEqual(content_version(items), content_version(reversed(bumped)))
+        self.assertNotEqual(content_version(items), content_version(edited))
+
+    def test_changed_item_ids_are_those_whose_hash_the_client_lacks(self):
+        snapshot = build_catalog_snapshot("en", _items("en", 3))
+        edited = build_catalog_snapshot("en", _items("en", 4) + [{**_items("en", 2)[1], "dilemma": "Changed?"}])
+
+        self.assertEqual(changed_item_ids(snapshot, []), ["d0-en", "d1-en", "d2-en"])
+        self.assertEqual(changed_item_ids(snapshot, snapshot["itemHashes"].values()), [])
+        # Counters don't count as a change; new and edited items do.
+        self.assertEqual(changed_item_ids(edited, snapshot["itemHashes"].values()), ["d1-en", "d3-en"])
+
+    def test_pick_skips_excluded_ids_and_resets_once_all_are_seen(self):
+        snapshot = build_catalog_snapshot("en", _items("en", 3))
+        rng = random.Random(7)
+
+        for _ in range(20):
+            picked = pick_random_dilemma(snapshot, {"d0-en", "d1-en"}, rng)
+            self.assertEqual(picked["_id"], "d2-en")
+        self.assertIn(pick_random_dilemma(snapshot, set(snapshot["ids"]), rng)["_id"], snapshot["ids"])
+        self.assertIsNone(pick_random_dilemma(build_catalog_snapshot("en", []), None, rng))
+
+    def test_returned_items_are_copies_without_vote_counters(self):
+        snapshot = build_catalog_snapshot("en", _items("en", 1))
+
+        pick_random_dilemma(snapshot)["yesCount"] = 999
+        dilemmas_by_base_ids(snapshot, ["d0"])["d0"]["dilemma"] = "Mutated"
+
+        self.assertNotIn("yesCount", snapshot["itemsById"]["d0-en"])
+        self.assertEqual(snapshot["itemsById"]["d0-en"]["dilemma"], "Dilemma 0?")
+
+    def test_sample_base_ids_returns_everything_when_the_catalog_is_small(self):
+        snapshot = build_catalog_snapshot("en", _items("en", 4))
+
+        self.assertEqual(sample_base_ids(snapshot, 10), ["d0", "d1", "d2", "d3"])
+        sampled = sample_base_ids(snapshot, 2, random.Random(1))
+        self.assertEqual(len(set(sampled)), 2)
+
+
+def _weighted_items(count):
+    # d<i> separates Empathy by i/count and Honesty by the reverse, so the two
+    # rankings run in opposite directions.
+    items = _items("en", count)
+    for i, item in enumerate(items):
+        item.update({
+            "firstAnswerEmpathy": i / count, "secondAnswerEmpathy": 0.0,
+            "firstAnswerHonesty": 0.0, "secondAnswerHonesty": (count - i) / count,
+        })
+    return items
+
+
+class ThemedDeckTests(unittest.TestCase):
+    def setUp(self):
+        self.snapshot = build_catalog_snapshot("en", _weighted_items(30))
+
+    def test_rankings_order_every_base_id_by_separation(self):
+        rankings = self.snapshot["dimensionRankings"]
+
+        self.assertEqual(rankings["Empathy"][:3], ("d29", "d28", "d27"))
+        self.assertEqual(rankings["Honesty"][:3], ("d0", "d1", "d2"))
+        # No weights at all: every item ties at zero and falls back to id order.
+        self.assertEqual(rankings["Justice"], self.snapshot["baseIds"])
+
+    def test_focused_deck_comes_from_the_strongest_separators(self):
+        deck = themed_base_ids(self.snapshot, 5, "Empathy", random.Random(3))
+
+        self.assertEqual(len(set(deck)), 5)
+        self.assertTrue(set(deck) <= set(self.snapshot["dimensionRankings"]["Empathy"][:10]))
+
+    def test_balanced_deck_mixes_dimensions_without_repeats(self):
+        for seed in range(20):
+            deck = themed_base_ids(self.snapshot, 12, "balanced", random.Random(seed))
+            self.assertEqual(len(set(deck)), 12)
+            # Empathy and Honesty pull from opposite ends of the catalog.
+            self.assertTrue(any(int(base_id[1:]) >= 20 for base_id in deck))
+            self.assertTrue(any(int(base_id[1:]) < 10 for base_id in deck))
+
+    def test_small_catalogs_and_unknown_focus(self):
+        self.assertEqual(themed_base_ids(build_catalog_snapshot("en", _items("en", 3)), 5, "Empathy"), ["d0", "d1", "d2"])
+        with self.assertRaises(ValueError):
+            themed_base_ids(self.snapshot, 3, "Courage")
+
+
+def _source_dilemma(base_id, **overrides):
+    dilemma = {
+        "_id": base_id,
+        "dilemma": "Which?",
+        "firstAnswer": "A",
+        "secondAnswer": "B",
+        "teaseOption1": "First.",
+        "teaseOption2": "Second.",
+    }
+    for prefix in ("firstAnswer", "secondAnswer"):
+        for dimension in ("Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty"):
+            dilemma[f"{prefix}{dimension}"] = 0.5
+    dilemma.update(overrides)
+    return dilemma
+
+
+def _sources(*dilemmas):
+    return {"en": json.dumps(list(dilemmas)).encode("utf-8")}
+
+
+class SessionDeckTests(unittest.TestCase):
+    def test_every_pass_is_a_full_permutation(self):
+        for size in (1, 2, 3, 17, 29, 100):
+            for seed in (0, 12345):
+                for deck_pass in range(3):
+                    indexes = [deck_index(seed, deck_pass * size + i, size) for i in range(size)]
+                    self.assertEqual(sorted(indexes), list(range(size)), (size, seed, deck_pass))
+
+    def test_seeds_and_passes_shuffle_differently(self):
+        first_pass = [deck_index(1, i, 29) for i in range(29)]
+
+        self.assertNotEqual(first_pass, [deck_index(2, i, 29) for i in range(29)])
+        self.assertNotEqual(first_pass, [deck_index(1, 29 + i, 29) for i in range(29)])
+
+    def test_cursor_round_trips_and_rejects_tampering(self):
+        cursor = encode_deck_cursor(b"k", "en", "abc123", 77, 5)
+
+        self.assertEqual(
+            decode_deck_cursor(b"k", cursor),
+            {"language": "en", "deckVersion": "abc123", "seed": 77, "position": 5},
+        )
+        self.assertIsNone(decode_deck_cursor(b"other", cursor))
+        self.assertIsNone(decode_deck_cursor(b"k", cursor.replace(".5.", ".6.")))
+        self.assertIsNone(decode_deck_cursor(b"k", "garbage"))
+
+
+class DeckCursorKeyTests(unittest.TestCase):
+    def _key(self, ssm_name, secret_error):
+        with patch.object(backend_module, "_dilemma_deck_cursor_key", None), \
+                patch.object(backend_module, "ANALYTICS_FINGERPRINT_SECRET_SSM_NAME", ssm_name), \
+                patch.object(backend_module, "get_analytics_fingerprint_secret", side_effect=secret_error):
+            first = backend_module._get_dilemma_deck_cursor_key()
+            return first, backend_module._dilemma_deck_cursor_key
+
+    def test_an_unreadable_pepper_is_retried_instead_of_pinning_a_random_key(self):
+        key, cached = self._key("/app/pepper", HTTPException(status_code=503))
+        self.assertEqual(len(key), 32)
+        self.assertIsNone(cached)
+
+    def test_without_a_configured_pepper_the_random_key_is_kept(self):
+        key, cached = self._key("", HTTPException(status_code=503))
+        self.assertEqual(cached, key)
+
+
+class CatalogArtifactTests(unittest.TestCase):
+    def test_repository_sources_compile(self):
+        sources = {}
+        for language, filename in DILEMMA_SOURCE_FILES.items():
+            with open(os.path.join(_DATA_DIR, filename), "rb") as source_file:
+                sources[language] = source_file.read()
+
+        artifact = compile_catalog_artifact(sources)
+
+        self.assertEqual(artifact["catalogVersion"], catalog_source_version(sources))
+        for language, items in artifact["languages"].items():
+            self.assertTrue(items)
+            self.assertTrue(all(item["_id"] == f"{item['baseId']}-{language}" for item in items))
+            self.assertTrue(all(item["language"] == language for item in items))
+
+    def test_version_tracks_the_source_bytes(self):
+        original = _sources(_source_dilemma("a"))
+        edited = _sources(_source_dilemma("a", dilemma="Which one?"))
+
+        self.assertEqual(catalog_source_version(original), catalog_source_version(dict(original)))
+        self.assertNotEqual(catalog_source_version(original), catalog_source_version(edited))
+
+    def test_invalid_sources_are_rejected(self):
+        invalid = [
+            _sources(_source_dilemma("a", firstAnswerEmpathy=1.5)),
+            _sources(_source_dilemma("a", secondAnswerHonesty="high")),
+            _sources(_source_dilemma("a", teaseOption2="")),
+            _sources(_source_dilemma("a"), _source_dilemma("a")),
+        ]
+        for sources in invalid:
+            with self.subTest(sources=sources), self.assertRaises(ValueError):
+                compile_catalog_artifact(sources)
+
+
+class _PagedClient:
+    """Low-level client fake: two pages per segment, typed attribute values."""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = Lock()
+
+    def scan(self, **kwargs):
+        with self.lock:
+            self.calls.append(kwargs)
+        segment = kwargs["Segment"]
+        page = 1 if "ExclusiveStartKey" in kwargs else 0
+        response = {
+            "Items": [{"_id": {"S": f"s{segment}p{page}"}, "yesCount": {"N": "3"}}],
+            "ConsumedCapacity": {"CapacityUnits": 0.5},
+        }
+        if page == 0:
+            response["LastEvaluatedKey"] = {"_id": {"S": f"s{segment}p0"}}
+        return response
+
+
+class SegmentedScanTests(unittest.TestCase):
+    def test_single_segment_follows_every_page_and_reports_capacity(self):
+        dynamodb_table = Mock()
+        dynamodb_table.scan.side_effect = [
+            {"Items": [{"_id": "a"}], "LastEvaluatedKey": {"_id": "a"}, "ConsumedCapacity": {"CapacityUnits": 1.5}},
+            {"Items": [{"_id": "b"}], "ConsumedCapacity": {"CapacityUnits": 0.5}},
+        ]
+
+        items, stats = _segmented_scan(dynamodb_table, FilterExpression="x = :x", ExpressionAttributeValues={":x": 1})
+
+        self.assertEqual([item["_id"] for item in items], ["a", "b"])
+        self.assertEqual(stats, {"segments": 1, "pages": 2, "consumedCapacityUnits": 2.0})
+        second_call = dynamodb_table.scan.call_args_list[1].kwargs
+        self.assertEqual(second_call["ExclusiveStartKey"], {"_id": "a"})
+        self.assertEqual(second_call["ReturnConsumedCapacity"], "TOTAL")
+
+    def test_projection_aliases_attribute_names(self):
+        dynamodb_table = Mock()
+        dynamodb_table.scan.return_value = {"Items": []}
+
+        _segmented_scan(
+            dynamodb_table,
+            projection=["_id", "language"],
+            ExpressionAttributeNames={"#lang": "language"},
+        )
+
+        call = dynamodb_table.scan.call_args.kwargs
+        self.assertEqual(call["ProjectionExpression"], "#p0, #p1")
+        self.assertEqual(call["ExpressionAttributeNames"], {"#lang": "language", "#p0": "_id", "#p1": "language"})
+
+    def test_parallel_segments_page_independently_through_the_client(self):
+        client = _PagedClient()
+        dynamodb_table = SimpleNamespace(name="dilemmas", meta=SimpleNamespace(client=client))
+
+        items, stats = _segmented_scan(
+            dynamodb_table,
+            3,
+            FilterExpression="#lang = :language",
+            ExpressionAttributeNames={"#lang": "language"},
+            ExpressionAttributeValues={":language": "en"},
+        )
+
+        self.assertEqual(sorted(item["_id"] for item in items), [f"s{s}p{p}" for s in range(3) for p in range(2)])
+        self.assertEqual(items[0]["yesCount"], 3)
+        self.assertEqual(stats, {"segments": 3, "pages": 6, "consumedCapacityUnits": 3.0})
+        self.assertEqual({call["Segment"] for call in client.calls}, {0, 1, 2})
+        self.assertTrue(all(call["TotalSegments"] == 3 for call in client.calls))
+        self.assertTrue(all(call["TableName"] == "dilemmas" for call in client.calls))
+        self.assertEqual(client.calls[0]["ExpressionAttributeValues"], {":language": {"S": "en"}})
+
+
+class CatalogLoadingTests(unittest.TestCase):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.scan.return_value = {"Items": _items("en", 5)}
+        self.dilemmas_table.get_item.return_value = {"Item": {"_id": "catalog#manifest", "catalogVersion": "v1"}}
+        self.dynamodb = Mock()
+        self.dynamodb.batch_get_item.return_value = {"Responses": {}}
+        self.now = 1_000_000.0
+        patches = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+            patch.object(backend_module.time, "time", lambda: self.now),
+            patch.object(backend_module, "track_analytics_event", Mock()),
+            patch.object(backend_module, "dynamodb", self.dynamodb),
+            patch.object(backend_module, "_bundled_dilemma_catalog", None),
+            patch.object(backend_module, "_bundled_dilemma_catalog_loaded", True),
+            patch.object(backend_module, "_dilemma_deck_cursor_key", b"test-key"),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def _get_dilemma(self, exclude="", deck=""):
+        return asyncio.run(get_dilemma(request_with_headers({}), language="en", exclude=exclude, deck=deck))
+
+    def test_repeated_questions_are_served_from_one_scan(self):
+        for _ in range(10):
+            self._get_dilemma()
+
+        self.assertEqual(self.dilemmas_table.scan.call_count, 1)
+        self.assertEqual(self.dilemmas_table.get_item.call_count, 1)
+
+    def test_unchanged_manifest_after_the_ttl_does_not_rescan(self):
+        get_dilemma_catalog("en")
+        self.now += backend_module.DILEMMA_CATALOG_TTL_SECONDS + 1
+        get_dilemma_catalog("en")
+
+        self.assertEqual(self.dilemmas_table.scan.call_count, 1)
+        self.assertEqual(self.dilemmas_table.get_item.call_count, 2)
+
+    def test_changed_manifest_after_the_ttl_rescans(self):
+        first = get_dilemma_catalog("en")
+        self.dilemmas_table.get_item.return_value = {"Item": {"_id": "catalog#manifest", "catalogVersion": "v2"}}
+        self.dilemmas_table.scan.return_value = {"Items": _items("en", 6)}
+        self.now += backend_module.DILEMMA_CATALOG_TTL_SECONDS + 1
+
+        second = get_dilemma_catalog("en")
+
+        self.assertEqual(self.dilemmas_table.scan.call_count, 2)
+        self.assertEqual(len(first["ids"]), 5)
+        self.assertEqual(len(second["ids"]), 6)
+        self.assertEqual(second["manifestVersion"], "v2")
+
+    def test_failed_refresh_keeps_serving_the_previous_snapshot(self):
+        first = get_dilemma_catalog("en")
+        self.dilemmas_table.get_item.return_value = {}
+        self.dilemmas_table.scan.side_effect = RuntimeError("throttled")
+        self.now += backend_module.DILEMMA_CATALOG_TTL_SECONDS + 1
+
+        self.assertIs(get_dilemma_catalog("en"), first)
+
+    def test_exclusions_are_honored_and_reset_when_everything_was_seen(self):
+        result = self._get_dilemma(exclude="d0-en,d1-en,d2-en,d3-en")
+        self.assertEqual(result["_id"], "d4-en")
+
+        result = self._get_dilemma(exclude=",".join(f"d{i}-en" for i in range(5)))
+        self.assertIn(result["_id"], {f"d{i}-en" for i in range(5)})
+
+    def test_session_deck_walks_the_catalog_without_repeats(self):
+        cursor = "new"
+        seen = []
+        for _ in range(10):
+            result = self._get_dilemma(deck=cursor)
+            seen.append(result["_id"])
+            cursor = result["deckCursor"]
+
+        self.assertEqual(sorted(seen[:5]), [f"d{i}-en" for i in range(5)])
+        self.assertEqual(sorted(seen[5:]), [f"d{i}-en" for i in range(5)])
+        self.assertLess(len(cursor), 80)
+
+    def test_unusable_deck_cursor_starts_a_new_deck(self):
+        cursor = self._get_dilemma(deck="new")["deckCursor"]
+        other_language = cursor.replace(".en.", ".it.")
+
+        for bad_cursor in ("garbage", cursor[:-1] + "x", other_language):
+            result = self._get_dilemma(deck=bad_cursor)
+            self.assertEqual(decode_deck_cursor(b"test-key", result["deckCursor"])["position"], 1)
+
+    def test_prefetch_returns_distinct_dilemmas_and_one_analytics_event(self):
+        result = asyncio.run(get_next_dilemmas(request_with_headers({}), language="en", count=4, deck="new"))
+
+        ids = [dilemma["_id"] for dilemma in result["dilemmas"]]
+        self.assertEqual(len(set(ids)), 4)
+        self.assertEqual(result["dilemmas"][0]["yesCount"], 0)
+        backend_module.track_analytics_event.assert_called_once()
+        event = backend_module.track_analytics_event.call_args.kwargs
+        self.assertEqual(event["action_type"], "dilemma_fetched")
+        self.assertEqual(event["action_data"]["dilemma_ids"], ids)
+        self.dynamodb.batch_get_item.assert_called_once()
+
+    def test_prefetch_continues_the_deck_across_a_pass_without_duplicates(self):
+        first = asyncio.run(get_next_dilemmas(request_with_headers({}), language="en", count=3, deck="new"))
+        second = asyncio.run(get_next_dilemmas(
+            request_with_headers({}), language="en", count=5, deck=first["deckCursor"]
+        ))
+
+        first_ids = [dilemma["_id"] for dilemma in first["dilemmas"]]
+        second_ids = [dilemma["_id"] for dilemma in second["dilemmas"]]
+        self.assertEqual(len(set(second_ids)), 5)
+        # The first pass ends after two more dilemmas, which are the ones the
+        # first batch hadn't shown yet.
+        self.assertEqual(set(first_ids) | set(second_ids[:2]), {f"d{i}-en" for i in range(5)})
+
+    def test_questions_carry_live_vote_counts(self):
+        self.dynamodb.batch_get_item.return_value = {"Responses": {backend_module.DYNAMODB_TABLE: [
+            {"_id": "d4-en", "yesCount": 12, "noCount": 3},
+        ]}}
+
+        result = self._get_dilemma(exclude="d0-en,d1-en,d2-en,d3-en")
+
+        self.assertEqual((result["yesCount"], result["noCount"]), (12, 3))
+
+    def test_unreadable_vote_counts_default_to_zero(self):
+        self.dynamodb.batch_get_item.side_effect = RuntimeError("throttled")
+
+        result = self._get_dilemma()
+
+        self.assertEqual((result["yesCount"], result["noCount"]), (0, 0))
+
+    def test_bundle_matching_the_manifest_replaces_the_scan(self):
+        sources = _sources(_source_dilemma("bundled"))
+        artifact = compile_catalog_artifact(sources)
+        self.dilemmas_table.get_item.return_value = {"Item": {"catalogVersion": artifact["catalogVersion"]}}
+
+        with patch.object(backend_module, "_bundled_dilemma_catalog", artifact):
+            snapshot = get_dilemma_catalog("en")
+
+        self.dilemmas_table.scan.assert_not_called()
+        self.assertEqual(snapshot["ids"], ("bundled-en",))
+
+    def test_bundle_differing_from_the_manifest_falls_back_to_the_table(self):
+        artifact = compile_catalog_artifact(_sources(_source_dilemma("bundled")))
+
+        with patch.object(backend_module, "_bundled_dilemma_catalog", artifact):
+            snapshot = get_dilemma_catalog("en")
+
+        self.assertEqual(self.dilemmas_table.scan.call_count, 1)
+        self.assertEqual(len(snapshot["ids"]), 5)
+
+    def test_unknown_language_is_a_404_and_is_not_cached(self):
+        self.dilemmas_table.scan.return_value = {"Items": []}
+
+        with self.assertRaises(HTTPException) as raised:
+            _pick_random_dilemma_base_ids("fr", 3)
+
+        self.assertEqual(raised.exception.status_code, 404)
+        self.assertNotIn("fr", backend_module._dilemma_catalog_cache)
+
+
+class PreRenderedResponseTests(unittest.TestCase):
+    """Full repository items take the pre-rendered bytes path."""
+
+    def setUp(self):
+        with open(os.path.join(_DATA_DIR, "dilemmas_en.json"), "rb") as source_file:
+            self.items = compile_catalog_artifact({"en": source_file.read()})["languages"]["en"]
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.scan.return_value = {"Items": self.items}
+        self.dilemmas_table.get_item.return_value = {}
+        self.dynamodb = Mock()
+        self.dynamodb.batch_get_item.side_effect = lambda RequestItems: {"Responses": {
+            backend_module.DYNAMODB_TABLE: [
+                {"_id": key["_id"], "yesCount": 7, "noCount": 2}
+                for key in RequestItems[backend_module.DYNAMODB_TABLE]["Keys"]
+            ]
+        }}
+        patches = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "dynamodb", self.dynamodb),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+            patch.object(backend_module, "track_analytics_event", Mock()),
+            patch.object(backend_module, "_bundled_dilemma_catalog", None),
+            patch.object(backend_module, "_bundled_dilemma_catalog_loaded", True),
+            patch.object(backend_module, "_dilemma_deck_cursor_key", b"test-key"),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def _model_bytes(self, item_id, deck_cursor=None):
+        item = next(item for item in self.items if item["_id"] == item_id)
+        rendered = SessionDilemmaResponse.model_validate(
+            {**item, "yesCount": 7, "noCount": 2, "deckCursor": deck_cursor}
+        ).model_dump(mode="json", by_alias=True)
+        return json.dumps(rendered, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def test_body_is_byte_identical_to_the_response_model(self):
+        response = asyncio.run(get_dilemma(request_with_headers({}), language="en", exclude="", deck=""))
+
+        item_id = json.loads(response.body)["_id"]
+        self.assertEqual(response.body, self._model_bytes(item_id))
+        self.assertEqual(response.headers["etag"], f'"{get_dilemma_catalog("en")["version"]}.{item_id}.7.2"')
+
+    def test_deck_responses_carry_the_cursor_and_no_etag(self):
+        response = asyncio.run(get_dilemma(request_with_headers({}), language="en", exclude="", deck="new"))
+
+        payload = json.loads(response.body)
+        self.assertEqual(response.body, self._model_bytes(payload["_id"], payload["deckCursor"]))
+        self.assertNotIn("etag", response.headers)
+
+    def test_batch_body_is_valid_json_of_rendered_items(self):
+        response = asyncio.run(get_next_dilemmas(request_with_headers({}), language="en", count=3, deck="new"))
+
+        payload = json.loads(response.body)
+        self.assertEqual(len(payload["dilemmas"]), 3)
+        self.assertTrue(payload["deckCursor"])
+        for dilemma in payload["dilemmas"]:
+            expected = json.loads(self._model_bytes(dilemma["_id"]))
+            del expected["deckCursor"]
+            self.assertEqual(dilemma, expected)
+
+
+class OfflineCatalogSyncTests(unittest.TestCase):
+    def setUp(self):
+        with open(os.path.join(_DATA_DIR, "dilemmas_en.json"), "rb") as source_file:
+            self.items = compile_catalog_artifact({"en": source_file.read()})["languages"]["en"]
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.scan.return_value = {"Items": self.items}
+        self.dilemmas_table.get_item.return_value = {}
+        self.dynamodb = Mock()
+        patches = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "dynamodb", self.dynamodb),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+            patch.object(backend_module, "_bundled_dilemma_catalog", None),
+            patch.object(backend_module, "_bundled_dilemma_catalog_loaded", True),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def _delta(self, since="", have="", headers=None):
+        response = asyncio.run(get_dilemma_catalog_delta(
+            request_with_headers(headers or {}, "/dilemmas/catalog/delta"),
+            language="en", since=since, have=have,
+        ))
+        return response, json.loads(response.body) if response.body else None
+
+    def test_manifest_lists_every_base_id_with_its_hash(self):
+        response = asyncio.run(get_dilemma_catalog_manifest(request_with_headers({}, "/dilemmas/catalog"), language="en"))
+
+        manifest = json.loads(response.body)
+        self.assertEqual(manifest["version"], get_dilemma_catalog("en")["version"])
+        self.assertEqual(sorted(entry["baseId"] for entry in manifest["items"]), sorted(item["baseId"] for item in self.items))
+        self.assertEqual(response.headers["cache-control"], "public, max-age=300")
+
+    def test_first_sync_returns_every_item_rendered_like_get_dilemma(self):
+        _, delta = self._delta()
+
+        self.assertEqual(len(delta["items"]), len(self.items))
+        self.assertEqual(len(delta["baseIds"]), len(self.items))
+        first = delta["items"][0]
+        expected = SessionDilemmaResponse.model_validate(
+            next(item for item in self.items if item["_id"] == first["_id"])
+        ).model_dump(mode="json", by_alias=True, exclude={"yesCount", "noCount", "deckCursor"})
+        self.assertEqual({key: value for key, value in first.items() if key != "hash"}, expected)
+        self.dynamodb.batch_get_item.assert_not_called()
+
+    def test_delta_returns_only_items_whose_hash_the_client_lacks(self):
+        _, full = self._delta()
+        held = [item["hash"] for item in full["items"][1:]]
+
+        _, delta = self._delta(since="older-version", have=",".join(held))
+        _, current = self._delta(since=full["version"])
+
+        self.assertEqual([item["_id"] for item in delta["items"]], [full["items"][0]["_id"]])
+        self.assertEqual(current["items"], [])
+        self.assertEqual(current["baseIds"], full["baseIds"])
+
+    def test_delta_revalidates_and_rejects_oversized_input(self):
+        first, _ = self._delta(since="older-version")
+        revalidated, _ = self._delta(since="older-version", headers={"If-None-Match": first.headers["etag"]})
+
+        self.assertEqual(revalidated.status_code, 304)
+        with self.assertRaises(HTTPException) as raised:
+            self._delta(have="a" * (backend_module.DILEMMA_CATALOG_DELTA_MAX_HAVE_LENGTH + 1))
+        self.assertEqual(raised.exception.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -22,6 +22,7 @@ from backend.src.backend_fastapi import (  # noqa: E402
     compare_challenge,
     create_challenge,
     create_profile,
+    get_dilemma_vote_counts,
     get_dilemmas_by_ids,
     get_profile,
     join_challenge,
@@ -172,7 +173,19 @@ class GetProfileTests(unittest.TestCase):
 
 
 class DilemmasByIdsTests(unittest.TestCase):
-    def test_builds_language_specific_keys_and_preserves_order(self):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.get_item.return_value = {}
+        self.dilemmas_table.scan.return_value = {"Items": []}
+        patchers = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_catalog_misses_fall_back_to_language_specific_keys_and_preserve_order(self):
         response = {
             "Responses": {
                 backend_module.DYNAMODB_TABLE: [
@@ -190,6 +203,105 @@ class DilemmasByIdsTests(unittest.TestCase):
         self.assertEqual(call_keys, [{"_id": "a-en"}, {"_id": "b-en"}])
         self.assertEqual([item["dilemma"] for item in result["dilemmas"]], ["A", "B"])
 
+    def test_fallback_retries_unprocessed_keys(self):
+        dynamodb_mock = Mock()
+        dynamodb_mock.batch_get_item.side_effect = [
+            {
+                "Responses": {backend_module.DYNAMODB_TABLE: [{"_id": "a-en", "dilemma": "A"}]},
+                "UnprocessedKeys": {backend_module.DYNAMODB_TABLE: {"Keys": [{"_id": "b-en"}]}},
+            },
+            {"Responses": {backend_module.DYNAMODB_TABLE: [{"_id": "b-en", "dilemma": "B"}]}},
+        ]
+        with patch.object(backend_module, "dynamodb", dynamodb_mock), \
+                patch.object(backend_module.time, "sleep"):
+            result = asyncio.run(get_dilemmas_by_ids("a,b", request_with_headers({}), language="en"))
+
+        self.assertEqual([item["dilemma"] for item in result["dilemmas"]], ["A", "B"])
+        retry = dynamodb_mock.batch_get_item.call_args_list[1].kwargs["RequestItems"]
+        self.assertEqual(retry, {backend_module.DYNAMODB_TABLE: {"Keys": [{"_id": "b-en"}]}})
+
+    def test_fallback_keys_that_stay_unprocessed_fail_the_request(self):
+        dynamodb_mock = Mock()
+        dynamodb_mock.batch_get_item.return_value = {
+            "Responses": {},
+            "UnprocessedKeys": {backend_module.DYNAMODB_TABLE: {"Keys": [{"_id": "a-en"}]}},
+        }
+        with patch.object(backend_module, "dynamodb", dynamodb_mock), \
+                patch.object(backend_module.time, "sleep"):
+            with self.assertRaises(HTTPException) as raised:
+                asyncio.run(get_dilemmas_by_ids("a", request_with_headers({}), language="en"))
+
+        self.assertEqual(raised.exception.status_code, 503)
+        self.assertEqual(dynamodb_mock.batch_get_item.call_count, backend_module.DILEMMA_BATCH_GET_ATTEMPTS)
+
+    def test_catalog_hits_are_served_from_memory_without_counters(self):
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {"_id": "a-en", "language": "en", "dilemma": "A", "yesCount": 4, "noCount": 1},
+            {"_id": "b-en", "language": "en", "dilemma": "B"},
+        ]}
+        dynamodb_mock = Mock()
+        with patch.object(backend_module, "dynamodb", dynamodb_mock):
+            response = asyncio.run(get_dilemmas_by_ids("b,a", request_with_headers({}), language="en"))
+
+        dynamodb_mock.batch_get_item.assert_not_called()
+        result = json.loads(response.body)
+        self.assertEqual([item["dilemma"] for item in result["dilemmas"]], ["B", "A"])
+        self.assertNotIn("yesCount", result["dilemmas"][1])
+
+    def test_catalog_hits_are_tagged_and_revalidate_without_dynamodb(self):
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {"_id": "a-en", "language": "en", "dilemma": "A"},
+            {"_id": "b-en", "language": "en", "dilemma": "B"},
+        ]}
+        dynamodb_mock = Mock()
+        with patch.object(backend_module, "dynamodb", dynamodb_mock):
+            first = asyncio.run(get_dilemmas_by_ids("a,b", request_with_headers({}), language="en"))
+            etag = first.headers["etag"]
+            self.assertTrue(etag.startswith('W/"'))
+            self.assertEqual(first.headers["cache-control"], "public, max-age=300")
+
+            self.dilemmas_table.reset_mock()
+            revalidated = asyncio.run(get_dilemmas_by_ids(
+                "a,b", request_with_headers({"If-None-Match": etag}), language="en",
+            ))
+            other_order = asyncio.run(get_dilemmas_by_ids("b,a", request_with_headers({}), language="en"))
+
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(revalidated.body, b"")
+        self.assertEqual(revalidated.headers["etag"], etag)
+        dynamodb_mock.batch_get_item.assert_not_called()
+        self.dilemmas_table.get_item.assert_not_called()
+        self.dilemmas_table.scan.assert_not_called()
+        self.assertNotEqual(other_order.headers["etag"], etag)
+
+    def test_fallback_reads_are_not_tagged(self):
+        dynamodb_mock = Mock()
+        dynamodb_mock.batch_get_item.return_value = {"Responses": {
+            backend_module.DYNAMODB_TABLE: [{"_id": "a-en", "dilemma": "A", "yesCount": 1, "noCount": 0}],
+        }}
+        with patch.object(backend_module, "dynamodb", dynamodb_mock):
+            result = asyncio.run(get_dilemmas_by_ids(
+                "a", request_with_headers({"If-None-Match": "*"}), language="en",
+            ))
+
+        self.assertEqual(result, {"dilemmas": [{"_id": "a-en", "dilemma": "A"}]})
+
+    def test_vote_counts_are_read_live_and_default_to_zero(self):
+        dynamodb_mock = Mock()
+        dynamodb_mock.batch_get_item.return_value = {"Responses": {backend_module.DYNAMODB_TABLE: [
+            {"_id": "a-en", "yesCount": 4, "noCount": 1},
+        ]}}
+        with patch.object(backend_module, "dynamodb", dynamodb_mock):
+            result = asyncio.run(get_dilemma_vote_counts("b,a,b", language="en"))
+
+        request = dynamodb_mock.batch_get_item.call_args.kwargs["RequestItems"][backend_module.DYNAMODB_TABLE]
+        self.assertEqual(request["Keys"], [{"_id": "b-en"}, {"_id": "a-en"}])
+        self.assertEqual(request["ProjectionExpression"], "#id, yesCount, noCount")
+        self.assertEqual(result, {"counts": {
+            "b": {"yesCount": 0, "noCount": 0},
+            "a": {"yesCount": 4, "noCount": 1},
+        }})
+
 
 class CreateChallengeTests(unittest.TestCase):
     def _profile_item(self, owner="anon-1"):
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    DilemmaAnswer,
+    SubmitChallengeRequest,
+    compare_challenge,
+    submit_challenge,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.compatibility_engine import compute_compatibility  # noqa: E402
+from backend.src.duel_agreement import (  # noqa: E402
+    DUEL_AGREEMENT_DISTRIBUTION_ID,
+    agreement_bucket_attribute,
+    agreement_distribution,
+    agreement_top_pct,
+)
+
+SIX_DIMENSIONS = ["Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty"]
+
+
+def request_with_headers(headers):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+class AgreementDistributionTests(unittest.TestCase):
+    def test_buckets_are_tenths_of_a_percent(self):
+        self.assertEqual(agreement_bucket_attribute(72.3), "b723")
+        self.assertEqual(agreement_bucket_attribute(100.0), "b1000")
+        self.assertEqual(agreement_bucket_attribute(0.0), "b0")
+
+    def test_top_pct_counts_duels_agreeing_at_least_as_much(self):
+        row = {"_id": DUEL_AGREEMENT_DISTRIBUTION_ID, "total": Decimal(40), "b500": Decimal(10),
+               "b723": Decimal(20), "b900": Decimal(9), "b1000": Decimal(1), "b100": Decimal(0)}
+        distribution = agreement_distribution(row)
+
+        self.assertEqual(distribution, {"values": [500, 723, 900, 1000], "cumulative": [10, 30, 39, 40]})
+        self.assertEqual(agreement_top_pct(distribution, 100.0), 3)
+        self.assertEqual(agreement_top_pct(distribution, 90.0), 25)
+        self.assertEqual(agreement_top_pct(distribution, 72.3), 75)
+        self.assertEqual(agreement_top_pct(distribution, 80.0), 25)
+        self.assertEqual(agreement_top_pct(distribution, 10.0), 100)
+        self.assertIsNone(agreement_top_pct(distribution, 72.3, min_duels=41))
+        self.assertIsNone(agreement_top_pct(agreement_distribution(None), 72.3))
+
+
+class DuelAgreementRecordingTests(unittest.TestCase):
+    def test_submit_adds_the_duel_score_once(self):
+        creator_averages = {d: 0.8 for d in SIX_DIMENSIONS}
+        challenges_table = Mock()
+        challenges_table.get_item.return_value = {"Item": {
+            "challengeToken": "tok", "status": "joined", "language": "en", "dilemmaBaseIds": ["d1"],
+        }}
+        participants_table = Mock()
+        participants_table.get_item.side_effect = [
+            {"Item": {"anonymousUserId": "anon-2", "role": "invitee"}},
+            {"Item": {"anonymousUserId": "anon-1", "role": "creator", "profilePublicId": "profile-creator"}},
+        ]
+        profiles_table = Mock()
+        profiles_table.get_item.return_value = {"Item": {"dimensionAverages": json.dumps(creator_averages)}}
+        dilemmas_table = Mock()
+        answers = [DilemmaAnswer(dilemmaBaseId="d1", chosenValues={d: 0.3 for d in SIX_DIMENSIONS})]
+        with patch.object(backend_module, "challenges_table", challenges_table), \
+                patch.object(backend_module, "challenge_participants_table", participants_table), \
+                patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_add_twin_index_member"):
+            asyncio.run(submit_challenge(
+                "tok", SubmitChallengeRequest(answers=answers), request_with_headers({"X-Anonymous-User-Id": "anon-2"}),
+            ))
+
+        expected_pct = compute_compatibility(creator_averages, {d: 0.3 for d in SIX_DIMENSIONS})["overallAgreementPct"]
+        dilemmas_table.update_item.assert_called_once_with(
+            Key={"_id": DUEL_AGREEMENT_DISTRIBUTION_ID},
+            UpdateExpression="ADD #bucket :one, #total :one",
+            ExpressionAttributeNames={"#bucket": agreement_bucket_attribute(expected_pct), "#total": "total"},
+            ExpressionAttributeValues={":one": 1},
+        )
+
+    def test_compare_reports_the_top_pct_from_one_cached_read(self):
+        challenges_table = Mock()
+        challenges_table.get_item.return_value = {"Item": {"challengeToken": "tok", "status": "completed"}}
+        participants_table = Mock()
+        participants_table.get_item.side_effect = lambda Key: {"Item": {
+            "role": Key["role"], "profilePublicId": f"profile-{Key['role']}",
+        }}
+        profiles_table = Mock()
+        profiles_table.get_item.return_value = {"Item": {"dimensionAverages": json.dumps({d: 0.8 for d in SIX_DIMENSIONS})}}
+        dilemmas_table = Mock()
+        dilemmas_table.get_item.return_value = {"Item": {
+            "_id": DUEL_AGREEMENT_DISTRIBUTION_ID, "total": Decimal(50), "b600": Decimal(45), "b1000": Decimal(5),
+        }}
+        with patch.object(backend_module, "challenges_table", challenges_table), \
+                patch.object(backend_module, "challenge_participants_table", participants_table), \
+                patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", dilemmas_table), \
+                patch.object(backend_module, "_duel_agreement_cache", {}):
+            first = asyncio.run(compare_challenge("tok", request_with_headers({}), language="en"))
+            second = asyncio.run(compare_challenge("tok", request_with_headers({}), language="it"))
+
+        self.assertEqual(first["compatibility"]["overallAgreementPct"], 100.0)
+        self.assertEqual(first["agreementTopPct"], 10)
+        self.assertEqual(second["agreementTopPct"], 10)
+        dilemmas_table.get_item.assert_called_once_with(Key={"_id": DUEL_AGREEMENT_DISTRIBUTION_ID})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,302 @@
+import asyncio
+import json
+import os
+import random
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    _rebuild_archetype_census,
+    _sweep_expired_profiles,
+    create_moral_profile,
+    get_profile_twins,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.compatibility_engine import (  # noqa: E402
+    DIMENSIONS,
+    compatibility_vectors,
+    compute_compatibility,
+    total_distances,
+)
+from backend.src.moral_twins import (  # noqa: E402
+    TWIN_RECONCILE_GRACE_SECONDS,
+    apply_twin_index_changes,
+    build_twin_index,
+    encode_twin_member,
+    find_twins,
+    twin_cell,
+    twin_cell_members,
+    twin_change_days,
+    twin_index_changes,
+    twin_index_item,
+)
+
+
+def index_rows(profiles, created_at=100):
+    cells = {}
+    for public_id, averages in profiles.items():
+        cells.setdefault(twin_cell(averages), {})[public_id] = encode_twin_member(averages, created_at)
+    return cells
+
+
+def index_items(profiles, created_at=100):
+    return [
+        {"cell": cell, "publicId": public_id, "member": member}
+        for cell, members in index_rows(profiles, created_at).items()
+        for public_id, member in members.items()
+    ]
+
+
+def brute_force(profiles, averages, limit, exclude=None):
+    """Score every profile: nearest by summed distance first, then by
+    publicId, with the agreement compute_compatibility reports."""
+    ranked = sorted(
+        (total_distances(averages, compatibility_vectors([other]))[0], public_id)
+        for public_id, other in profiles.items() if public_id != exclude
+    )
+    return [
+        (public_id, compute_compatibility(averages, profiles[public_id])["overallAgreementPct"])
+        for _, public_id in ranked[:limit]
+    ]
+
+
+class FindTwinsTests(unittest.TestCase):
+    def test_matches_scoring_every_profile(self):
+        rng = random.Random(9)
+        # Stored two-decimal averages, some missing a dimension, and a coarse
+        # grid so tied distances show up.
+        profiles = {
+            f"p{i:04d}": {d: round(min(1.0, max(0.1, rng.gauss(0.55, 0.2))), 2) for d in DIMENSIONS if rng.random() > 0.05}
+            for i in range(1500)
+        }
+        profiles.update({
+            f"g{i:03d}": {d: rng.choice([0.1, 0.55, 1.0]) for d in DIMENSIONS} for i in range(300)
+        })
+        index = build_twin_index(index_rows(profiles))
+        self.assertEqual(index["size"], len(profiles))
+
+        for public_id in list(profiles)[::90]:
+            twins = find_twins(index, profiles[public_id], 5, exclude_public_id=public_id)
+            expected = brute_force(profiles, profiles[public_id], 5, exclude=public_id)
+            self.assertEqual([(twin["publicId"], twin["overallAgreementPct"]) for twin in twins], expected)
+            for twin in twins:
+                self.assertEqual(
+                    twin["overallAgreementPct"],
+                    compute_compatibility(profiles[public_id], twin["averages"])["overallAgreementPct"],
+                )
+
+    def test_small_and_empty_indexes(self):
+        self.assertEqual(find_twins(build_twin_index({}), {d: 0.5 for d in DIMENSIONS}, 5), [])
+        index = build_twin_index(index_rows({"only": {d: 0.5 for d in DIMENSIONS}}))
+        self.assertEqual(find_twins(index, {d: 0.5 for d in DIMENSIONS}, 5, exclude_public_id="only"), [])
+        twins = find_twins(index, {d: 0.5 for d in DIMENSIONS}, 5)
+        self.assertEqual([(twin["publicId"], twin["overallAgreementPct"]) for twin in twins], [("only", 100.0)])
+
+    def test_unreadable_members_are_skipped(self):
+        rows = index_rows({"good": {d: 0.5 for d in DIMENSIONS}})
+        rows[next(iter(rows))]["bad"] = "not a member"
+        self.assertEqual(build_twin_index(rows)["ids"], ["good"])
+
+
+class TwinIndexChangesTests(unittest.TestCase):
+    def test_missing_moved_and_deleted_profiles_are_reconciled(self):
+        low, high = {d: 0.2 for d in DIMENSIONS}, {d: 0.9 for d in DIMENSIONS}
+        scan_started_at = 10_000
+        old = scan_started_at - TWIN_RECONCILE_GRACE_SECONDS - 1
+        recent = scan_started_at - 1
+        cells = {
+            twin_cell(low): {
+                "kept": encode_twin_member(low, old),
+                "moved": encode_twin_member(low, old),
+                "deleted": encode_twin_member(low, old),
+                "just-created": encode_twin_member(low, recent),
+            },
+        }
+        live = {
+            "kept": (twin_cell(low), encode_twin_member(low, old)),
+            "moved": (twin_cell(high), encode_twin_member(high, old)),
+            "never-indexed": (twin_cell(low), encode_twin_member(low, old)),
+        }
+
+        changes = twin_index_changes(cells, live, scan_started_at)
+
+        self.assertEqual(changes[twin_cell(low)], {
+            "set": {"never-indexed": encode_twin_member(low, old)},
+            "remove": ["deleted", "moved"],
+        })
+        self.assertEqual(changes[twin_cell(high)], {"set": {"moved": encode_twin_member(high, old)}, "remove": []})
+
+    def test_changed_items_are_applied_in_write_order_without_touching_the_input(self):
+        low, high = {d: 0.2 for d in DIMENSIONS}, {d: 0.9 for d in DIMENSIONS}
+        cells = index_rows({"kept": low, "deleted": low})
+        items = [
+            twin_index_item(twin_cell(low), "deleted", 20),
+            twin_index_item(twin_cell(high), "new", 30, encode_twin_member(high, 30)),
+            twin_index_item(twin_cell(high), "recreated", 12),
+            twin_index_item(twin_cell(high), "recreated", 11, encode_twin_member(high, 11)),
+        ]
+
+        updated = apply_twin_index_changes(cells, items)
+
+        self.assertEqual(updated, {
+            twin_cell(low): {"kept": encode_twin_member(low, 100)},
+            twin_cell(high): {"new": encode_twin_member(high, 30)},
+        })
+        self.assertIn("deleted", cells[twin_cell(low)])
+        # Re-reading the same window changes nothing.
+        self.assertIsNone(apply_twin_index_changes(updated, items))
+
+    def test_removal_markers_expire_and_are_not_members(self):
+        marker = twin_index_item("0.0.0.0.0.0", "gone", 86_400 * 3 + 5)
+        self.assertEqual(marker["changeDay"], 3)
+        self.assertTrue(marker["removed"])
+        self.assertGreater(marker["expirationTime"], marker["updatedAt"])
+        self.assertEqual(twin_cell_members([marker]), {})
+        self.assertEqual(twin_change_days(86_400 - 1, 86_400 * 2), [0, 1, 2])
+
+
+class TwinIndexWriteTests(unittest.TestCase):
+    def test_profile_creation_puts_one_item_for_the_profile(self):
+        index_table = Mock()
+        answers = [Mock(chosenValues={d: 0.8 for d in DIMENSIONS}, dilemmaBaseId="dilemma-1")]
+        with patch.object(backend_module, "moral_profiles_table", Mock()), \
+                patch.object(backend_module, "moral_twin_index_table", index_table), \
+                patch.object(backend_module, "_write_profile_og_html"), \
+                patch.object(backend_module, "_archetype_census_cache", {}):
+            result = create_moral_profile("anon-1", answers, "en")
+
+        item = index_table.put_item.call_args.kwargs["Item"]
+        self.assertEqual(item["cell"], twin_cell(result["averages"]))
+        self.assertEqual(item["publicId"], result["publicId"])
+        self.assertEqual(item["member"].split("|", 1)[1], encode_twin_member(result["averages"], 0).split("|", 1)[1])
+        self.assertEqual(item["changeDay"], item["updatedAt"] // 86_400)
+
+    def test_the_sweep_removes_deleted_profiles_from_the_index(self):
+        averages = {d: 0.3 for d in DIMENSIONS}
+        profiles_table = Mock()
+        profiles_table.scan.return_value = {"Items": [{
+            "publicId": "expired-profile",
+            "expirationTime": 1,
+            "dimensionAverages": json.dumps(averages),
+        }]}
+        index_table = Mock()
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "moral_twin_index_table", index_table):
+            self.assertEqual(_sweep_expired_profiles(100), 1)
+
+        item = index_table.put_item.call_args.kwargs["Item"]
+        self.assertEqual((item["cell"], item["publicId"], item["removed"]), (twin_cell(averages), "expired-profile", True))
+        index_table.delete_item.assert_not_called()
+
+    def test_the_census_run_reconciles_the_index(self):
+        averages = {d: 0.9 for d in DIMENSIONS}
+        profiles_table = Mock()
+        profiles_table.scan.return_value = {"Items": [{
+            "publicId": "live",
+            "dimensionAverages": json.dumps(averages),
+            "archetypesVersion": "old",
+            "createdAt": 5_000_000,
+        }]}
+        stale_averages = {d: 0.2 for d in DIMENSIONS}
+        index_table = MagicMock()
+        index_table.scan.return_value = {"Items": index_items({"gone": stale_averages}, created_at=0)}
+        writer = index_table.batch_writer.return_value.__enter__.return_value
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "table", Mock()), \
+                patch.object(backend_module, "moral_twin_index_table", index_table), \
+                patch.object(backend_module, "ARCHETYPE_CENSUS_SCAN_SEGMENTS", 1), \
+                patch.object(backend_module, "TWIN_INDEX_SCAN_SEGMENTS", 1):
+            result = _rebuild_archetype_census(100_000)
+
+        self.assertEqual(result["twinIndexUpdates"], 2)
+        written = {
+            call.kwargs["Item"]["publicId"]: call.kwargs["Item"] for call in writer.put_item.call_args_list
+        }
+        self.assertEqual(written["live"]["cell"], twin_cell(averages))
+        self.assertEqual(written["live"]["member"], encode_twin_member(averages, 5_000))
+        self.assertEqual(written["gone"]["cell"], twin_cell(stale_averages))
+        self.assertTrue(written["gone"]["removed"])
+
+
+class ProfileTwinsEndpointTests(unittest.TestCase):
+    def test_twins_come_from_the_cached_index_without_public_ids(self):
+        me = {d: 0.6 for d in DIMENSIONS}
+        others = {
+            "close": {**me, "Empathy": 0.65},
+            "far": {d: 0.1 for d in DIMENSIONS},
+            "closest": {**me, "Honesty": 0.61},
+        }
+        index_table = Mock()
+        index_table.scan.return_value = {"Items": index_items({"pub-1": me, **others})}
+        profiles_table = Mock()
+        profiles_table.get_item.return_value = {"Item": {
+            "publicId": "pub-1",
+            "dimensionAverages": json.dumps(me),
+            "createdAt": 1000,
+        }}
+        request = Request({"type": "http", "method": "GET", "path": "/profiles/pub-1/twins", "headers": []})
+        with patch.object(backend_module, "moral_profiles_table", profiles_table), \
+                patch.object(backend_module, "moral_twin_index_table", index_table), \
+                patch.object(backend_module, "TWIN_INDEX_SCAN_SEGMENTS", 1), \
+                patch.object(backend_module, "_twin_index_cache", {}):
+            first = asyncio.run(get_profile_twins("pub-1", request, language="en", limit=2))
+            second = asyncio.run(get_profile_twins("pub-1", request, language="it", limit=5))
+
+        self.assertEqual(first["indexedProfiles"], 4)
+        self.assertEqual(
+            [twin["overallAgreementPct"] for twin in first["twins"]],
+            [compute_compatibility(me, others[key])["overallAgreementPct"] for key in ("closest", "close")],
+        )
+        self.assertEqual(len(second["twins"]), 3)
+        self.assertIn("archetypeId", first["twins"][0]["archetype"])
+        for twin in first["twins"] + second["twins"]:
+            self.assertEqual(set(twin), {"overallAgreementPct", "averages", "archetype"})
+        # Both requests share one read of the index table.
+        self.assertEqual(index_table.scan.call_count, 1)
+
+    def test_an_expired_index_is_served_while_a_background_worker_reloads_it(self):
+        stale = build_twin_index({})
+        executor = Mock()
+        cache = {"index": {"index": stale, "checkedAt": 0.0}}
+        with patch.object(backend_module, "_twin_index_cache", cache), \
+                patch.object(backend_module, "_twin_index_executor", executor), \
+                patch.object(backend_module, "_read_twin_index_cells") as read:
+            self.assertIs(backend_module.get_twin_index(), stale)
+            self.assertIs(backend_module.get_twin_index(), stale)
+
+        read.assert_not_called()
+        executor.submit.assert_called_once_with(backend_module._load_twin_index)
+
+    def test_a_reload_only_reads_what_was_written_since_the_last_one(self):
+        me, other = {d: 0.6 for d in DIMENSIONS}, {d: 0.3 for d in DIMENSIONS}
+        cells = index_rows({"pub-1": me, "gone": other})
+        cache = {"index": {"index": build_twin_index(cells), "cells": cells, "syncedAt": 10_000, "checkedAt": 0.0}}
+        index_table = Mock()
+        index_table.query.return_value = {"Items": [
+            twin_index_item(twin_cell(other), "gone", 10_100),
+            twin_index_item(twin_cell(other), "new", 10_200, encode_twin_member(other, 10_200)),
+        ]}
+        with patch.object(backend_module, "_twin_index_cache", cache), \
+                patch.object(backend_module, "moral_twin_index_table", index_table), \
+                patch.object(backend_module.time, "time", return_value=10_300.0):
+            index = backend_module._load_twin_index()
+
+        index_table.scan.assert_not_called()
+        query = index_table.query.call_args.kwargs
+        self.assertEqual(query["IndexName"], "ChangesIndex")
+        self.assertEqual(query["ExpressionAttributeValues"], {
+            ":day": 0, ":since": 10_000 - backend_module.TWIN_INDEX_CHANGE_OVERLAP_SECONDS,
+        })
+        self.assertEqual(sorted(index["ids"]), ["new", "pub-1"])
+        self.assertEqual(cache["index"]["syncedAt"], 10_300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,7 @@
+import random
 import unittest
 
+from backend.src.compatibility_engine import compute_compatibility
 from backend.src.party_awards import (
     compute_closest_pair,
     compute_contrarian,
@@ -7,6 +9,7 @@ from backend.src.party_awards import (
     compute_most_aligned_with_group,
     compute_most_controversial_round,
     compute_party_room_awards,
+    party_agreement_matrix,
 )
 
 SIX_DIMENSIONS = ["Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty"]
@@ -146,5 +149,60 @@ class ComputePartyRoomAwardsTests(unittest.TestCase):
         self.assertEqual(result["mostControversialRoundIndex"], 0)
 
 
+def pairwise_awards(participants):
+    """The awards as computed before the shared matrix: one
+    compute_compatibility call per pair, ties broken by key."""
+    keys = sorted(participants)
+
+    def score(key_a, key_b):
+        return compute_compatibility(participants[key_a], participants[key_b])["overallAgreementPct"]
+
+    best = None
+    for i, key_a in enumerate(keys):
+        for key_b in keys[i + 1:]:
+            if best is None or score(key_a, key_b) > best[0]:
+                best = (score(key_a, key_b), key_a, key_b)
+    average = {key: sum(score(key, other) for other in keys if other != key) / (len(keys) - 1) for key in keys}
+    minority = min(keys, key=lambda k: (average[k], k))
+    aligned = max(keys, key=lambda k: (average[k], -k))
+    return (
+        {"participantKeys": [best[1], best[2]], "agreementPct": best[0]},
+        {"participantKey": minority, "averageAgreementPct": round(average[minority], 1)},
+        {"participantKey": aligned, "averageAgreementPct": round(average[aligned], 1)},
+    )
+
+
+class SharedAgreementMatrixTests(unittest.TestCase):
+    def test_matrix_entries_match_compute_compatibility(self):
+        rng = random.Random(7)
+        participants = {
+            key: {d: round(rng.uniform(0.1, 1.0), 2) for d in SIX_DIMENSIONS if rng.random() > 0.1}
+            for key in (4, 0, 9, 2, 7)
+        }
+        keys, matrix = party_agreement_matrix(participants)
+        self.assertEqual(keys, [0, 2, 4, 7, 9])
+        for row, key_a in enumerate(keys):
+            for column, key_b in enumerate(keys):
+                self.assertEqual(
+                    matrix[row, column],
+                    compute_compatibility(participants[key_a], participants[key_b])["overallAgreementPct"],
+                )
+
+    def test_awards_match_the_pairwise_computation_including_ties(self):
+        rng = random.Random(11)
+        for size in (3, 4, 8, 20, 60):
+            for _ in range(5):
+                # A coarse grid of values makes tied scores and averages common.
+                participants = {
+                    key: {d: rng.choice([0.1, 0.4, 0.55, 0.7, 1.0]) for d in SIX_DIMENSIONS}
+                    for key in rng.sample(range(size * 3), size)
+                }
+                closest, minority, aligned = pairwise_awards(participants)
+                result = compute_party_room_awards(participants, [], {})
+                self.assertEqual(result["closestPair"], closest)
+                self.assertEqual(result["moralMinority"], minority)
+                self.assertEqual(result["mostAlignedWithGroup"], aligned)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -105,6 +105,16 @@ class _FakeTable:
         return {"Attributes": dict(item)}
 
     def _check_condition(self, item, condition, names, values):
+        if " AND " in condition:
+            return all(
+                self._check_condition(item, part, names, values) for part in condition.split(" AND ")
+            )
+        if condition.startswith("size("):
+            path, _, value_token = condition[len("size("):].partition(")")
+            target = item or {}
+            for part in path.strip().split("."):
+                target = target.get(names.get(part, part), {})
+            return len(target) == values[value_token.strip(" =")]
         if condition.startswith("attribute_not_exists("):
             path = condition[len("attribute_not_exists("):-1]
             parts = [names.get(p, p) for p in path.strip().split(".")]
@@ -142,6 +152,12 @@ class PartyRoomTestCase(unittest.TestCase):
             patch.object(backend_module, "party_rooms_table", self.rooms),
             patch.object(backend_module, "party_participants_table", self.participants),
             patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+            patch.object(backend_module, "_choice_signature_tables", {}),
+            # Background work runs inline so tests see its result.
+            patch.object(backend_module, "_choice_signature_executor", Mock(
+                submit=Mock(side_effect=lambda function, *args: function(*args)),
+            )),
         ]
         for p in self.patches:
             p.start()
@@ -186,6 +202,18 @@ class PartyRoomTestCase(unittest.TestCase):
         self.assertTrue(state["isHost"])
         self.assertEqual(state["participantCount"], 1)
 
+    def test_deck_focus_is_picked_from_the_dimension_ranking_and_stored(self):
+        with patch.object(backend_module, "themed_base_ids", return_value=["d1", "d2", "d3"]) as themed:
+            result = asyncio.run(create_party_room(
+                CreatePartyRoomRequest(displayName="Host", dilemmaCount=3, deckFocus="Justice"),
+                request_with_headers({"X-Anonymous-User-Id": "host-1"}),
+            ))
+
+        self.assertEqual(themed.call_args.args[1:], (3, "Justice"))
+        room = self.rooms.get_item(Key={"roomCode": result["roomCode"]})["Item"]
+        self.assertEqual(room["deckFocus"], "Justice")
+        self.assertEqual(room["dilemmaBaseIds"], ["d1", "d2", "d3"])
+
     def test_join_is_idempotent_for_the_same_participant(self):
         room = self._create_room()
         self._join(room["roomCode"], "guest-1")
@@ -375,6 +403,180 @@ class PartyRoomTestCase(unittest.TestCase):
         self.assertIsInstance(state["groupVerdict"], str)
         self.assertTrue(state["groupVerdict"])
 
+    def _use_weighted_catalog(self):
+        """A catalog whose dilemmas carry answer weights, so decks can have a
+        choice-signature table. Returns the dimensions."""
+        dimensions = ["Empathy", "Integrity", "Responsibility", "Justice", "Altruism", "Honesty"]
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {
+                "_id": f"d{i}-en", "language": "en",
+                **{f"firstAnswer{d}": round(0.1 + (i + k) % 9 / 10, 1) for k, d in enumerate(dimensions)},
+                **{f"secondAnswer{d}": round(0.9 - (i * k) % 8 / 10, 1) for k, d in enumerate(dimensions)},
+            }
+            for i in range(10)
+        ]}
+        return dimensions
+
+    def test_completed_results_come_from_the_choice_signature_table(self):
+        dimensions = self._use_weighted_catalog()
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self.assertEqual(len(backend_module._choice_signature_tables), 1)
+        self._join(room["roomCode"], "guest-1")
+        self._start(room["roomCode"])
+        items = backend_module.get_dilemma_catalog("en")["itemsById"]
+        for round_index, base_id in enumerate(self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"]):
+            item = items[f"{base_id}-en"]
+            self._vote(room["roomCode"], "host-1", "first", {d: item[f"firstAnswer{d}"] for d in dimensions})
+            # The guest's client sent values that differ from the catalog's,
+            # so only the host can be looked up.
+            self._vote(room["roomCode"], "guest-1", "second", {"Empathy": 0.5})
+            self.rooms._items[(room["roomCode"],)]["phaseEndsAt"] = 0
+            with patch.object(backend_module, "compute_dimension_averages", wraps=backend_module.compute_dimension_averages) as averaged:
+                self._get_state(room["roomCode"], "host-1")
+        # The final poll computed the results: the host is a table lookup and
+        # the guest is read from its running sums, so nothing is re-averaged.
+        self.assertEqual(averaged.call_count, 0)
+
+        stored = self.rooms._items[(room["roomCode"],)]
+        self.assertEqual(stored["status"], "completed")
+        with patch.object(backend_module, "get_choice_signature_table", return_value=None):
+            expected = backend_module._party_room_final_results(stored, backend_module._list_party_participants(room["roomCode"]))
+        self.assertEqual(json.loads(stored["finalResults"]), json.loads(json.dumps(expected)))
+
+    def test_completion_elsewhere_assigns_a_small_room_without_building_a_table(self):
+        self._use_weighted_catalog()
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self._join(room["roomCode"], "guest-1")
+        self._start(room["roomCode"])
+        # Another container completes the room: it never built this deck's
+        # table, and 2 participants don't justify 2**rounds rows.
+        backend_module._choice_signature_tables.clear()
+        for _ in range(backend_module.PARTY_ROOM_MIN_DILEMMAS):
+            self._vote(room["roomCode"], "host-1", "first", {"Empathy": 0.9})
+            self._vote(room["roomCode"], "guest-1", "second", {"Empathy": 0.1})
+            self.rooms._items[(room["roomCode"],)]["phaseEndsAt"] = 0
+            with patch.object(backend_module, "build_choice_signature_table") as build:
+                state = self._get_state(room["roomCode"], "host-1")
+
+        self.assertEqual(state["status"], "completed")
+        build.assert_not_called()
+        self.assertEqual(backend_module._choice_signature_tables, {})
+
+    def test_votes_keep_running_sums_that_match_re_averaging_every_vote(self):
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self._join(room["roomCode"], "guest-1")
+        self._start(room["roomCode"])
+        sent = [
+            {"Empathy": 0.1, "Justice": 0.7},
+            {"Empathy": 0.2, "Honesty": 0.35},
+            {"Empathy": 0.45, "Justice": 0.15},
+        ]
+        for values in sent[:backend_module.PARTY_ROOM_MIN_DILEMMAS]:
+            self._vote(room["roomCode"], "host-1", "first", values)
+            self._vote(room["roomCode"], "guest-1", "second", values)
+            self.rooms._items[(room["roomCode"],)]["phaseEndsAt"] = 0
+            self._get_state(room["roomCode"], "host-1")
+
+        host = self.participants.get_item(Key={"roomCode": room["roomCode"], "participantId": "host-1"})["Item"]
+        votes = sent[:backend_module.PARTY_ROOM_MIN_DILEMMAS]
+        self.assertEqual(host["dimensionVoteCount"], len(votes))
+        self.assertEqual(
+            backend_module._party_participant_averages(host),
+            backend_module.compute_dimension_averages(votes),
+        )
+        # A participant that voted before sums were kept is re-averaged from
+        # its stored votes, and its next vote rebuilds the sums.
+        legacy = {key: value for key, value in host.items() if key not in ("dimensionSums", "dimensionVoteCount")}
+        self.assertEqual(
+            backend_module._party_participant_averages(legacy),
+            backend_module.compute_dimension_averages(votes),
+        )
+        rebuilt = backend_module._party_vote_dimension_sums(legacy, {"Empathy": 1.0})
+        self.assertEqual(rebuilt, backend_module._party_vote_dimension_sums(host, {"Empathy": 1.0}))
+
+    def test_a_vote_racing_another_write_is_retried_against_fresh_sums(self):
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self._join(room["roomCode"], "guest-1")
+        self._start(room["roomCode"])
+        key = (room["roomCode"], "host-1")
+        real_get_item = self.participants.get_item
+        reads = []
+
+        def get_item_then_race(Key):
+            # The first read returns the participant, then an earlier round's
+            # vote lands before the conditional write.
+            result = real_get_item(Key)
+            if Key.get("participantId") == "host-1" and not reads:
+                reads.append(Key)
+                self.participants._items[key]["votes"] = {"99": {"choice": "first", "chosenValues": '{"Empathy":0.3}'}}
+            return result
+
+        with patch.object(self.participants, "get_item", side_effect=get_item_then_race):
+            self._vote(room["roomCode"], "host-1", "first", {"Empathy": 0.5})
+
+        host = self.participants._items[key]
+        self.assertEqual(set(host["votes"]), {"0", "99"})
+        self.assertEqual(host["dimensionVoteCount"], 2)
+        self.assertEqual(float(host["dimensionSums"]["Empathy"]), 0.8)
+
+    def _complete_three_player_room(self):
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"] = \
+            self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"][:1]
+        self._join(room["roomCode"], "guest-1")
+        self._join(room["roomCode"], "guest-2")
+        self._start(room["roomCode"])
+        self._vote(room["roomCode"], "host-1", "first", {"Empathy": 0.9})
+        self._vote(room["roomCode"], "guest-1", "first", {"Empathy": 0.88})
+        self._vote(room["roomCode"], "guest-2", "second", {"Empathy": 0.1})
+        self.rooms._items[(room["roomCode"],)]["phaseEndsAt"] = 0
+        return room
+
+    def test_completed_room_polls_read_the_results_stored_at_completion(self):
+        room = self._complete_three_player_room()
+        first = self._get_state(room["roomCode"], "guest-1")
+        self.assertIn("finalResults", self.rooms._items[(room["roomCode"],)])
+        self.dilemmas_table.get_item.reset_mock()
+
+        with patch.object(backend_module, "compute_party_room_awards") as awards, \
+                patch.object(backend_module, "assign_archetypes") as assigned, \
+                patch.object(self.participants, "query") as queried:
+            second = self._get_state(room["roomCode"], "guest-1")
+            third = self._get_state(room["roomCode"], "host-1")
+
+        awards.assert_not_called()
+        assigned.assert_not_called()
+        queried.assert_not_called()
+        self.dilemmas_table.get_item.assert_not_called()
+        self.assertEqual(second, first)
+        self.assertEqual(third["participants"][0]["archetype"], first["participants"][0]["archetype"])
+        self.assertTrue(third["isHost"])
+        self.assertEqual([p["isCaller"] for p in third["participants"]], [True, False, False])
+        for participant in third["participants"]:
+            self.assertNotIn("participantId", participant)
+
+        # Another language only reads the controversial dilemma's text (here
+        # a miss in the empty Italian catalog, so one direct read).
+        dynamodb_mock = Mock()
+        dynamodb_mock.batch_get_item.return_value = {"Responses": {}}
+        with patch.object(backend_module, "dynamodb", dynamodb_mock):
+            italian = asyncio.run(get_party_room(
+                room["roomCode"], request_with_headers({"X-Anonymous-User-Id": "guest-1"}), language="it",
+            ))
+        base_id = self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"][0]
+        dynamodb_mock.batch_get_item.assert_called_once_with(
+            RequestItems={backend_module.DYNAMODB_TABLE: {"Keys": [{"_id": f"{base_id}-it"}]}},
+        )
+        self.assertEqual(italian["awards"]["closestPair"], first["awards"]["closestPair"])
+
+    def test_a_room_completed_without_stored_results_stores_them_on_the_next_poll(self):
+        room = self._complete_three_player_room()
+        expected = self._get_state(room["roomCode"], "host-1")
+        del self.rooms._items[(room["roomCode"],)]["finalResults"]
+
+        self.assertEqual(self._get_state(room["roomCode"], "host-1"), expected)
+        self.assertIn("finalResults", self.rooms._items[(room["roomCode"],)])
+
     def test_group_verdict_is_generated_once_and_cached(self):
         room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
         self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"] = \
@@ -398,6 +600,19 @@ class PartyRoomTestCase(unittest.TestCase):
             self.assertNotIn("participantId", participant)
         self.assertTrue(any(p["isCaller"] for p in state["participants"]))
 
+    def test_the_question_poll_reads_the_dilemma_from_the_catalog(self):
+        room = self._create_room(count=backend_module.PARTY_ROOM_MIN_DILEMMAS)
+        self._join(room["roomCode"], "guest-1")
+        self._start(room["roomCode"])
+        self.dilemmas_table.reset_mock()
+
+        state = self._get_state(room["roomCode"], "guest-1")
+
+        base_id = self.rooms._items[(room["roomCode"],)]["dilemmaBaseIds"][0]
+        self.assertEqual(state["currentDilemma"]["_id"], f"{base_id}-en")
+        self.dilemmas_table.get_item.assert_not_called()
+        self.dilemmas_table.scan.assert_not_called()
+
 
 if __name__ == "__main__":
     unittest.main()
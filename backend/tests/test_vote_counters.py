@@ -0,0 +1,260 @@
+import asyncio
+import os
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock, patch
+
+from botocore.exceptions import ClientError
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    VoteRequest,
+    _vote_buffer_due,
+    _with_live_vote_counts,
+    flush_vote_buffer,
+    vote,
+    vote_counter_compaction_handler,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.dilemma_catalog import merge_vote_counters, vote_counter_shard_id  # noqa: E402
+
+
+def request_with_headers(headers, path="/vote"):
+    return Request({
+        "type": "http",
+        "method": "POST",
+        "path": path,
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+class _ShardedTable:
+    """Counter rows keyed by `_id`, answering BatchGetItem like DynamoDB."""
+
+    def __init__(self, rows):
+        self.rows = {row["_id"]: dict(row) for row in rows}
+        self.batch_calls = []
+
+    def batch_get_item(self, RequestItems):
+        request = RequestItems[backend_module.DYNAMODB_TABLE]
+        self.batch_calls.append(request["Keys"])
+        return {"Responses": {backend_module.DYNAMODB_TABLE: [
+            self.rows[key["_id"]] for key in request["Keys"] if key["_id"] in self.rows
+        ]}}
+
+
+class VoteCounterMergeTests(unittest.TestCase):
+    def test_dilemma_rows_and_shards_are_summed_per_dilemma(self):
+        merged = merge_vote_counters([
+            {"_id": "d1-en", "yesCount": 10, "noCount": 4},
+            {"_id": vote_counter_shard_id("d1-en", 0), "yesCount": 2},
+            {"_id": vote_counter_shard_id("d1-en", 3), "noCount": 1},
+            {"_id": vote_counter_shard_id("d2-en", 1), "yesCount": 5, "counterShardOf": "d2-en"},
+        ])
+
+        self.assertEqual(merged, {
+            "d1-en": {"yesCount": 12, "noCount": 5},
+            "d2-en": {"yesCount": 5, "noCount": 0},
+        })
+
+
+class ShardedVoteCounterTests(unittest.TestCase):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        patches = [
+            patch.object(backend_module, "VOTE_COUNTER_SHARDS", 4),
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "track_analytics_event", Mock()),
+            patch.object(backend_module, "_vote_counter_rollup_cache", {}),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def test_votes_go_to_a_shard_row_instead_of_the_dilemma(self):
+        result = asyncio.run(vote(VoteRequest(_id="d1-en", vote="no"), request_with_headers({})))
+
+        call = self.dilemmas_table.update_item.call_args.kwargs
+        shard_id = call["Key"]["_id"]
+        self.assertIn(shard_id, [vote_counter_shard_id("d1-en", shard) for shard in range(4)])
+        self.assertEqual(call["UpdateExpression"], "ADD noCount :noCount SET counterShardOf = :dilemma")
+        self.assertEqual(call["ExpressionAttributeValues"], {":noCount": 1, ":dilemma": "d1-en"})
+        self.assertEqual(result["updated"], {})
+
+    def test_reads_merge_the_shards_and_reuse_the_rollup(self):
+        fake = _ShardedTable([
+            {"_id": "d1-en", "yesCount": Decimal(10), "noCount": Decimal(2)},
+            {"_id": vote_counter_shard_id("d1-en", 1), "yesCount": Decimal(3)},
+            {"_id": vote_counter_shard_id("d1-en", 2), "noCount": Decimal(1)},
+        ])
+        with patch.object(backend_module, "dynamodb", fake):
+            first = _with_live_vote_counts([{"_id": "d1-en"}, {"_id": "d2-en"}])
+            fake.rows["d1-en"]["yesCount"] = Decimal(50)
+            second = _with_live_vote_counts([{"_id": "d1-en"}, {"_id": "d2-en"}])
+
+        self.assertEqual(first, [
+            {"_id": "d1-en", "yesCount": 13, "noCount": 3},
+            {"_id": "d2-en"},
+        ])
+        self.assertEqual(second, first)
+        self.assertEqual(len(fake.batch_calls), 1)
+        self.assertEqual(len(fake.batch_calls[0]), 2 * (1 + 4))
+
+    def test_many_dilemmas_are_read_in_batches_of_one_hundred_keys(self):
+        fake = _ShardedTable([])
+        with patch.object(backend_module, "dynamodb", fake):
+            _with_live_vote_counts([{"_id": f"d{index}-en"} for index in range(30)])
+
+        self.assertEqual([len(keys) for keys in fake.batch_calls], [100, 50])
+
+
+class VoteWriteBehindTests(unittest.TestCase):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.update_item.return_value = {"Attributes": {}}
+        self.now = 1_000.0
+        patches = [
+            patch.object(backend_module, "VOTE_WRITE_BEHIND_ENABLED", True),
+            patch.object(backend_module, "VOTE_WRITE_BEHIND_MAX_VOTES", 5),
+            patch.object(backend_module, "VOTE_WRITE_BEHIND_MAX_AGE_SECONDS", 2),
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "track_analytics_event", Mock()),
+            patch.object(backend_module, "_vote_buffer", {}),
+            patch.object(backend_module, "_vote_buffer_pending", 0),
+            patch.object(backend_module, "_vote_buffer_oldest_at", None),
+            patch.object(backend_module.time, "time", side_effect=lambda: self.now),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def _vote(self, dilemma_id, choice):
+        return asyncio.run(vote(VoteRequest(_id=dilemma_id, vote=choice), request_with_headers({})))
+
+    def test_votes_are_acknowledged_without_a_write_and_coalesced_per_dilemma(self):
+        for dilemma_id, choice in [("d1-en", "yes"), ("d1-en", "yes"), ("d1-en", "no"), ("d2-en", "yes")]:
+            self.assertEqual(self._vote(dilemma_id, choice)["updated"], {})
+        self.dilemmas_table.update_item.assert_not_called()
+        self.assertFalse(_vote_buffer_due())
+
+        self.assertEqual(flush_vote_buffer(), 4)
+
+        writes = {
+            call.kwargs["Key"]["_id"]: (call.kwargs["UpdateExpression"], call.kwargs["ExpressionAttributeValues"])
+            for call in self.dilemmas_table.update_item.call_args_list
+        }
+        self.assertEqual(writes, {
+            "d1-en": ("ADD yesCount :yesCount, noCount :noCount", {":yesCount": 2, ":noCount": 1}),
+            "d2-en": ("ADD yesCount :yesCount", {":yesCount": 1}),
+        })
+        self.assertEqual(flush_vote_buffer(), 0)
+
+    def test_count_and_age_thresholds_make_a_flush_due(self):
+        for _ in range(4):
+            self._vote("d1-en", "yes")
+        self.assertFalse(_vote_buffer_due())
+        self._vote("d1-en", "yes")
+        self.assertTrue(_vote_buffer_due())
+
+        flush_vote_buffer()
+        self._vote("d1-en", "no")
+        self.now += 2
+        self.assertTrue(_vote_buffer_due())
+
+    def test_failed_writes_stay_buffered_for_the_next_flush(self):
+        self._vote("d1-en", "yes")
+        self._vote("d1-en", "yes")
+        self.dilemmas_table.update_item.side_effect = RuntimeError("throttled")
+
+        self.assertEqual(flush_vote_buffer(), 0)
+        self.dilemmas_table.update_item.side_effect = None
+        self.assertEqual(flush_vote_buffer(), 2)
+        self.assertEqual(
+            self.dilemmas_table.update_item.call_args.kwargs["ExpressionAttributeValues"],
+            {":yesCount": 2},
+        )
+
+    def test_the_request_that_makes_a_flush_due_does_not_wait_for_it(self):
+        for _ in range(5):
+            self._vote("d1-en", "yes")
+        release_write = threading.Event()
+        write_finished = threading.Event()
+
+        def blocked_write(**_kwargs):
+            release_write.wait(5)
+            write_finished.set()
+            return {"Attributes": {}}
+
+        self.dilemmas_table.update_item.side_effect = blocked_write
+        executor = ThreadPoolExecutor(max_workers=1)
+        call_next = AsyncMock(return_value="response")
+        with patch.object(backend_module, "_vote_buffer_executor", executor):
+            response = asyncio.run(backend_module.flush_due_vote_increments(Mock(), call_next))
+
+        # The middleware returned while the write is still in flight.
+        self.assertEqual(response, "response")
+        self.assertFalse(write_finished.is_set())
+        release_write.set()
+        executor.shutdown(wait=True)
+        self.assertTrue(write_finished.is_set())
+        self.dilemmas_table.update_item.assert_called_once()
+        self.assertFalse(_vote_buffer_due())
+
+
+class VoteCounterCompactionTests(unittest.TestCase):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        self.client = Mock()
+        patches = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "dynamodb", SimpleNamespace(meta=SimpleNamespace(client=self.client))),
+            patch.object(backend_module, "_rebuild_vote_split_indexes", return_value={"en": 1}),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def test_shards_are_folded_into_their_dilemma_row(self):
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {"_id": vote_counter_shard_id("d1-en", 0), "counterShardOf": "d1-en", "yesCount": Decimal(3), "noCount": Decimal(0)},
+            {"_id": vote_counter_shard_id("d1-en", 1), "counterShardOf": "d1-en", "yesCount": Decimal(0), "noCount": Decimal(0)},
+        ]}
+
+        result = vote_counter_compaction_handler({}, None)
+
+        self.assertEqual(result, {"shardRows": 2, "compactedShards": 1, "movedVotes": 3, "splitIndexes": {"en": 1}})
+        shard_update, dilemma_update = [
+            item["Update"] for item in self.client.transact_write_items.call_args.kwargs["TransactItems"]
+        ]
+        self.assertEqual(shard_update["Key"], {"_id": {"S": vote_counter_shard_id("d1-en", 0)}})
+        self.assertEqual(shard_update["UpdateExpression"], "ADD #c0 :n0")
+        self.assertEqual(shard_update["ConditionExpression"], "#c0 >= :c0")
+        self.assertEqual(shard_update["ExpressionAttributeValues"][":n0"], {"N": "-3"})
+        self.assertEqual(dilemma_update["Key"], {"_id": {"S": "d1-en"}})
+        self.assertEqual(dilemma_update["UpdateExpression"], "SET #c0 = if_not_exists(#c0, :zero) + :c0")
+        self.assertEqual(dilemma_update["ExpressionAttributeNames"], {"#c0": "yesCount"})
+
+    def test_a_shard_changed_mid_run_is_left_for_the_next_run(self):
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {"_id": vote_counter_shard_id("d1-en", 0), "counterShardOf": "d1-en", "yesCount": Decimal(3), "noCount": Decimal(2)},
+        ]}
+        self.client.transact_write_items.side_effect = ClientError(
+            {"Error": {"Code": "TransactionCanceledException", "Message": "cancelled"}},
+            "TransactWriteItems",
+        )
+
+        result = vote_counter_compaction_handler({}, None)
+
+        self.assertEqual(result, {"shardRows": 1, "compactedShards": 0, "movedVotes": 0, "splitIndexes": {"en": 1}})
+
+
+if __name__ == "__main__":
+    unittest.main()
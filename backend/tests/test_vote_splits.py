@@ -0,0 +1,141 @@
+import asyncio
+import json
+import os
+import unittest
+from decimal import Decimal
+from unittest.mock import Mock, patch
+
+from starlette.requests import Request
+
+os.environ.setdefault("AWS_EC2_METADATA_DISABLED", "true")
+os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "eu-west-1")
+
+from backend.src.backend_fastapi import (  # noqa: E402
+    _rebuild_vote_split_indexes,
+    get_dilemma_splits,
+    get_most_divisive_dilemmas,
+)
+from backend.src import backend_fastapi as backend_module  # noqa: E402
+from backend.src.dilemma_catalog import vote_counter_shard_id  # noqa: E402
+from backend.src.vote_splits import (  # noqa: E402
+    build_vote_split_index,
+    most_divisive,
+    splits_for_base_ids,
+    vote_split,
+)
+
+
+def request_with_headers(headers, path="/dilemmas/splits"):
+    return Request({
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "headers": [(key.lower().encode(), value.encode()) for key, value in headers.items()],
+    })
+
+
+class VoteSplitIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.index = build_vote_split_index("en", {
+            "even-en": {"yesCount": 50, "noCount": 50},
+            "close-en": {"yesCount": 55, "noCount": 45},
+            "lopsided-en": {"yesCount": 90, "noCount": 10},
+            "bigeven-en": {"yesCount": 500, "noCount": 500},
+            "tiny-en": {"yesCount": 1, "noCount": 1},
+            "other-it": {"yesCount": 30, "noCount": 30},
+        }, built_at=123)
+
+    def test_splits_are_keyed_by_base_id_for_the_language_only(self):
+        self.assertEqual(set(self.index["splits"]), {"even", "close", "lopsided", "bigeven", "tiny"})
+        self.assertEqual(self.index["splits"]["close"], vote_split(55, 45))
+        self.assertEqual(vote_split(55, 45)["yesPct"], 55)
+        self.assertEqual(vote_split(0, 0)["yesPct"], 0)
+
+    def test_ranking_puts_even_splits_first_and_skips_thin_samples(self):
+        # Equal 50/50 splits rank by vote count; two votes are not enough
+        # to call anything divisive.
+        self.assertEqual(self.index["mostDivisive"], ["bigeven", "even", "close", "lopsided"])
+        self.assertEqual([entry["baseId"] for entry in most_divisive(self.index, 2)], ["bigeven", "even"])
+
+    def test_lookups_skip_unknown_ids(self):
+        self.assertEqual(list(splits_for_base_ids(self.index, ["close", "missing"])), ["close"])
+
+
+class VoteSplitServingTests(unittest.TestCase):
+    def setUp(self):
+        self.dilemmas_table = Mock()
+        self.dilemmas_table.scan.return_value = {"Items": [
+            {"_id": "even-en", "language": "en", "dilemma": "Even?", "firstAnswer": "A", "secondAnswer": "B"},
+            {"_id": "close-en", "language": "en", "dilemma": "Close?", "firstAnswer": "A", "secondAnswer": "B"},
+        ]}
+        index = build_vote_split_index("en", {
+            "even-en": {"yesCount": 40, "noCount": 40},
+            "close-en": {"yesCount": 45, "noCount": 35},
+        }, built_at=123)
+        self.dilemmas_table.get_item.side_effect = lambda Key: (
+            {"Item": {"_id": Key["_id"], "index": json.dumps(index)}} if Key["_id"] == "stats#votes#en" else {}
+        )
+        patches = [
+            patch.object(backend_module, "table", self.dilemmas_table),
+            patch.object(backend_module, "_dilemma_catalog_cache", {}),
+            patch.object(backend_module, "_vote_split_index_cache", {}),
+            patch.object(backend_module, "_bundled_dilemma_catalog", None),
+            patch.object(backend_module, "_bundled_dilemma_catalog_loaded", True),
+        ]
+        for current_patch in patches:
+            current_patch.start()
+            self.addCleanup(current_patch.stop)
+
+    def test_splits_are_served_from_one_cached_index_read(self):
+        first = asyncio.run(get_dilemma_splits("close,missing", request_with_headers({}), language="en"))
+        second = asyncio.run(get_dilemma_splits("even", request_with_headers({}), language="en"))
+
+        self.assertEqual(json.loads(first.body)["splits"], {"close": vote_split(45, 35)})
+        self.assertEqual(json.loads(second.body)["builtAt"], 123)
+        index_reads = [
+            call for call in self.dilemmas_table.get_item.call_args_list
+            if call.kwargs["Key"]["_id"] == "stats#votes#en"
+        ]
+        self.assertEqual(len(index_reads), 1)
+
+    def test_most_divisive_carries_the_copy_in_rank_order(self):
+        response = asyncio.run(get_most_divisive_dilemmas(
+            request_with_headers({}, "/dilemmas/most-divisive"), language="en", limit=5,
+        ))
+
+        dilemmas = json.loads(response.body)["dilemmas"]
+        self.assertEqual([entry["baseId"] for entry in dilemmas], ["even", "close"])
+        self.assertEqual(dilemmas[0]["dilemma"], "Even?")
+        self.assertEqual(dilemmas[0]["yesPct"], 50)
+
+    def test_a_language_without_an_index_yet_has_no_splits(self):
+        response = asyncio.run(get_dilemma_splits("even", request_with_headers({}), language="it"))
+
+        self.assertEqual(json.loads(response.body), {"language": "it", "builtAt": None, "splits": {}})
+
+
+class VoteSplitRebuildTests(unittest.TestCase):
+    def test_rebuild_merges_shards_and_writes_one_row_per_language(self):
+        dilemmas_table = Mock()
+        dilemmas_table.scan.return_value = {"Items": [
+            {"_id": "d1-en", "yesCount": Decimal(10), "noCount": Decimal(8)},
+            {"_id": vote_counter_shard_id("d1-en", 2), "counterShardOf": "d1-en", "noCount": Decimal(2)},
+            {"_id": "d1-it", "yesCount": Decimal(3)},
+        ]}
+        with patch.object(backend_module, "table", dilemmas_table):
+            sizes = _rebuild_vote_split_indexes(500)
+
+        self.assertEqual(sizes, {"en": 1, "it": 1})
+        written = {
+            call.kwargs["Item"]["_id"]: json.loads(call.kwargs["Item"]["index"])
+            for call in dilemmas_table.put_item.call_args_list
+        }
+        self.assertEqual(written["stats#votes#en"]["splits"]["d1"], vote_split(10, 10))
+        self.assertEqual(written["stats#votes#it"]["splits"]["d1"], vote_split(3, 0))
+        self.assertEqual(written["stats#votes#en"]["builtAt"], 500)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -166,14 +166,23 @@ const ChallengeLandingScreen = () => {
       trackEvent('challenge_joined_client', { challenge_token: token });
 
       const idsParam = joinData.dilemmaBaseIds.join(',');
-      const dilemmasResponse = await fetch(
-        `${API_URL}/dilemmas/by-ids?ids=${encodeURIComponent(idsParam)}&language=${joinData.language}`,
-        { headers: getApiHeaders() },
-      );
+      const query = `ids=${encodeURIComponent(idsParam)}&language=${joinData.language}`;
+      // The copy is cacheable; the live vote counts come from a separate,
+      // uncached call and are best-effort (the chart starts from zero).
+      const [dilemmasResponse, counts] = await Promise.all([
+        fetch(`${API_URL}/dilemmas/by-ids?${query}`, { headers: getApiHeaders() }),
+        fetch(`${API_URL}/dilemmas/vote-counts?${query}`, { headers: getApiHeaders() })
+          .then((response) => (response.ok ? response.json() : { counts: {} }))
+          .then((data) => data.counts || {})
+          .catch(() => ({})),
+      ]);
       if (!dilemmasResponse.ok) throw new Error(`dilemmas fetch failed: ${dilemmasResponse.status}`);
       const dilemmasData = await dilemmasResponse.json();
 
-      setDilemmas(dilemmasData.dilemmas);
+      setDilemmas(dilemmasData.dilemmas.map((dilemma) => ({
+        ...dilemma,
+        ...counts[dilemma.baseId],
+      })));
       setCurrentIndex(0);
       setCollectedAnswers([]);
       setStep(STEP.ANSWERING);
@@ -361,9 +370,9 @@ const ChallengeLandingScreen = () => {
   const currentDilemma = dilemmas[currentIndex];
   if (!currentDilemma) return null;
 
-  // TASK-110: /dilemmas/by-ids returns the raw stored item with no
-  // setdefault (unlike /get-dilemma), so yesCount/noCount can be absent on
-  // older dilemma documents.
+  // TASK-110: /dilemmas/by-ids carries no vote counts and the separate
+  // /dilemmas/vote-counts read is best-effort, so yesCount/noCount can be
+  // absent.
   const pieChartData = [
     { name: currentDilemma.firstAnswer, value: (currentDilemma.yesCount || 0) + choiceCounts.first, color: '#7a4a4a' },
     { name: currentDilemma.secondAnswer, value: (currentDilemma.noCount || 0) + choiceCounts.second, color: '#2a3a2a' },
@@ -4,7 +4,7 @@ import { useNavigate } from "react-router-dom";
 import { PieChart, Pie, Cell, ResponsiveContainer, Legend } from 'recharts';
 import { useTranslation } from 'react-i18next';
 import { getApiHeaders, getAnonymousUserId } from '../utils/session';
-import { getSeenDilemmas, markDilemmaAsSeen } from '../utils/seenDilemmas';
+import { getDeckCursor, saveDeckCursor } from '../utils/seenDilemmas';
 import SEO from '../components/SEO';
 import { trackEvent } from '../utils/analytics';
 import "./EvaluationDilemmasScreen.css";
@@ -65,6 +65,8 @@ const EvaluationDilemmasScreen = () => {
   // Prefetched next dilemma. A ref (not state) is enough: nothing renders
   // from it directly, fetchDilemma only reads it synchronously on click.
   const nextDilemmaRef = useRef(null);
+  // The rest of the batch loaded by the first /dilemmas/next call.
+  const queuedDilemmasRef = useRef([]);
   // TASK-23: assigned once per mount, stable for the rest of the session -
   // doesn't need to trigger a re-render on its own.
   const maxDilemmasRef = useRef(getTestLengthVariant());
@@ -98,21 +100,27 @@ const EvaluationDilemmasScreen = () => {
   }, []);
 
   const API_URL = import.meta.env.VITE_API_URL;
-  const backendUrl = `${API_URL}/get-dilemma`;
+  const nextDilemmasUrl = `${API_URL}/dilemmas/next`;
   const voteUrl = `${API_URL}/vote`;
 
   const fetchDilemmaData = async () => {
+    // The whole test is loaded in one round trip up front; every later
+    // question is served from the queue.
+    if (queuedDilemmasRef.current.length > 0) {
+      return queuedDilemmasRef.current.shift();
+    }
+
     let response;
     let retries = 5;
     const currentLanguage = i18n.language;
 
-    // Get list of already seen dilemmas for this language
-    const seenDilemmas = getSeenDilemmas(currentLanguage);
-    const excludeParam = seenDilemmas.length > 0 ? `&exclude=${seenDilemmas.join(',')}` : '';
+    // Continue this language's repeat-free deck; the cursor stays a few
+    // dozen bytes however many dilemmas have already been seen.
+    const deckParam = `&deck=${encodeURIComponent(getDeckCursor(currentLanguage))}`;
 
     while (retries > 0) {
       try {
-        response = await fetch(`${backendUrl}?language=${currentLanguage}${excludeParam}`, {
+        response = await fetch(`${nextDilemmasUrl}?language=${currentLanguage}&count=${maxDilemmas}${deckParam}`, {
           method: "GET",
           headers: getApiHeaders(),
         });
@@ -122,11 +130,15 @@ const EvaluationDilemmasScreen = () => {
         }
 
         const result = await response.json();
+        if (!result.dilemmas || result.dilemmas.length === 0) {
+          throw new Error("No dilemmas returned");
+        }
 
-        // Mark this dilemma as seen
-        markDilemmaAsSeen(result._id, currentLanguage);
+        saveDeckCursor(result.deckCursor, currentLanguage);
 
-        return result;
+        const [first, ...rest] = result.dilemmas;
+        queuedDilemmasRef.current = rest;
+        return first;
       } catch (error) {
         console.error("Error during fetch or parsing:", error);
         retries -= 1;
@@ -1,6 +1,41 @@
 // Utility for tracking seen dilemmas in localStorage
 
 const SEEN_DILEMMAS_KEY = 'mtm_seen_dilemmas';
+const DILEMMA_DECK_KEY = 'mtm_dilemma_deck';
+
+/**
+ * Get the session-deck cursor to send as the `deck` parameter of
+ * /get-dilemma or /dilemmas/next
+ * @param {string} language - Language code (e.g., 'en', 'it')
+ * @returns {string} The last deckCursor the backend returned, or 'new'
+ */
+export const getDeckCursor = (language) => {
+  try {
+    const data = localStorage.getItem(DILEMMA_DECK_KEY);
+    const cursors = data ? JSON.parse(data) : {};
+    return cursors[language] || 'new';
+  } catch (error) {
+    console.error('Error reading dilemma deck cursor:', error);
+    return 'new';
+  }
+};
+
+/**
+ * Remember the deck cursor returned with the latest dilemma
+ * @param {string} cursor - deckCursor from the latest dilemma response
+ * @param {string} language - Language code (e.g., 'en', 'it')
+ */
+export const saveDeckCursor = (cursor, language) => {
+  if (!cursor) return;
+  try {
+    const data = localStorage.getItem(DILEMMA_DECK_KEY);
+    const cursors = data ? JSON.parse(data) : {};
+    cursors[language] = cursor;
+    localStorage.setItem(DILEMMA_DECK_KEY, JSON.stringify(cursors));
+  } catch (error) {
+    console.error('Error saving dilemma deck cursor:', error);
+  }
+};
 
 /**
  * Get the list of seen dilemma IDs for the current language